@@ -1,14 +1,29 @@
-from typing import Any
+import threading
+import time
+from typing import Any, Generator, Hashable, Iterable, Iterator
 
+import requests
 from msal import ConfidentialClientApplication
 
+from .auth import TokenManager
+from .batch import Batch
+from .cache import CacheEntry, CacheKey, ResponseCache
+from .decoders import JSONDecoder, get_decoder
 from .device_management import DeviceManagement
 from .directory_objects import DirectoryObjects
 from .drives import Drives
+from .fanout import FanOutResult, fan_out
 from .groups import Groups
+from .ratelimit import RateLimiter
+from .resources import R, Resource
+from .retry import RetryPolicy
 from .sites import Sites
+from .transport import SessionTransport, Transport
 from .users import Users
 
+SEND = "send"
+SLEEP = "sleep"
+
 
 class Client:
 
@@ -25,6 +40,13 @@ class Client:
         tenant_id: str,
         client_secret: str,
         scopes: list[str] | None = None,
+        transport: Transport | None = None,
+        token_refresh_margin: float = 300,
+        background_token_refresh: bool = False,
+        retry_policy: RetryPolicy | None = None,
+        cache: ResponseCache | None = None,
+        json_decoder: str | JSONDecoder | None = None,
+        rate_limiter: RateLimiter | None = None,
         _test: bool = False,
     ):
         app: ConfidentialClientApplication | None = None
@@ -38,26 +60,157 @@ class Client:
         if scopes is None:
             scopes = ["https://graph.microsoft.com/.default"]
 
+        if transport is None:
+            transport = self._create_transport()
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+
         self._scopes = scopes
         self._app = app
+        self._transport = transport
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.json_decoder = get_decoder(json_decoder)
+        self.rate_limiter = rate_limiter
+        self._local = threading.local()
+        self._token_manager = TokenManager(
+            app,
+            scopes,
+            refresh_margin=token_refresh_margin,
+            background_refresh=background_token_refresh,
+        )
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @property
     def _access_token(self) -> str | None:
-        if self._app:
-            result: dict[str, Any] = (
-                self._app.acquire_token_for_client(scopes=self._scopes) or {}
-            )
-            access_token = result.get("access_token")
-            if access_token is None:
-                raise ValueError(f"Failed to acquire token, {result}")
-            return access_token
-        return None
+        return self._token_manager.access_token
 
     @property
     def _headers(self) -> dict[str, str]:
-        if self._access_token is None:
-            return {}
-        return {"Authorization": f"Bearer {self._access_token}"}
+        return self._token_manager.headers
+
+    def _create_transport(self) -> Transport:
+        return SessionTransport()
+
+    def _resource_class(self, klass: type[R]) -> type[R]:
+        return klass
+
+    def _require_sync(self, name: str) -> None:
+        pass
+
+    @property
+    def _batch(self) -> Batch | None:
+        return getattr(self._local, "batch", None)
+
+    def _set_batch(self, batch: Batch | None) -> None:
+        self._local.batch = batch
+
+    def batch(self, sequential: bool = False, raise_on_error: bool = True) -> Batch:
+        return Batch(self, sequential=sequential, raise_on_error=raise_on_error)
+
+    def fan_out(
+        self,
+        resources: Iterable[Resource] | dict[Hashable, Resource],
+        max_workers: int = 8,
+        prefetch: int = 0,
+    ) -> Iterator[FanOutResult]:
+        return fan_out(resources, max_workers=max_workers, prefetch=prefetch)
+
+    def close(self) -> None:
+        self._token_manager.stop()
+        self._transport.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if headers is None:
+            headers = self._headers
+
+        steps = self._request_steps(method, url, headers, kwargs)
+        result: Any = None
+        error: Exception | None = None
+        while True:
+            try:
+                if error is None:
+                    action, value = steps.send(result)
+                else:
+                    action, value = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            result = error = None
+            if action == SLEEP:
+                time.sleep(value)
+                continue
+            try:
+                result = self._transport.request(method, url, headers=value, **kwargs)
+            except Exception as e:
+                error = e
+
+    def _request_steps(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        kwargs: dict[str, Any],
+    ) -> Generator[tuple[str, Any], Any, requests.Response]:
+        # Cache, rate limit and retry decisions shared by Client and
+        # AsyncClient. Yields (SEND, headers) and (SLEEP, seconds), the caller
+        # performs them and sends back the response or throws the error.
+        cache = self.cache
+        key: CacheKey | None = None
+        entry: CacheEntry | None = None
+        if cache is not None:
+            if cache.is_cacheable(method, url, kwargs):
+                key = cache.get_key(url, headers)
+                entry = cache.get(key)
+                if entry is not None and entry.is_fresh():
+                    return entry.to_response(url)
+                headers = cache.get_request_headers(entry, headers)
+            elif method != "GET":
+                cache.invalidate(url)
+
+        retry_policy = self.retry_policy
+        rate_limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                wait = rate_limiter.reserve(url)
+                if wait > 0:
+                    yield SLEEP, wait
+            try:
+                response = yield SEND, headers
+            except retry_policy.RETRY_EXCEPTIONS as e:
+                delay = retry_policy.get_delay(method, attempt, exception=e)
+                if delay is None:
+                    raise
+                retry_policy.record(delay, exception=e)
+            else:
+                if rate_limiter is not None:
+                    rate_limiter.record(url, response)
+                delay = retry_policy.get_delay(method, attempt, response=response)
+                if delay is None:
+                    break
+                retry_policy.record(delay, response=response)
+                if response.raw is not None:
+                    response.close()
+            yield SLEEP, delay
+            attempt += 1
+
+        if cache is None or key is None:
+            return response
+        return cache.store(key, response, entry)
 
     @classmethod
     def from_file(cls: type["Client"], fpath: str | None = None, ftype: str = "toml"):
@@ -0,0 +1,541 @@
+import asyncio
+import contextvars
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Any, AsyncIterator, Callable, Hashable, Iterable, Self, cast
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import SLEEP, Client
+from .batch import SLEEP as BATCH_SLEEP
+from .batch import Batch, BatchRequest
+from .columns import Column, ColumnBuffer, get_buffers, import_pyarrow, to_table
+from .export import JsonlWriter
+from .fanout import FanOutResult, afan_out
+from .paging import AsyncPagePrefetcher, RawPage
+from .partitions import aiter_partitioned
+from .records import get_record_class
+from .resources import (
+    GET_NEXT_PAGE,
+    GET_PAGE,
+    PAGE,
+    START_PREFETCH,
+    MultiValuedResource,
+    R,
+    Resource,
+    SingleValuedResource,
+)
+
+_ASYNC_CLASSES: dict[type, type] = {}
+
+
+class AsyncTransport(ABC):
+
+    @abstractmethod
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class HttpxTransport(AsyncTransport):
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: float | tuple[float, float] | None = (10, 60),
+        http2: bool = False,
+    ) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "Package 'httpx' is required for AsyncClient, pip install pymsgraph[async]"
+            ) from e
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            _timeout = httpx.Timeout(read, connect=connect)
+        else:
+            _timeout = httpx.Timeout(timeout)
+
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=_timeout,
+            http2=http2,
+        )
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        data = kwargs.pop("data", None)
+        if isinstance(data, (str, bytes)):
+            kwargs["content"] = data
+        elif data is not None:
+            kwargs["data"] = data
+
+        httpx = self._httpx
+        try:
+            r = await self._client.request(method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        response = requests.Response()
+        response.status_code = r.status_code
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.url = str(r.url)
+        response.reason = r.reason_phrase
+        response.encoding = r.encoding
+        response._content = r.content
+        return response
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class AsyncResource:
+
+    async def get(self: Any) -> Any:
+        self._check_request("GET")
+        if self._has_changed:
+            await self._client._ensure_token()
+            headers = self._get_headers()
+            await self._send("GET", self._get_url(), self._on_get, headers=headers)
+        return self
+
+    async def patch(self: Any, data: dict[str, Any]) -> Any:
+        self._check_request("PATCH")
+        await self._send("PATCH", self.url, self._on_patch, json=data)
+        return self
+
+    async def post(self: Any, payload: dict[str, Any] | None = None) -> Any:
+        self._check_request("POST")
+        if payload is None:
+            payload = {}
+        await self._send("POST", self.url, self._on_post, json=payload)
+        return self
+
+    async def delete(self: Any) -> Any:
+        self._check_request("DELETE")
+        await self._send("DELETE", self.url, self._on_delete)
+        return self
+
+    async def put(self: Any, data: str | bytes | dict[str, Any]) -> Any:
+        self._check_request("PUT")
+        await self._send("PUT", self.url, self._on_put, data=data)
+        return self
+
+    async def get_from_raw_relative_url(self: Any, relative_url: str):
+        return await self._client._request("GET", f"{self.URL}/{relative_url}")
+
+    async def _then(self: Any, result: Any, get_value: Callable[[], Any]) -> Any:
+        await result
+        return get_value()
+
+    async def _send(
+        self: Any,
+        method: str,
+        url: str,
+        callback: Callable[[requests.Response], None],
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        client = self._client
+        batch = client._batch
+        if batch is not None:
+            await batch.add(method, url, callback, headers=headers, **kwargs)
+        else:
+            callback(await client._request(method, url, headers=headers, **kwargs))
+
+
+class AsyncMultiValuedResource(AsyncResource):
+
+    async def get_next_items(self: Any) -> Any:
+        next_page = self._current_page + 1
+        if next_page not in self._mdata:
+            await self._client._ensure_token()
+            response = await self._client._request(
+                "GET", self._get_next_link(), headers=self._get_headers()
+            )
+            self._on_next_items(next_page, response)
+
+        self._current_page = next_page
+        return self
+
+    async def iter_pages(
+        self: Any, discard_pages: bool = False, prefetch: int = 0
+    ) -> AsyncIterator[Any]:
+        async for page in self._iter_page_numbers(discard_pages, prefetch):
+            yield self._mdata[page]
+
+    async def iter_all_items(
+        self: Any, discard_pages: bool = False, prefetch: int = 0
+    ) -> AsyncIterator[Any]:
+        async for page in self._iter_page_numbers(discard_pages, prefetch):
+            for obj in self._get_page_objects(page, discard_pages):
+                yield obj
+
+    async def export_jsonl(
+        self: Any,
+        file: str | os.PathLike | IO[bytes],
+        fields: str | Iterable[str] | None = None,
+        compression: str | None = None,
+        prefetch: int = 0,
+    ) -> int:
+        keys = self._get_export_keys(fields)
+        mdata = self._mdata
+        with JsonlWriter(file, keys=keys, compression=compression) as writer:
+            async for page in self._iter_page_numbers(True, prefetch):
+                writer.write_items(mdata[page]["value"])
+        return writer.count
+
+    async def iter_raw_pages(self: Any, prefetch: int = 0) -> AsyncIterator[RawPage]:
+        page = await self._fetch_raw_page(self.url_with_query_params)
+        prefetcher: AsyncPagePrefetcher | None = None
+        if prefetch and page.next_link:
+            prefetcher = AsyncPagePrefetcher(
+                self._fetch_raw_page, page.next_link, prefetch
+            )
+        try:
+            while True:
+                yield page
+                if not page.next_link:
+                    break
+                if prefetcher is not None:
+                    page = await prefetcher.get()
+                else:
+                    page = await self._fetch_raw_page(page.next_link)
+        finally:
+            if prefetcher is not None:
+                await prefetcher.close()
+
+    async def iter_structs(self: Any) -> AsyncIterator[Any]:
+        client = self._client
+        decoder = client.json_decoder
+        klass = self.MODELS[self.ITEM_CLASS]
+        next_link: str | None = self.url_with_query_params
+        while next_link:
+            await client._ensure_token()
+            response = await client._request(
+                "GET", next_link, headers=self._get_headers()
+            )
+            response.raise_for_status()
+            page = decoder.decode_page(response.content, klass)
+            for item in page.value:
+                yield item
+            next_link = page.next_link
+
+    async def iter_records(
+        self: Any,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Any]:
+        record_class = get_record_class(self.MODELS[self.ITEM_CLASS])
+        keys = record_class.get_keys(fields)
+        async for page in self._iter_page_numbers(discard_pages, prefetch):
+            for record in self._iter_records(page, record_class, keys):
+                yield record
+
+    async def to_columns(
+        self: Any,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> dict[str, Column]:
+        buffers = await self._fill_columns(fields, discard_pages, prefetch)
+        return {buffer.name: buffer.values for buffer in buffers}
+
+    async def to_table(
+        self: Any,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> Any:
+        import_pyarrow()
+        return to_table(await self._fill_columns(fields, discard_pages, prefetch))
+
+    def iter_partitioned(
+        self: Any,
+        partitions: Iterable[str],
+        max_workers: int = 4,
+        key: str = "id",
+        prefetch: int = 0,
+    ) -> AsyncIterator[Any]:
+        return aiter_partitioned(self, partitions, max_workers, key, prefetch)
+
+    async def _fill_columns(
+        self: Any,
+        fields: str | Iterable[str] | None,
+        discard_pages: bool,
+        prefetch: int,
+    ) -> list[ColumnBuffer]:
+        buffers = get_buffers(self.MODELS[self.ITEM_CLASS], fields)
+        mdata = self._mdata
+        async for page in self._iter_page_numbers(discard_pages, prefetch):
+            items = mdata[page]["value"]
+            for buffer in buffers:
+                buffer.extend(items)
+        return buffers
+
+    async def _iter_page_numbers(
+        self: Any, discard_pages: bool = False, prefetch: int = 0
+    ) -> AsyncIterator[int]:
+        steps = self._page_steps(discard_pages, prefetch)
+        prefetcher: AsyncPagePrefetcher | None = None
+        result: Any = None
+        try:
+            while True:
+                try:
+                    action, value = steps.send(result)
+                except StopIteration:
+                    return
+                result = None
+                if action == PAGE:
+                    yield value
+                elif action == GET_PAGE:
+                    await self.get()
+                elif action == GET_NEXT_PAGE:
+                    await self.get_next_items()
+                elif action == START_PREFETCH:
+                    prefetcher = AsyncPagePrefetcher(self._fetch_page, value, prefetch)
+                else:
+                    result = await cast(AsyncPagePrefetcher, prefetcher).get()
+        finally:
+            if prefetcher is not None:
+                await prefetcher.close()
+
+    async def _fetch_raw_page(self: Any, url: str) -> RawPage:
+        await self._client._ensure_token()
+        response = await self._client._request("GET", url, headers=self._get_headers())
+        response.raise_for_status()
+        return RawPage.from_content(response.content)
+
+    async def _fetch_page(self: Any, next_link: str) -> dict[str, Any]:
+        await self._client._ensure_token()
+        response = await self._client._request(
+            "GET", next_link, headers=self._get_headers()
+        )
+        response.raise_for_status()
+        return self._decode_page(response)
+
+    def __aiter__(self: Any) -> AsyncIterator[Any]:
+        return self.iter_all_items()
+
+
+class AsyncBatch(Batch):
+    def __enter__(self) -> "Batch":
+        raise TypeError("AsyncBatch must be used with 'async with'.")
+
+    async def __aenter__(self) -> Self:
+        self._activate()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._client._set_batch(None)
+        if exc_type is None:
+            await self.flush()
+            self._raise_errors()
+
+    async def add(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        callback: Callable[[requests.Response], None],
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+    ) -> str:
+        request_id = self._queue_request(method, url, callback, headers, json, data)
+        if len(self._queue) >= self.MAX_REQUESTS:
+            await self.flush()
+        return request_id
+
+    async def flush(self) -> None:  # type: ignore[override]
+        for chunk in self._pop_chunks():
+            await self._send(chunk)
+
+    async def _send(self, chunk: list[BatchRequest]) -> None:  # type: ignore[override]
+        steps = self._send_steps(chunk)
+        result: Any = None
+        while True:
+            try:
+                action, value = steps.send(result)
+            except StopIteration:
+                return
+            result = None
+            if action == BATCH_SLEEP:
+                await asyncio.sleep(value)
+            else:
+                response = await self._client._request(
+                    "POST", self.url, json=self._get_payload(value)
+                )
+                result = self._get_responses(response)
+
+
+class AsyncClient(Client):
+    def __init__(
+        self,
+        client_id: str,
+        tenant_id: str,
+        client_secret: str,
+        scopes: list[str] | None = None,
+        transport: AsyncTransport | None = None,
+        max_concurrency: int = 20,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            client_id,
+            tenant_id,
+            client_secret,
+            scopes=scopes,
+            transport=transport,  # type: ignore[arg-type]
+            **kwargs,
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        # Each task gets its own batch, like each thread does for Client.
+        self._batch_var: contextvars.ContextVar[AsyncBatch | None] = (
+            contextvars.ContextVar(f"pymsgraph_batch_{id(self)}", default=None)
+        )
+
+    def __enter__(self) -> Self:
+        raise TypeError("AsyncClient must be used with 'async with'.")
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        raise TypeError("AsyncClient must be closed with 'await aclose()'.")
+
+    async def aclose(self) -> None:
+        self._token_manager.stop()
+        await self._transport.aclose()  # type: ignore[attr-defined]
+        if self.cache is not None:
+            self.cache.close()
+
+    @property
+    def _batch(self) -> AsyncBatch | None:  # type: ignore[override]
+        return self._batch_var.get()
+
+    def _set_batch(self, batch: Batch | None) -> None:
+        self._batch_var.set(cast(AsyncBatch | None, batch))
+
+    def batch(  # type: ignore[override]
+        self, sequential: bool = False, raise_on_error: bool = True
+    ) -> AsyncBatch:
+        return AsyncBatch(self, sequential=sequential, raise_on_error=raise_on_error)
+
+    def _require_sync(self, name: str) -> None:
+        raise TypeError(f"Not supported by AsyncClient, use Client instead, '{name}'")
+
+    def fan_out(  # type: ignore[override]
+        self,
+        resources: Iterable[Resource] | dict[Hashable, Resource],
+        max_workers: int = 8,
+        prefetch: int = 0,
+    ) -> AsyncIterator[FanOutResult]:
+        return afan_out(resources, max_workers=max_workers, prefetch=prefetch)
+
+    async def _ensure_token(self) -> None:
+        token_manager = self._token_manager
+        if self._app is not None and token_manager._needs_refresh():
+            await asyncio.to_thread(token_manager.refresh)
+
+    async def _request(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if headers is None:
+            await self._ensure_token()
+            headers = self._headers
+
+        semaphore = self._semaphore
+        if semaphore is None:
+            semaphore = self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        transport: AsyncTransport = self._transport  # type: ignore[assignment]
+        steps = self._request_steps(method, url, headers, kwargs)
+        result: Any = None
+        error: Exception | None = None
+        while True:
+            try:
+                if error is None:
+                    action, value = steps.send(result)
+                else:
+                    action, value = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            result = error = None
+            if action == SLEEP:
+                await asyncio.sleep(value)
+                continue
+            try:
+                async with semaphore:
+                    result = await transport.request(
+                        method, url, headers=value, **kwargs
+                    )
+            except Exception as e:
+                error = e
+
+    def _create_transport(self) -> AsyncTransport:  # type: ignore[override]
+        return HttpxTransport()
+
+    def _resource_class(self, klass: type[R]) -> type[R]:
+        if issubclass(klass, AsyncResource):
+            return klass
+        try:
+            return _ASYNC_CLASSES[klass]
+        except KeyError:
+            mixin: type[AsyncResource] = AsyncResource
+            if issubclass(klass, MultiValuedResource):
+                mixin = AsyncMultiValuedResource
+            _check_overrides(klass, mixin)
+            async_class = type(
+                f"Async{klass.__name__}",
+                (mixin, klass),
+                {"__module__": klass.__module__},
+            )
+            _ASYNC_CLASSES[klass] = async_class
+            return async_class  # type: ignore[return-value]
+
+
+def _check_overrides(klass: type, mixin: type) -> None:
+    # The mixin comes first in the MRO, a subclass overriding one of its
+    # methods would be skipped silently. Such logic belongs in the hooks both
+    # paths call, e.g. _check_request or _get_url.
+    replaced = {
+        name
+        for base in mixin.__mro__[:-1]
+        for name in vars(base)
+        if not name.startswith("__")
+    }
+    for base in klass.__mro__:
+        if base in _BASE_CLASSES or not issubclass(base, Resource):
+            continue
+        overridden = replaced.intersection(vars(base))
+        if overridden:
+            raise TypeError(
+                f"Resource can't be used with AsyncClient, "
+                f"'{base.__name__}.{min(overridden)}'"
+            )
+
+
+_BASE_CLASSES = (Resource, SingleValuedResource, MultiValuedResource)
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from typing import Any
+
+import requests
+from msal import ConfidentialClientApplication
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    RETRY_BACKOFF = 5.0
+    MAX_BACKOFF = 300.0
+
+    def __init__(
+        self,
+        app: ConfidentialClientApplication | None,
+        scopes: list[str],
+        refresh_margin: float = 300,
+        background_refresh: bool = False,
+    ) -> None:
+        self._app = app
+        self._scopes = scopes
+        self.refresh_margin = refresh_margin
+        self._access_token: str | None = None
+        self._expires_at: float = 0.0
+        self._headers: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        if background_refresh and app is not None:
+            self.start()
+
+    @property
+    def access_token(self) -> str | None:
+        if self._app is None:
+            return None
+        if self._needs_refresh():
+            self.refresh()
+        return self._access_token
+
+    @property
+    def headers(self) -> dict[str, str]:
+        if self._app is not None and self._needs_refresh():
+            self.refresh()
+        return self._headers
+
+    @property
+    def expires_at(self) -> float:
+        return self._expires_at
+
+    def refresh(self, force: bool = False) -> None:
+        if self._app is None:
+            return
+        with self._lock:
+            if not force and not self._needs_refresh():
+                return
+            result: dict[str, Any] = (
+                self._app.acquire_token_for_client(scopes=self._scopes) or {}
+            )
+            access_token = result.get("access_token")
+            if access_token is None:
+                raise ValueError(f"Failed to acquire token, {result}")
+            expires_in = float(result.get("expires_in", 3600))
+            self._access_token = access_token
+            self._headers = {"Authorization": f"Bearer {access_token}"}
+            self._expires_at = time.monotonic() + expires_in
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pymsgraph-token-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+
+    def _needs_refresh(self) -> bool:
+        return time.monotonic() >= self._expires_at - self.refresh_margin
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except (ValueError, requests.RequestException) as e:
+                failures += 1
+                delay = min(self.RETRY_BACKOFF * 2 ** (failures - 1), self.MAX_BACKOFF)
+                logger.warning(
+                    "Background token refresh failed, retrying in %.0fs: %s", delay, e
+                )
+            else:
+                failures = 0
+                delay = max(
+                    self._expires_at - self.refresh_margin - time.monotonic(), 1.0
+                )
+            self._stop_event.wait(delay)
@@ -0,0 +1,258 @@
+import base64
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterator
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .resources import Resource
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+
+# https://learn.microsoft.com/en-us/graph/json-batching
+
+POST = "post"
+SLEEP = "sleep"
+
+
+@dataclass
+class BatchRequest:
+    id: str
+    method: str
+    url: str
+    callback: Callable[[requests.Response], None]
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+    depends_on: list[str] = field(default_factory=list)
+
+    def asdict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "id": self.id,
+            "method": self.method,
+            "url": self.url,
+        }
+        headers = dict(self.headers)
+        if self.body is not None:
+            headers.setdefault("Content-Type", "application/json")
+            data["body"] = self.body
+        if headers:
+            data["headers"] = headers
+        if self.depends_on:
+            data["dependsOn"] = self.depends_on
+        return data
+
+
+class BatchError(Exception):
+    def __init__(self, errors: list[tuple[BatchRequest, Exception]]) -> None:
+        self.errors = errors
+        super().__init__(f"{len(errors)} batch request(s) failed, {errors[0][1]}")
+
+
+class Batch:
+    MAX_REQUESTS = 20
+
+    def __init__(
+        self,
+        client: "Client",
+        sequential: bool = False,
+        raise_on_error: bool = True,
+    ) -> None:
+        self._client = client
+        self.sequential = sequential
+        self.raise_on_error = raise_on_error
+        self.errors: list[tuple[BatchRequest, Exception]] = []
+        self._queue: list[BatchRequest] = []
+        self._counter = 0
+
+    @property
+    def url(self) -> str:
+        return f"{Resource.URL}/$batch"
+
+    def __enter__(self) -> "Batch":
+        self._activate()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._client._set_batch(None)
+        if exc_type is None:
+            self.flush()
+            self._raise_errors()
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        callback: Callable[[requests.Response], None],
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        data: Any = None,
+    ) -> str:
+        request_id = self._queue_request(method, url, callback, headers, json, data)
+        if len(self._queue) >= self.MAX_REQUESTS:
+            self.flush()
+        return request_id
+
+    def flush(self) -> None:
+        for chunk in self._pop_chunks():
+            self._send(chunk)
+
+    def _activate(self) -> None:
+        client = self._client
+        if client._batch is not None:
+            raise ValueError("A batch is already active for this thread.")
+        client._set_batch(self)
+
+    def _raise_errors(self) -> None:
+        if self.errors and self.raise_on_error:
+            raise BatchError(self.errors)
+
+    def _queue_request(
+        self,
+        method: str,
+        url: str,
+        callback: Callable[[requests.Response], None],
+        headers: dict[str, str] | None,
+        json: Any,
+        data: Any,
+    ) -> str:
+        if not url.startswith(Resource.URL):
+            raise ValueError(f"URL can't be added to a batch, '{url}'")
+        if data is not None:
+            if not isinstance(data, dict):
+                raise ValueError("Request body in a batch must be JSON serializable.")
+            json = data
+
+        cache = self._client.cache
+        if cache is not None and method != "GET":
+            cache.invalidate(url)
+
+        self._counter += 1
+        request_id = str(self._counter)
+
+        depends_on = []
+        if self.sequential and self._queue:
+            depends_on.append(self._queue[-1].id)
+
+        self._queue.append(
+            BatchRequest(
+                id=request_id,
+                method=method,
+                url=url[len(Resource.URL) :],
+                callback=callback,
+                headers={
+                    k: v
+                    for k, v in (headers or {}).items()
+                    if k.lower() != "authorization"
+                },
+                body=json,
+                depends_on=depends_on,
+            )
+        )
+        return request_id
+
+    def _pop_chunks(self) -> Iterator[list[BatchRequest]]:
+        queue = self._queue
+        while queue:
+            chunk = queue[: self.MAX_REQUESTS]
+            del queue[: self.MAX_REQUESTS]
+            yield chunk
+
+    def _send(self, chunk: list[BatchRequest]) -> None:
+        steps = self._send_steps(chunk)
+        result: Any = None
+        while True:
+            try:
+                action, value = steps.send(result)
+            except StopIteration:
+                return
+            result = None
+            if action == SLEEP:
+                time.sleep(value)
+            else:
+                response = self._client._request(
+                    "POST", self.url, json=self._get_payload(value)
+                )
+                result = self._get_responses(response)
+
+    def _send_steps(
+        self, chunk: list[BatchRequest]
+    ) -> Generator[tuple[str, Any], Any, None]:
+        # Retry decisions shared with AsyncBatch. Yields (POST, chunk) for a
+        # $batch request and (SLEEP, seconds) between retries.
+        retry_policy = self._client.retry_policy
+        attempt = 0
+        while chunk:
+            responses = yield POST, chunk
+
+            retries: list[BatchRequest] = []
+            retry_ids: set[str] = set()
+            delay = 0.0
+            for request in chunk:
+                response = self._build_response(request, responses.get(request.id))
+                _delay = retry_policy.get_delay(
+                    request.method, attempt, response=response
+                )
+                if _delay is None and response.status_code == 424:
+                    if retry_ids.intersection(request.depends_on):
+                        _delay = 0.0
+                if _delay is not None:
+                    retries.append(request)
+                    retry_ids.add(request.id)
+                    delay = max(delay, _delay)
+                    retry_policy.record(_delay, response=response)
+                    continue
+                try:
+                    request.callback(response)
+                except Exception as e:
+                    self.errors.append((request, e))
+
+            if retries:
+                yield SLEEP, delay
+            chunk = retries
+            attempt += 1
+
+    def _get_payload(self, chunk: list[BatchRequest]) -> dict[str, Any]:
+        chunk_ids = {request.id for request in chunk}
+        requests_data = []
+        for request in chunk:
+            data = request.asdict()
+            if "dependsOn" in data:
+                depends_on = [i for i in data["dependsOn"] if i in chunk_ids]
+                if depends_on:
+                    data["dependsOn"] = depends_on
+                else:
+                    del data["dependsOn"]
+            requests_data.append(data)
+        return {"requests": requests_data}
+
+    def _get_responses(self, response: requests.Response) -> dict[str, dict[str, Any]]:
+        response.raise_for_status()
+        data = self._client.json_decoder.decode(response.content)
+        return {item["id"]: item for item in data["responses"]}
+
+    def _build_response(
+        self, request: BatchRequest, data: dict[str, Any] | None
+    ) -> requests.Response:
+        if data is None:
+            data = {"status": 500, "body": {"error": {"code": "MissingResponse"}}}
+
+        response = requests.Response()
+        response.status_code = int(data["status"])
+        response.url = f"{Resource.URL}{request.url}"
+        response.headers = CaseInsensitiveDict(data.get("headers") or {})
+
+        body = data.get("body")
+        if body is None:
+            content = b""
+        elif isinstance(body, str) and "json" not in response.headers.get(
+            "Content-Type", ""
+        ):
+            content = base64.b64decode(body)
+        else:
+            content = json.dumps(body).encode()
+        response._content = content
+        return response
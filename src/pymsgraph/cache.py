@@ -0,0 +1,466 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+from .resources import Resource
+
+# https://learn.microsoft.com/en-us/graph/best-practices-concept#caching
+
+
+CacheKey = tuple[str, str | None]
+
+_JSON_STRING = rb'"(?:[^"\\]|\\.)*"'
+_JSON_TOKENS = re.compile(_JSON_STRING + rb"|[{}\[\]]")
+_JSON_STRING_VALUE = re.compile(rb"\s*:\s*(" + _JSON_STRING + rb")")
+
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: dict[str, str]
+    content: bytes
+    etag: str | None
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        if now is None:
+            now = time.time()
+        return now < self.expires_at
+
+    def to_response(self, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.url = url
+        response.headers.update(self.headers)
+        response._content = self.content
+        response._content_consumed = True
+        return response
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def asdict(self) -> dict[str, int]:
+        return dict(self.__dict__)
+
+
+class CacheBackend(ABC):
+    max_size: int | None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    @abstractmethod
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: CacheKey, entry: CacheEntry) -> int:
+        pass
+
+    @abstractmethod
+    def delete(self, key: CacheKey) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, path: str, parent: str) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    def __init__(
+        self, max_entries: int = 1024, max_size: int | None = 64 * 1024 * 1024
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> int:
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            return self._evict()
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def invalidate(self, path: str, parent: str) -> int:
+        count = 0
+        with self._lock:
+            for key in list(self._entries):
+                key_path = key[0].partition("?")[0]
+                if (
+                    key_path == path
+                    or key_path == parent
+                    or key_path.startswith(f"{path}/")
+                ):
+                    self._pop(key)
+                    count += 1
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> int:
+        entries = self._entries
+        max_size = self.max_size
+        count = 0
+        while len(entries) > self.max_entries or (
+            max_size is not None and self._size > max_size
+        ):
+            _, entry = entries.popitem(last=False)
+            self._size -= entry.size
+            count += 1
+        return count
+
+
+# https://www.sqlite.org/wal.html
+class SQLiteBackend(CacheBackend):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT NOT NULL,
+            consistency_level TEXT NOT NULL,
+            path TEXT NOT NULL,
+            status_code INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            content BLOB NOT NULL,
+            etag TEXT,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (url, consistency_level)
+        );
+        CREATE INDEX IF NOT EXISTS responses_path ON responses (path);
+        CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        max_size: int | None = 512 * 1024 * 1024,
+        timeout: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connection
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(self.SCHEMA)
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        row = self._connection.execute("SELECT SUM(size) FROM responses").fetchone()
+        return row[0] or 0
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        row = self._connection.execute(
+            "SELECT status_code, headers, content, etag, expires_at FROM responses "
+            "WHERE url = ? AND consistency_level = ?",
+            self._get_params(key),
+        ).fetchone()
+        if row is None:
+            return None
+        status_code, headers, content, etag, expires_at = row
+        return CacheEntry(status_code, json.loads(headers), content, etag, expires_at)
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> int:
+        url, consistency_level = self._get_params(key)
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    consistency_level,
+                    url.partition("?")[0],
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.etag,
+                    entry.size,
+                    entry.expires_at,
+                ),
+            )
+            count = self._evict(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return count
+
+    def delete(self, key: CacheKey) -> None:
+        self._connection.execute(
+            "DELETE FROM responses WHERE url = ? AND consistency_level = ?",
+            self._get_params(key),
+        )
+
+    def invalidate(self, path: str, parent: str) -> int:
+        cursor = self._connection.execute(
+            "DELETE FROM responses WHERE path = ? OR path = ? "
+            "OR substr(path, 1, ?) = ?",
+            (path, parent, len(path) + 1, f"{path}/"),
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        # Evict the entries closest to expiry so that reads never have to write.
+        count = 0
+        total, size = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total > self.max_entries:
+            count += connection.execute(
+                "DELETE FROM responses WHERE rowid IN ("
+                "SELECT rowid FROM responses ORDER BY expires_at LIMIT ?)",
+                (total - self.max_entries,),
+            ).rowcount
+            total, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        max_size = self.max_size
+        if max_size is not None and size > max_size:
+            rowids = []
+            for rowid, entry_size in connection.execute(
+                "SELECT rowid, size FROM responses ORDER BY expires_at"
+            ).fetchall():
+                if size <= max_size:
+                    break
+                rowids.append((rowid,))
+                size -= entry_size
+            connection.executemany("DELETE FROM responses WHERE rowid = ?", rowids)
+            count += len(rowids)
+        return count
+
+    def _get_params(self, key: CacheKey) -> tuple[str, str]:
+        url, consistency_level = key
+        return url, consistency_level or ""
+
+
+class ResponseCache:
+    EXCLUDED_SEGMENTS = ("/delta", "$deltatoken")
+    ETAG_KEYS = ("@odata.etag", "eTag")
+    ETAG_SEARCH_LIMIT = 4096
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        max_size: int | None = 64 * 1024 * 1024,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        if backend is None:
+            backend = MemoryBackend(max_entries=max_entries, max_size=max_size)
+        self.ttl = ttl
+        self.backend = backend
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    @property
+    def size(self) -> int:
+        return self.backend.size
+
+    @classmethod
+    def sqlite(cls, path: str, ttl: float = 3600.0, **kwargs: Any) -> "ResponseCache":
+        return cls(ttl=ttl, backend=SQLiteBackend(path, **kwargs))
+
+    def is_cacheable(self, method: str, url: str, kwargs: dict[str, Any]) -> bool:
+        if method != "GET" or kwargs.get("stream"):
+            return False
+        if not url.startswith(Resource.URL):
+            return False
+        return not any(segment in url for segment in self.EXCLUDED_SEGMENTS)
+
+    def get_key(self, url: str, headers: dict[str, str]) -> CacheKey:
+        return url, headers.get("ConsistencyLevel")
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is not None and entry.is_fresh():
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        return entry
+
+    def get_request_headers(
+        self, entry: CacheEntry | None, headers: dict[str, str]
+    ) -> dict[str, str]:
+        if entry is None or entry.etag is None:
+            return headers
+        return {**headers, "If-None-Match": entry.etag}
+
+    def store(
+        self,
+        key: CacheKey,
+        response: requests.Response,
+        entry: CacheEntry | None = None,
+    ) -> requests.Response:
+        if response.status_code == 304 and entry is not None:
+            entry.expires_at = time.time() + self.ttl
+            self._set(key, entry)
+            with self._lock:
+                self.stats.revalidations += 1
+            return entry.to_response(response.url)
+
+        if response.status_code != 200:
+            if entry is not None:
+                self.backend.delete(key)
+            return response
+
+        new_entry = CacheEntry(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            etag=self._get_etag(response),
+            expires_at=time.time() + self.ttl,
+        )
+        max_size = self.backend.max_size
+        if max_size is not None and new_entry.size > max_size:
+            self.backend.delete(key)
+        else:
+            self._set(key, new_entry)
+        return response
+
+    def invalidate(self, url: str) -> None:
+        path = url.partition("?")[0].rstrip("/")
+        if path.endswith("/$ref"):
+            path = path[: -len("/$ref")]
+        count = self.backend.invalidate(path, path.rpartition("/")[0])
+        with self._lock:
+            self.stats.invalidations += count
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def _set(self, key: CacheKey, entry: CacheEntry) -> None:
+        count = self.backend.set(key, entry)
+        if count:
+            with self._lock:
+                self.stats.evictions += count
+
+    def _get_etag(self, response: requests.Response) -> str | None:
+        etag = response.headers.get("ETag")
+        if etag:
+            return etag
+        if "json" not in response.headers.get("Content-Type", ""):
+            return None
+        # Graph writes the etag before the other properties, so a bounded
+        # search avoids decoding every collection page a second time.
+        return _find_top_level_string(
+            response.content[: self.ETAG_SEARCH_LIMIT],
+            {json.dumps(key).encode() for key in self.ETAG_KEYS},
+        )
+
+
+def _find_top_level_string(content: bytes, keys: set[bytes]) -> str | None:
+    depth = 0
+    for match in _JSON_TOKENS.finditer(content):
+        token = match.group()
+        if token in (b"{", b"["):
+            depth += 1
+        elif token in (b"}", b"]"):
+            depth -= 1
+        elif depth == 1 and token in keys:
+            value = _JSON_STRING_VALUE.match(content, match.end())
+            if value is not None:
+                return json.loads(value.group(1))
+    return None
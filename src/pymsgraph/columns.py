@@ -0,0 +1,124 @@
+import datetime
+import math
+from array import array
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .fields import (
+    BooleanField,
+    CharField,
+    DateTimeField,
+    Field,
+    IntegerField,
+    get_fields,
+)
+
+if TYPE_CHECKING:
+    from .resources import Resource
+
+Column = array | list[Any]
+
+
+class ColumnBuffer:
+    TYPECODES: dict[type[Field], str] = {
+        IntegerField: "q",
+        BooleanField: "b",
+        DateTimeField: "d",
+    }
+
+    def __init__(self, name: str, key: str, field: Field | None = None) -> None:
+        self.name = name
+        self.key = key
+        self.field = field
+        self.typecode: str | None = None
+        if field is not None:
+            for field_class, typecode in self.TYPECODES.items():
+                if isinstance(field, field_class):
+                    self.typecode = typecode
+                    break
+
+        self.values: Column = [] if self.typecode is None else array(self.typecode)
+
+    def extend(self, items: list[dict[str, Any]]) -> None:
+        key = self.key
+        values = [item.get(key) for item in items]
+        typecode = self.typecode
+        if typecode == "d":
+            # Datetimes are stored as POSIX timestamps with NaN for missing values.
+            self.values.extend(
+                math.nan if v is None else _to_timestamp(str(v)) for v in values
+            )
+            return
+
+        field = self.field
+        if field is not None and typecode is not None:
+            get_value = field.get_value
+            values = [None if v is None else get_value(v) for v in values]
+        if isinstance(self.values, array) and None in values:
+            self.values = self.values.tolist()
+        self.values.extend(values)
+
+
+def get_buffers(
+    klass: type["Resource"], fields: str | Iterable[str] | None = None
+) -> list[ColumnBuffer]:
+    model_fields = get_fields(klass)
+    if fields is None:
+        names = list(model_fields)
+    elif isinstance(fields, str):
+        names = [name.strip() for name in fields.split(",")]
+    else:
+        names = list(fields)
+
+    buffers = []
+    for name in names:
+        field = model_fields.get(name)
+        if field is None:
+            buffers.append(ColumnBuffer(name, name))
+        else:
+            buffers.append(ColumnBuffer(name, field.key, field))
+    return buffers
+
+
+def import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Package 'pyarrow' is required for to_table, pip install pymsgraph[arrow]"
+        ) from e
+    return pyarrow
+
+
+def to_table(buffers: list[ColumnBuffer]) -> Any:
+    pa = import_pyarrow()
+    arrays = []
+    for buffer in buffers:
+        values = buffer.values
+        typecode = buffer.typecode
+        if typecode == "q":
+            arrays.append(pa.array(values, type=pa.int64()))
+        elif typecode == "b":
+            arrays.append(pa.array(values, type=pa.bool_()))
+        elif typecode == "d":
+            arrays.append(
+                pa.array(
+                    [None if math.isnan(v) else round(v * 1_000_000) for v in values],
+                    type=pa.timestamp("us", tz="UTC"),
+                )
+            )
+        elif isinstance(buffer.field, CharField):
+            arrays.append(
+                pa.array(
+                    [None if v is None else str(v) for v in values], type=pa.string()
+                )
+            )
+        else:
+            arrays.append(pa.array(values))
+    return pa.table(arrays, names=[buffer.name for buffer in buffers])
+
+
+def _to_timestamp(value: str) -> float:
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
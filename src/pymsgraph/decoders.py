@@ -0,0 +1,124 @@
+import datetime
+import json
+from typing import TYPE_CHECKING, Any
+
+from .fields import BooleanField, DateTimeField, Field, IntegerField, get_fields
+
+if TYPE_CHECKING:
+    from .resources import Resource
+
+
+class JSONDecoder:
+    NAME = "json"
+
+    def decode(self, content: bytes) -> Any:
+        # json.loads detects the encoding of bytes itself, no need to go
+        # through response.text first.
+        return json.loads(content)
+
+    def decode_page(self, content: bytes, klass: type["Resource"]) -> Any:
+        raise ValueError(
+            f"Typed decoding is not supported by the '{self.NAME}' decoder, use 'msgspec'"
+        )
+
+
+class OrjsonDecoder(JSONDecoder):
+    NAME = "orjson"
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "Package 'orjson' is required for OrjsonDecoder, pip install pymsgraph[fast]"
+            ) from e
+        self._loads = orjson.loads
+
+    def decode(self, content: bytes) -> Any:
+        return self._loads(content)
+
+
+# https://jcristharif.com/msgspec/structs.html
+class MsgspecDecoder(JSONDecoder):
+    NAME = "msgspec"
+    FIELD_TYPES: dict[type[Field], Any] = {
+        IntegerField: int,
+        BooleanField: bool,
+        DateTimeField: datetime.datetime,
+    }
+
+    def __init__(self) -> None:
+        try:
+            import msgspec
+        except ImportError as e:
+            raise ImportError(
+                "Package 'msgspec' is required for MsgspecDecoder, pip install pymsgraph[fast]"
+            ) from e
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._page_decoders: dict[type["Resource"], Any] = {}
+
+    def decode(self, content: bytes) -> Any:
+        return self._decoder.decode(content)
+
+    def decode_page(self, content: bytes, klass: type["Resource"]) -> Any:
+        try:
+            decoder = self._page_decoders[klass]
+        except KeyError:
+            decoder = self._msgspec.json.Decoder(self.get_page_type(klass))
+            self._page_decoders[klass] = decoder
+        return decoder.decode(content)
+
+    def get_struct_type(self, klass: type["Resource"]) -> Any:
+        msgspec = self._msgspec
+        fields = []
+        for name, field in get_fields(klass).items():
+            field_type = Any
+            for field_class, _type in self.FIELD_TYPES.items():
+                if isinstance(field, field_class):
+                    field_type = _type | None
+                    break
+            fields.append(
+                (name, field_type, msgspec.field(default=None, name=field.key))
+            )
+        return msgspec.defstruct(f"{klass.__name__}Struct", fields, frozen=True)
+
+    def get_page_type(self, klass: type["Resource"]) -> Any:
+        msgspec = self._msgspec
+        return msgspec.defstruct(
+            f"{klass.__name__}Page",
+            [
+                ("value", list[self.get_struct_type(klass)]),
+                (
+                    "next_link",
+                    str | None,
+                    msgspec.field(default=None, name="@odata.nextLink"),
+                ),
+                (
+                    "delta_link",
+                    str | None,
+                    msgspec.field(default=None, name="@odata.deltaLink"),
+                ),
+            ],
+        )
+
+
+DECODERS: dict[str, type[JSONDecoder]] = {
+    decoder.NAME: decoder for decoder in (JSONDecoder, OrjsonDecoder, MsgspecDecoder)
+}
+
+
+def get_decoder(decoder: str | JSONDecoder | None = None) -> JSONDecoder:
+    if isinstance(decoder, JSONDecoder):
+        return decoder
+    if decoder is None or decoder == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return DECODERS[name]()
+            except ImportError:
+                continue
+        return JSONDecoder()
+    try:
+        return DECODERS[decoder]()
+    except KeyError:
+        raise ValueError(f"Unknown JSON decoder, '{decoder}'")
@@ -0,0 +1,292 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+if TYPE_CHECKING:
+    from .drives import DriveItem
+
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0
+# https://learn.microsoft.com/en-us/onedrive/developer/code-snippets/quickxorhash
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+STREAM_EXCEPTIONS = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+class QuickXorHash:
+    WIDTH = 160
+    SHIFT = 11
+    BLOCK_SIZE = 160
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._state = 0
+        self._length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> None:
+        size = len(data)
+        if not size:
+            return
+
+        # Bytes whose absolute positions are congruent modulo the block size are
+        # xored into the same bits, so fold the chunk down to a single block first.
+        block_size = self.BLOCK_SIZE
+        padding = self._length % block_size
+        total = padding + size
+        value = int.from_bytes(data, "little") << (padding * 8)
+        bits = (total + (-total % block_size)) * 8
+        block_bits = block_size * 8
+        while bits > block_bits:
+            half = (bits // block_bits // 2) * block_bits
+            value = (value & ((1 << half) - 1)) ^ (value >> half)
+            bits -= half
+
+        width = self.WIDTH
+        mask = (1 << width) - 1
+        state = self._state
+        for i, byte in enumerate(value.to_bytes(block_size, "little")):
+            if byte:
+                shifted = byte << ((i * self.SHIFT) % width)
+                state ^= (shifted & mask) | (shifted >> width)
+        self._state = state
+        self._length += size
+
+    def digest(self) -> bytes:
+        result = bytearray(self._state.to_bytes(self.WIDTH // 8, "little"))
+        for i, byte in enumerate(self._length.to_bytes(8, "little")):
+            result[len(result) - 8 + i] ^= byte
+        return bytes(result)
+
+    def b64digest(self) -> str:
+        return base64.b64encode(self.digest()).decode()
+
+
+def download_file(
+    item: "DriveItem",
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = 1,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    resume: bool = True,
+    verify: bool = True,
+    max_failures: int = 5,
+) -> str:
+    item._client._require_sync("download_file")
+    if item.size is None or item.name is None:
+        item.get()
+
+    size = item.size
+    if size is None:
+        raise ValueError(f"Drive item has no size, '{item.url}'")
+
+    part_path = f"{path}.part"
+    state_path = f"{part_path}.json"
+    is_segmented = max_workers > 1 and size > segment_size
+    state = {
+        "size": size,
+        "cTag": item.c_tag,
+        "eTag": item.e_tag,
+        "segment_size": segment_size if is_segmented else None,
+    }
+    if not resume or not _can_resume(state_path, state):
+        _remove(part_path)
+        _remove(state_path)
+
+    if is_segmented:
+        _download_segments(
+            item, part_path, state, chunk_size, max_workers, segment_size, max_failures
+        )
+    else:
+        _save_state(state_path, state)
+        _download_stream(item, part_path, size, chunk_size, max_failures)
+
+    if verify:
+        try:
+            verify_file(item, part_path)
+        except ValueError:
+            _remove(part_path)
+            _remove(state_path)
+            raise
+
+    os.replace(part_path, path)
+    _remove(state_path)
+    return path
+
+
+def verify_file(item: "DriveItem", path: str) -> None:
+    size = os.path.getsize(path)
+    if item.size is not None and size != item.size:
+        raise ValueError(
+            f"Downloaded size does not match, expected {item.size} got {size}, '{path}'"
+        )
+
+    result = compare_hash(item, path)
+    if result is not None and not result[0]:
+        _, name, expected, actual = result
+        raise ValueError(
+            f"Downloaded {name} does not match, expected {expected} got {actual}, '{path}'"
+        )
+
+
+def compare_hash(item: "DriveItem", path: str) -> tuple[bool, str, str, str] | None:
+    hashes: dict[str, str] = (item.file or {}).get("hashes", {})
+    if "quickXorHash" in hashes:
+        name, expected, h = "quickXorHash", hashes["quickXorHash"], QuickXorHash()
+    elif "sha256Hash" in hashes:
+        name, expected, h = "sha256Hash", hashes["sha256Hash"], hashlib.sha256()
+    elif "sha1Hash" in hashes:
+        name, expected, h = "sha1Hash", hashes["sha1Hash"], hashlib.sha1()
+    else:
+        return None
+
+    with open(path, "rb") as f:
+        while chunk := f.read(DEFAULT_CHUNK_SIZE):
+            h.update(chunk)
+
+    if isinstance(h, QuickXorHash):
+        actual = h.b64digest()
+        matches = actual == expected
+    else:
+        actual = h.hexdigest()
+        matches = actual.lower() == expected.lower()
+    return matches, name, expected, actual
+
+
+def _get_content(
+    item: "DriveItem", start: int, end: int | None = None
+) -> requests.Response:
+    headers: dict[str, str] = {}
+    url = item.download_url
+    if url is None:
+        url = item.content.url
+        headers.update(item._client._headers)
+    if start or end is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    response = item._client._request("GET", url, headers=headers, stream=True)
+    response.raise_for_status()
+    return response
+
+
+def _download_stream(
+    item: "DriveItem", part_path: str, size: int, chunk_size: int, max_failures: int
+) -> None:
+    failures = 0
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset >= size and size:
+            return
+        with _get_content(item, offset) as response:
+            if offset and response.status_code != 206:
+                offset = 0
+            with open(part_path, "r+b" if offset else "wb") as f:
+                f.seek(offset)
+                try:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                except STREAM_EXCEPTIONS:
+                    failures += 1
+                    if failures > max_failures:
+                        raise
+                    continue
+        return
+
+
+def _download_segments(
+    item: "DriveItem",
+    part_path: str,
+    state: dict[str, Any],
+    chunk_size: int,
+    max_workers: int,
+    segment_size: int,
+    max_failures: int,
+) -> None:
+    state_path = f"{part_path}.json"
+    size = state["size"]
+    segments = [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+    ]
+
+    done: set[int] = set()
+    if os.path.exists(part_path):
+        done.update(_load_state(state_path).get("done", []))
+
+    if not done:
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+    _save_state(state_path, {**state, "done": sorted(done)})
+
+    lock = threading.Lock()
+
+    def save_state() -> None:
+        _save_state(state_path, {**state, "done": sorted(done)})
+
+    def download_segment(index: int) -> None:
+        start, end = segments[index]
+        failures = 0
+        offset = start
+        with open(part_path, "r+b") as f:
+            while offset <= end:
+                try:
+                    with _get_content(item, offset, end) as response:
+                        if response.status_code != 206:
+                            raise ValueError(
+                                f"Server does not support range requests, '{item.url}'"
+                            )
+                        f.seek(offset)
+                        for chunk in response.iter_content(chunk_size):
+                            f.write(chunk)
+                            offset += len(chunk)
+                except STREAM_EXCEPTIONS:
+                    failures += 1
+                    if failures > max_failures:
+                        raise
+        with lock:
+            done.add(index)
+            save_state()
+
+    pending = [i for i in range(len(segments)) if i not in done]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(download_segment, pending):
+            pass
+
+
+def _can_resume(state_path: str, state: dict[str, Any]) -> bool:
+    # A partial file is only reused for the item version it was written from,
+    # without a cTag or eTag there is no way to tell.
+    if state["cTag"] is None and state["eTag"] is None:
+        return False
+    saved = _load_state(state_path)
+    return all(saved.get(key) == value for key, value in state.items())
+
+
+def _load_state(state_path: str) -> dict[str, Any]:
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_state(state_path: str, state: dict[str, Any]) -> None:
+    with open(state_path, "w") as f:
+        json.dump(state, f)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,12 +1,19 @@
 import os
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Generic, Self, Type, TypeVar
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterator, Self, Type, TypeVar
 from unittest.mock import Base
 
 import requests
 
+from .downloads import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SEGMENT_SIZE,
+    download_file,
+)
 from .fields import CharField, DateTimeField, DictField, IntegerField
-from .resources import MultiValuedResource, R, Resource, SingleValuedResource
+from .resources import Delta, MultiValuedResource, R, Resource, SingleValuedResource
+from .uploads import DEFAULT_FRAGMENT_SIZE, upload_file, upload_files
 
 if TYPE_CHECKING:
     from pymsgraph import Client
@@ -35,6 +42,25 @@ class Drive(SingleValuedResource):
     name = CharField()
     web_url = CharField()
 
+    @property
+    def root(self) -> "RootDriveItem":
+        return RootDriveItem(self._client, parent=self)
+
+    def walk(
+        self,
+        max_workers: int = 8,
+        select: str | None = None,
+        max_depth: int | None = None,
+        folder_filter: Callable[[str, "DriveItem"], bool] | None = None,
+    ) -> Iterator[tuple[str, "DriveItem"]]:
+        self._client._require_sync("Drive.walk")
+        return self.root.walk(
+            max_workers=max_workers,
+            select=select,
+            max_depth=max_depth,
+            folder_filter=folder_filter,
+        )
+
 
 class DriveById(Drive):
 
@@ -59,7 +85,26 @@ class DriveById(Drive):
         self._drive_id = _drive_id
 
 
-class DriveItemChildren(MultiValuedResource["DriveItem"]):
+class DriveItemCollection:
+    # Items are addressed through their drive, not the collection that
+    # listed them. Root items and some delta tombstones have no driveId, they
+    # belong to the drive the collection was listed from.
+    def _get_obj(
+        self, klass: type["DriveItem"], client: "Client", data: dict[str, Any]
+    ) -> "DriveItem":
+        drive_id = (data.get("parentReference") or {}).get("driveId")
+        if drive_id is not None:
+            return klass(client, data=data, parent=client.drives.by_id(drive_id).items)
+
+        parent = self._parent  # type: ignore[attr-defined]
+        while parent is not None and not isinstance(parent, Drive):
+            parent = parent._parent
+        if parent is None:
+            raise ValueError(f"Drive item requires a drive, '{data.get('id')}'")
+        return klass(client, data=data, parent=DriveItems(client, parent=parent))
+
+
+class DriveItemChildren(DriveItemCollection, MultiValuedResource["DriveItem"]):
     class RequestMethod(MultiValuedResource.RequestMethod):
         POST = True
 
@@ -73,12 +118,6 @@ class DriveItemChildren(MultiValuedResource["DriveItem"]):
     def relative_url(self) -> str:
         return self._relative_url
 
-    def _get_obj(
-        self, klass: type["DriveItem"], client: "Client", data: dict[str, Any]
-    ) -> "DriveItem":
-        drive_items = client.drives.by_id(data["parentReference"]["driveId"]).items
-        return klass(client, data=data, parent=drive_items)
-
     def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
         chidren_relative_url = kwargs.get("chidren_relative_url")
         if chidren_relative_url is None:
@@ -86,6 +125,16 @@ class DriveItemChildren(MultiValuedResource["DriveItem"]):
         self._relative_url = chidren_relative_url
 
 
+# https://learn.microsoft.com/en-us/graph/api/driveitem-delta?view=graph-rest-1.0&tabs=http
+class DriveItemsDelta(DriveItemCollection, Delta, MultiValuedResource["DriveItem"]):
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        FILTER = False
+        ORDERBY = False
+
+    ITEM_CLASS = "DriveItem"
+
+
 class DriveItems(Resource):
 
     @property
@@ -105,6 +154,8 @@ class BaseDriveItem(SingleValuedResource):
         SEARCH = True
 
     created_date_time = DateTimeField()
+    c_tag = CharField()
+    e_tag = CharField()
     id = CharField(fallback="item_id")
     last_modified_date_time = DateTimeField()
     name = CharField()
@@ -113,6 +164,7 @@ class BaseDriveItem(SingleValuedResource):
     parent_reference = CharField()
     download_url = CharField(to_field="@microsoft.graph.downloadUrl")
     file = DictField()
+    folder = DictField()
 
     @property
     def children(self) -> "DriveItemChildren":
@@ -125,6 +177,62 @@ class BaseDriveItem(SingleValuedResource):
     def children_relative_url(self) -> str:
         pass
 
+    def walk(
+        self,
+        max_workers: int = 8,
+        select: str | None = None,
+        max_depth: int | None = None,
+        folder_filter: Callable[[str, "DriveItem"], bool] | None = None,
+    ) -> Iterator[tuple[str, "DriveItem"]]:
+        self._client._require_sync("DriveItem.walk")
+        if select is not None:
+            fields = [f.strip() for f in select.split(",")]
+            for field in ("id", "name", "folder", "parentReference"):
+                if field not in fields:
+                    fields.append(field)
+            select = ",".join(fields)
+        return self._walk(max_workers, select, max_depth, folder_filter)
+
+    def _walk(
+        self,
+        max_workers: int,
+        select: str | None,
+        max_depth: int | None,
+        folder_filter: Callable[[str, "DriveItem"], bool] | None,
+    ) -> Iterator[tuple[str, "DriveItem"]]:
+        def list_children(
+            folder: "BaseDriveItem", path: str, depth: int
+        ) -> tuple[str, int, list["DriveItem"]]:
+            children = folder.children
+            if select is not None:
+                children.select(select)
+            return path, depth, list(children.iter_all_items(discard_pages=True))
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            pending: set[Future] = {executor.submit(list_children, self, "", 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth, items = future.result()
+                    depth += 1
+                    for item in items:
+                        item_path = f"{path}/{item.name}" if path else str(item.name)
+                        yield item_path, item
+                        if item.folder is None:
+                            continue
+                        if max_depth is not None and depth >= max_depth:
+                            continue
+                        if folder_filter is not None and not folder_filter(
+                            item_path, item
+                        ):
+                            continue
+                        pending.add(
+                            executor.submit(list_children, item, item_path, depth)
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
 
 # https://learn.microsoft.com/en-us/graph/api/driveitem-get?view=graph-rest-1.0&tabs=http
 class DriveItem(BaseDriveItem):
@@ -137,6 +245,10 @@ class DriveItem(BaseDriveItem):
     def content(self) -> "DriveItem.Content":
         return self.Content(self._client, parent=self)
 
+    @property
+    def create_upload_session(self) -> "DriveItem.CreateUploadSession":
+        return self.CreateUploadSession(self._client, parent=self)
+
     @property
     def relative_url(self) -> str:
         return f"/{self._item_id}"
@@ -154,8 +266,18 @@ class DriveItem(BaseDriveItem):
             )
         self._item_id = _item_id
 
-    def download(self, folder_path: str | None = None) -> "DriveItem":
-        content = self.content.get()
+    def download(
+        self,
+        folder_path: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 1,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        resume: bool = True,
+        verify: bool = True,
+    ) -> "DriveItem":
+        self._client._require_sync("DriveItem.download")
+        if self.name is None or self.size is None:
+            self.get()
         name = self.name
         if name is None:
             raise ValueError("Attribute name must return a str at this point.")
@@ -163,8 +285,15 @@ class DriveItem(BaseDriveItem):
             path = os.path.join(folder_path, name)
         else:
             path = name
-        with open(path, "wb") as f:
-            f.write(content._get_response.content)
+        download_file(
+            self,
+            path,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            segment_size=segment_size,
+            resume=resume,
+            verify=verify,
+        )
         return self
 
     def move(self, parent_id: str, filename: str | None = None):
@@ -172,7 +301,7 @@ class DriveItem(BaseDriveItem):
         if filename:
             data["name"] = filename
 
-        self.patch(data)
+        return self.patch(data)
 
     class Content(SingleValuedResource):
         @property
@@ -182,6 +311,14 @@ class DriveItem(BaseDriveItem):
         class RequestMethod(BaseDriveItem.RequestMethod):
             PUT = True
 
+    class CreateUploadSession(Resource):
+        class RequestMethod(Resource.RequestMethod):
+            POST = True
+
+        @property
+        def relative_url(self) -> str:
+            return "/createUploadSession"
+
 
 class RootDriveItem(BaseDriveItem):
 
@@ -198,13 +335,41 @@ class RootDriveItem(BaseDriveItem):
             self._client, parent=self, relative_path=relative_path
         )
 
-    def upload(self, path: str) -> "RootDriveItem":
+    def delta(self, delta_link: str | None = None) -> "DriveItemsDelta":
+        return DriveItemsDelta(self._client, parent=self, delta_link=delta_link)
+
+    def upload(
+        self,
+        path: str,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        conflict_behavior: str = "replace",
+    ) -> "RootDriveItem":
+        self._client._require_sync("DriveItem.upload")
         _, filename = os.path.split(path)
-        with open(path, "rb") as f:
-            content = f.read()
-            self.by_relative_path(filename).content.put(content)
+        upload_file(
+            self.by_relative_path(filename),
+            path,
+            fragment_size=fragment_size,
+            conflict_behavior=conflict_behavior,
+        )
         return self
 
+    def upload_files(
+        self,
+        paths: list[str],
+        max_workers: int = 4,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        conflict_behavior: str = "replace",
+    ) -> list[dict[str, Any]]:
+        self._client._require_sync("DriveItem.upload_files")
+        return upload_files(
+            self,
+            paths,
+            max_workers=max_workers,
+            fragment_size=fragment_size,
+            conflict_behavior=conflict_behavior,
+        )
+
 
 class DriveItemByRelativePath(DriveItem):
 
@@ -231,15 +396,50 @@ class DriveItemByRelativePath(DriveItem):
         self._relative_path = _relative_path
         self._children_relative_url = ":/chidren"
 
-    def upload(self, path: str, filename: str | None) -> "DriveItem":
+    @property
+    def create_upload_session(self) -> "DriveItemByRelativePath.CreateUploadSession":
+        return self.CreateUploadSession(self._client, parent=self)
+
+    def upload(
+        self,
+        path: str,
+        filename: str | None = None,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        conflict_behavior: str = "replace",
+    ) -> "DriveItem":
+        self._client._require_sync("DriveItem.upload")
         if filename is None:
             _, filename = os.path.split(path)
-        with open(path, "rb") as f:
-            content = f.read()
-            self.by_relative_path(filename).content.put(content)
+        upload_file(
+            self.by_relative_path(filename),
+            path,
+            fragment_size=fragment_size,
+            conflict_behavior=conflict_behavior,
+        )
         return self
 
+    def upload_files(
+        self,
+        paths: list[str],
+        max_workers: int = 4,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        conflict_behavior: str = "replace",
+    ) -> list[dict[str, Any]]:
+        self._client._require_sync("DriveItem.upload_files")
+        return upload_files(
+            self,
+            paths,
+            max_workers=max_workers,
+            fragment_size=fragment_size,
+            conflict_behavior=conflict_behavior,
+        )
+
     class Content(DriveItem.Content):
         @property
         def relative_url(self) -> str:
             return f":/content"
+
+    class CreateUploadSession(DriveItem.CreateUploadSession):
+        @property
+        def relative_url(self) -> str:
+            return ":/createUploadSession"
@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+from typing import IO, Any, Iterable
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+
+class JsonlWriter:
+    def __init__(
+        self,
+        file: str | os.PathLike | IO[bytes],
+        keys: list[str] | None = None,
+        compression: str | None = None,
+    ) -> None:
+        if compression is None and isinstance(file, (str, os.PathLike)):
+            _, suffix = os.path.splitext(file)
+            compression = COMPRESSION_SUFFIXES.get(suffix)
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Compression is not supported, '{compression}'")
+
+        compressor: Any = None
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "Package 'zstandard' is required for zstd compression, pip install pymsgraph[zstd]"
+                ) from e
+            compressor = zstandard.ZstdCompressor()
+
+        self.keys = keys
+        self.count = 0
+        self._file: IO[bytes] | None = None
+        if isinstance(file, (str, os.PathLike)):
+            file = self._file = open(file, "wb")
+
+        self._raw = file
+        self._writer: Any = file
+        if compression == "gzip":
+            self._writer = gzip.GzipFile(fileobj=file, mode="wb")
+        elif compressor is not None:
+            self._writer = compressor.stream_writer(file, closefd=False)
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write_items(self, items: Iterable[dict[str, Any]]) -> None:
+        keys = self.keys
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        lines = []
+        for item in items:
+            if keys is not None:
+                item = {key: item[key] for key in keys if key in item}
+            lines.append(dumps(item))
+        if lines:
+            lines.append("")
+            self._writer.write("\n".join(lines).encode())
+            self.count += len(lines) - 1
+
+    def close(self) -> None:
+        # Compressed writers finish their stream on close but leave the
+        # underlying file open.
+        if self._writer is not self._raw:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
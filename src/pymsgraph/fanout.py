@@ -0,0 +1,147 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Hashable, Iterable, Iterator
+
+from .resources import MultiValuedResource, Resource
+
+
+@dataclass
+class FanOutResult:
+    key: Hashable
+    resource: Resource
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def result(self) -> Resource:
+        if self.error is not None:
+            raise self.error
+        return self.resource
+
+
+class FanOut:
+    def __init__(self, max_workers: int = 8, prefetch: int = 0) -> None:
+        self.prefetch = prefetch
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pymsgraph-fanout"
+        )
+        self._done: queue.Queue[FanOutResult] = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def __enter__(self) -> "FanOut":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, resource: Resource, key: Hashable | None = None) -> Future:
+        if key is None:
+            key = resource.url_with_query_params
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(self._fetch, resource)
+        future.add_done_callback(lambda f: self._on_done(key, resource, f))
+        return future
+
+    def as_completed(self) -> Iterator[FanOutResult]:
+        # Resources submitted while iterating, e.g. children of a result, are
+        # yielded by the same loop.
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+            result = self._done.get()
+            with self._lock:
+                self._pending -= 1
+            yield result
+
+    def close(self, cancel: bool = False) -> None:
+        # Collections already being paged stop at the next page boundary.
+        if cancel:
+            self._stop_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+
+    def _on_done(self, key: Hashable, resource: Resource, future: Future) -> None:
+        error: BaseException | None
+        if future.cancelled():
+            error = CancelledError()
+        else:
+            error = future.exception()
+        self._done.put(FanOutResult(key, resource, error))
+
+    def _fetch(self, resource: Resource) -> None:
+        if isinstance(resource, MultiValuedResource):
+            for _ in resource.iter_pages(prefetch=self.prefetch):
+                if self._stop_event.is_set():
+                    raise CancelledError()
+        else:
+            resource.get()
+
+
+def fan_out(
+    resources: Iterable[Resource] | dict[Hashable, Resource],
+    max_workers: int = 8,
+    prefetch: int = 0,
+) -> Iterator[FanOutResult]:
+    items: Iterable[tuple[Any, Resource]]
+    if isinstance(resources, dict):
+        items = resources.items()
+    else:
+        items = ((None, resource) for resource in resources)
+
+    fanout = FanOut(max_workers=max_workers, prefetch=prefetch)
+    try:
+        for key, resource in items:
+            fanout.submit(resource, key=key)
+        yield from fanout.as_completed()
+    finally:
+        fanout.close(cancel=True)
+
+
+async def afan_out(
+    resources: Iterable[Resource] | dict[Hashable, Resource],
+    max_workers: int = 8,
+    prefetch: int = 0,
+) -> AsyncIterator[FanOutResult]:
+    items: Iterable[tuple[Any, Resource]]
+    if isinstance(resources, dict):
+        items = resources.items()
+    else:
+        items = ((None, resource) for resource in resources)
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch(key: Hashable, resource: Any) -> FanOutResult:
+        if key is None:
+            key = resource.url_with_query_params
+        try:
+            async with semaphore:
+                if isinstance(resource, MultiValuedResource):
+                    async for _ in resource.iter_pages(prefetch=prefetch):
+                        pass
+                else:
+                    await resource.get()
+        except Exception as e:
+            return FanOutResult(key, resource, e)
+        return FanOutResult(key, resource)
+
+    tasks = [asyncio.create_task(fetch(key, resource)) for key, resource in items]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # Collections still being paged are cancelled at their next request.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
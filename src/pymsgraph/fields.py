@@ -6,6 +6,8 @@ T = TypeVar("T")
 
 
 class Field(ABC, Generic[T]):
+    MEMOIZE = False
+
     def __init__(
         self,
         is_readonly: bool = True,
@@ -15,26 +17,43 @@ class Field(ABC, Generic[T]):
         self.is_readonly = is_readonly
         self.fallback = fallback
         self.to_field = to_field
+        self._fallback_attr = f"_{fallback}" if fallback else None
 
     def __set_name__(self, owner, name):
         self._name = name
         names = name.split("_")
         self.name = "".join([names[0]] + [i.title() for i in names[1:]])
+        self.key = self.to_field or self.name
 
     def __get__(self, obj, objtype=None) -> T | None:
         # if obj is None:
         #     return self
-        name = self.name
-        if self.to_field:
-            name = self.to_field
+        data = obj._data
+        key = self.key
+        if self.MEMOIZE:
+            # Decoded values live next to the dict they came from so replacing
+            # _data, e.g. on get(), drops them.
+            cache = getattr(obj, "_field_cache", None)
+            if cache is None or cache[0] is not data:
+                cache = (data, {})
+                obj._field_cache = cache
+            values = cache[1]
+            try:
+                return values[key]
+            except KeyError:
+                pass
+
         try:
-            val = obj._data[name]
+            val = data[key]
         except KeyError:
-            if self.fallback:
-                return self.get_value(getattr(obj, f"_{self.fallback}", None))
+            if self._fallback_attr:
+                return self.get_value(getattr(obj, self._fallback_attr, None))
             return None
-        else:
-            return self.get_value(val)
+
+        value = self.get_value(val)
+        if self.MEMOIZE:
+            values[key] = value
+        return value
 
     def __set__(self, obj, value) -> None:
         if self.is_readonly:
@@ -65,6 +84,8 @@ class IntegerField(Field[int]):
 
 
 class DateTimeField(Field[datetime.datetime]):
+    MEMOIZE = True
+
     def get_value(self, val: Any) -> datetime.datetime:
         return datetime.datetime.fromisoformat(str(val))
 
@@ -72,3 +93,12 @@ class DateTimeField(Field[datetime.datetime]):
 class BooleanField(Field[bool]):
     def get_value(self, val: Any) -> bool:
         return bool(val)
+
+
+def get_fields(klass: type) -> dict[str, Field]:
+    fields: dict[str, Field] = {}
+    for base in reversed(klass.__mro__):
+        for name, value in vars(base).items():
+            if isinstance(value, Field):
+                fields[name] = value
+    return fields
@@ -1,8 +1,13 @@
-from typing import TYPE_CHECKING, Any, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+import requests
+
+from .batch import Batch
 from .directory_objects import DirectoryObject as do
 from .fields import BooleanField, CharField
-from .resources import MultiValuedResource, SingleValuedResource
+from .resources import Delta, MultiValuedResource, SingleValuedResource
 
 if TYPE_CHECKING:
     from .users import User
@@ -24,9 +29,24 @@ class Groups(MultiValuedResource["Group"]):
     def by_id(self, group_id: str) -> "Group":
         return Group(self._client, parent=self, group_id=group_id)
 
+    def delta(self, delta_link: str | None = None) -> "GroupsDelta":
+        return GroupsDelta(self._client, parent=self, delta_link=delta_link)
+
+
+# https://learn.microsoft.com/en-us/graph/api/group-delta?view=graph-rest-1.0&tabs=http
+class GroupsDelta(Delta, MultiValuedResource["Group"]):
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        ORDERBY = False
+
+    ITEM_CLASS = "Group"
+
 
 class Group(SingleValuedResource):
 
+    class RequestMethod(SingleValuedResource.RequestMethod):
+        PATCH = True
+
     id = CharField()
     description = CharField()
     display_name = CharField()
@@ -51,6 +71,20 @@ class Group(SingleValuedResource):
         self._group_id = group_id
 
 
+@dataclass
+class MembershipResult:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    def update(self, other: "MembershipResult") -> None:
+        self.added.extend(other.added)
+        self.removed.extend(other.removed)
+        self.skipped.extend(other.skipped)
+        self.failed.update(other.failed)
+
+
 class DirectoryObject(do):
 
     class Reference(do.Reference):
@@ -99,5 +133,170 @@ class Members(MultiValuedResource["User"]):
     def by_directory_object_id(self, dir_obj_id: str) -> DirectoryObject:
         return DirectoryObject(self._client, parent=self, dir_obj_id=dir_obj_id)
 
-    def add(self, user_ids: str | Iterable[str]):
-        pass
+    # https://learn.microsoft.com/en-us/graph/api/group-post-members?view=graph-rest-1.0&tabs=http#example-2-add-multiple-members-to-a-group-in-a-single-request
+    MAX_BIND_MEMBERS = 20
+
+    def get_member_ids(self) -> set[str]:
+        self._client._require_sync("Members.get_member_ids")
+        members = Members(self._client, parent=self._parent).select("id")
+        return {
+            item["id"]
+            for page in members.iter_pages(discard_pages=True)
+            for item in page["value"]
+        }
+
+    def add(
+        self,
+        dir_obj_ids: str | Iterable[str],
+        max_workers: int = 4,
+        skip_existing: bool = True,
+    ) -> MembershipResult:
+        self._client._require_sync("Members.add")
+        dir_obj_ids = _get_ids(dir_obj_ids)
+        result = MembershipResult()
+        if skip_existing and dir_obj_ids:
+            current = self.get_member_ids()
+            result.skipped.extend(i for i in dir_obj_ids if i in current)
+            dir_obj_ids = [i for i in dir_obj_ids if i not in current]
+
+        size = self.MAX_BIND_MEMBERS
+        chunks = [dir_obj_ids[i : i + size] for i in range(0, len(dir_obj_ids), size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_result in executor.map(self._add_chunk, chunks):
+                result.update(chunk_result)
+        return result
+
+    def remove(
+        self,
+        dir_obj_ids: str | Iterable[str],
+        max_workers: int = 4,
+        skip_missing: bool = True,
+    ) -> MembershipResult:
+        self._client._require_sync("Members.remove")
+        dir_obj_ids = _get_ids(dir_obj_ids)
+        result = MembershipResult()
+        if skip_missing and dir_obj_ids:
+            current = self.get_member_ids()
+            result.skipped.extend(i for i in dir_obj_ids if i not in current)
+            dir_obj_ids = [i for i in dir_obj_ids if i in current]
+
+        size = Batch.MAX_REQUESTS
+        chunks = [dir_obj_ids[i : i + size] for i in range(0, len(dir_obj_ids), size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_result in executor.map(self._remove_chunk, chunks):
+                result.update(chunk_result)
+        return result
+
+    def set(
+        self, dir_obj_ids: str | Iterable[str], max_workers: int = 4
+    ) -> MembershipResult:
+        self._client._require_sync("Members.set")
+        dir_obj_ids = _get_ids(dir_obj_ids)
+        current = self.get_member_ids()
+        result = MembershipResult()
+        result.skipped.extend(i for i in dir_obj_ids if i in current)
+        result.update(
+            self.add(
+                [i for i in dir_obj_ids if i not in current],
+                max_workers=max_workers,
+                skip_existing=False,
+            )
+        )
+        desired = set(dir_obj_ids)
+        result.update(
+            self.remove(
+                [i for i in current if i not in desired],
+                max_workers=max_workers,
+                skip_missing=False,
+            )
+        )
+        return result
+
+    def _add_chunk(self, dir_obj_ids: list[str]) -> MembershipResult:
+        client = self._client
+        group = Group(
+            client, parent=self._parent._parent, group_id=self._parent._group_id
+        )
+        payload = {
+            "members@odata.bind": [
+                client.directory_objects.by_id(i).url for i in dir_obj_ids
+            ]
+        }
+        try:
+            group.patch(payload)
+        except requests.exceptions.HTTPError as e:
+            if len(dir_obj_ids) == 1:
+                return self._get_failed_result(dir_obj_ids[0], e)
+        else:
+            return MembershipResult(added=list(dir_obj_ids))
+
+        # The whole request fails if any member is invalid, so fall back to one
+        # $ref request per member, batched, to find out which ones.
+        ref = self.Reference(client, parent=self)
+        errors = self._send_batch(
+            {i: ("POST", ref.url, ref.get_payload_from_arg(i)) for i in dir_obj_ids}
+        )
+        result = MembershipResult()
+        for dir_obj_id, error in errors.items():
+            if error is None:
+                result.added.append(dir_obj_id)
+            else:
+                result.update(self._get_failed_result(dir_obj_id, error))
+        return result
+
+    def _remove_chunk(self, dir_obj_ids: list[str]) -> MembershipResult:
+        errors = self._send_batch(
+            {
+                i: ("DELETE", self.by_directory_object_id(i).ref.url, None)
+                for i in dir_obj_ids
+            }
+        )
+        result = MembershipResult()
+        for dir_obj_id, error in errors.items():
+            if error is None:
+                result.removed.append(dir_obj_id)
+            elif error.response is not None and error.response.status_code == 404:
+                result.skipped.append(dir_obj_id)
+            else:
+                result.failed[dir_obj_id] = error
+        return result
+
+    def _send_batch(
+        self, requests_data: dict[str, tuple[str, str, Any]]
+    ) -> dict[str, requests.exceptions.HTTPError | None]:
+        errors: dict[str, requests.exceptions.HTTPError | None] = {}
+
+        def callback(dir_obj_id: str) -> Callable[[requests.Response], None]:
+            def on_response(response: requests.Response) -> None:
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    errors[dir_obj_id] = e
+                else:
+                    errors[dir_obj_id] = None
+
+            return on_response
+
+        batch = Batch(self._client, raise_on_error=False)
+        try:
+            for dir_obj_id, (method, url, payload) in requests_data.items():
+                batch.add(method, url, callback(dir_obj_id), json=payload)
+            batch.flush()
+        except requests.exceptions.HTTPError as e:
+            for dir_obj_id in requests_data:
+                errors.setdefault(dir_obj_id, e)
+        return {i: errors[i] for i in requests_data}
+
+    def _get_failed_result(
+        self, dir_obj_id: str, error: requests.exceptions.HTTPError
+    ) -> MembershipResult:
+        response = error.response
+        if response is not None and "already exist" in response.text:
+            return MembershipResult(skipped=[dir_obj_id])
+        return MembershipResult(failed={dir_obj_id: error})
+
+
+def _get_ids(ids: str | Iterable[str]) -> list[str]:
+    if isinstance(ids, str):
+        ids = [ids]
+    return list(dict.fromkeys(ids))
@@ -0,0 +1,158 @@
+import threading
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+
+# https://learn.microsoft.com/en-us/graph/delta-query-groups
+
+
+class MembershipGraph:
+    def __init__(self, client: "Client", prefetch: int = 0) -> None:
+        client._require_sync("MembershipGraph")
+        self._client = client
+        self.prefetch = prefetch
+        self.delta_link: str | None = None
+        self._members: dict[str, set[str]] = {}
+        self._parents: dict[str, set[str]] = {}
+        self._ancestors: dict[str, frozenset[str]] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def group_ids(self) -> set[str]:
+        return set(self._members)
+
+    def load(self) -> "MembershipGraph":
+        with self._lock:
+            self._members.clear()
+            self._parents.clear()
+            self._ancestors.clear()
+            self.delta_link = None
+            self._apply_changes(None)
+        return self
+
+    def refresh(self) -> "MembershipGraph":
+        if self.delta_link is None:
+            return self.load()
+        with self._lock:
+            try:
+                self._apply_changes(self.delta_link)
+            except requests.exceptions.HTTPError as e:
+                # An expired delta token requires a full resync.
+                if e.response is None or e.response.status_code != 410:
+                    raise
+                return self.load()
+        return self
+
+    def is_member(self, member_id: str, group_id: str, transitive: bool = True) -> bool:
+        if not transitive:
+            return group_id in self._parents.get(member_id, ())
+        return group_id in self.get_groups(member_id)
+
+    def get_groups(self, member_id: str, transitive: bool = True) -> frozenset[str]:
+        if not transitive:
+            return frozenset(self._parents.get(member_id, ()))
+        try:
+            return self._ancestors[member_id]
+        except KeyError:
+            pass
+        with self._lock:
+            ancestors = self._get_ancestors(member_id)
+        return ancestors
+
+    def get_members(self, group_id: str, transitive: bool = True) -> set[str]:
+        with self._lock:
+            members = self._members
+            result = set(members.get(group_id, ()))
+            if not transitive:
+                return result
+            stack = [i for i in result if i in members]
+            visited = {group_id}
+            while stack:
+                nested_group_id = stack.pop()
+                if nested_group_id in visited:
+                    continue
+                visited.add(nested_group_id)
+                for member_id in members[nested_group_id]:
+                    result.add(member_id)
+                    if member_id in members and member_id not in visited:
+                        stack.append(member_id)
+            return result
+
+    def _get_ancestors(self, member_id: str) -> frozenset[str]:
+        ancestors = self._ancestors
+        if member_id in ancestors:
+            return ancestors[member_id]
+
+        parents = self._parents
+        result: set[str] = set()
+        stack = list(parents.get(member_id, ()))
+        while stack:
+            group_id = stack.pop()
+            if group_id in result:
+                continue
+            result.add(group_id)
+            if group_id in ancestors:
+                result.update(ancestors[group_id])
+                continue
+            stack.extend(parents.get(group_id, ()))
+
+        ancestors[member_id] = frozenset(result)
+        return ancestors[member_id]
+
+    def _apply_changes(self, delta_link: str | None) -> None:
+        delta = self._client.groups.delta(delta_link=delta_link)
+        if delta_link is None:
+            delta.select("id,members")
+
+        # A failed page keeps the edges applied so far and the old delta link,
+        # replaying the same changes on the next refresh is harmless.
+        is_changed = False
+        try:
+            for page in delta.iter_pages(discard_pages=True, prefetch=self.prefetch):
+                for group in page["value"]:
+                    is_changed = True
+                    self._apply_group(group)
+        finally:
+            if is_changed:
+                self._ancestors.clear()
+        self.delta_link = delta.delta_link
+
+    def _apply_group(self, group: dict[str, Any]) -> None:
+        group_id = group["id"]
+        if "@removed" in group:
+            self._remove_group(group_id)
+            return
+
+        members = self._members.setdefault(group_id, set())
+        for member in group.get("members@delta", ()):
+            member_id = member["id"]
+            if "@removed" in member:
+                members.discard(member_id)
+                self._discard_parent(member_id, group_id)
+            else:
+                members.add(member_id)
+                self._parents.setdefault(member_id, set()).add(group_id)
+
+    def _remove_group(self, group_id: str) -> None:
+        for member_id in self._members.pop(group_id, ()):
+            self._discard_parent(member_id, group_id)
+        for parent_id in self._parents.pop(group_id, ()):
+            self._members.get(parent_id, set()).discard(group_id)
+
+    def _discard_parent(self, member_id: str, group_id: str) -> None:
+        parents = self._parents.get(member_id)
+        if parents is None:
+            return
+        parents.discard(group_id)
+        if not parents:
+            del self._parents[member_id]
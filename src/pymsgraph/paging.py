@@ -0,0 +1,132 @@
+import asyncio
+import json
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+NEXT_LINK_KEY = b'"@odata.nextLink"'
+DELTA_LINK_KEY = b'"@odata.deltaLink"'
+
+
+@dataclass
+class RawPage:
+    content: bytes
+    next_link: str | None = None
+    delta_link: str | None = None
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "RawPage":
+        # Graph writes the nextLink before the value and the deltaLink after
+        # it, so both are found without scanning most of the page.
+        return cls(
+            content,
+            next_link=extract_link(content, NEXT_LINK_KEY),
+            delta_link=extract_link(content, DELTA_LINK_KEY, reverse=True),
+        )
+
+
+def extract_link(content: bytes, key: bytes, reverse: bool = False) -> str | None:
+    # Quotes inside JSON strings are escaped, so an unescaped quoted key can
+    # only be an object key.
+    index = content.rfind(key) if reverse else content.find(key)
+    if index < 0:
+        return None
+    start = content.find(b'"', content.index(b":", index + len(key)))
+    if start < 0:
+        return None
+    end = content.index(b'"', start + 1)
+    while content[end - 1] == 0x5C:  # backslash
+        end = content.index(b'"', end + 1)
+    return json.loads(content[start : end + 1])
+
+
+def get_next_link(page: Any) -> str | None:
+    if isinstance(page, RawPage):
+        return page.next_link
+    return page.get("@odata.nextLink")
+
+
+class PagePrefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        next_link: str,
+        depth: int = 1,
+    ) -> None:
+        self._fetch = fetch
+        self._queue: queue.Queue[Any | BaseException] = queue.Queue(
+            maxsize=max(depth, 1)
+        )
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(next_link,), name="pymsgraph-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def get(self) -> Any:
+        item = self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self, next_link: str | None) -> None:
+        while next_link and not self._stop_event.is_set():
+            try:
+                data = self._fetch(next_link)
+            except BaseException as e:
+                self._put(e)
+                return
+            if not self._put(data):
+                return
+            next_link = get_next_link(data)
+
+    def _put(self, item: Any | BaseException) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+
+class AsyncPagePrefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        next_link: str,
+        depth: int = 1,
+    ) -> None:
+        self._fetch = fetch
+        self._queue: asyncio.Queue[Any | BaseException] = asyncio.Queue(
+            maxsize=max(depth, 1)
+        )
+        self._task = asyncio.create_task(self._run(next_link))
+
+    async def get(self) -> Any:
+        item = await self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, next_link: str | None) -> None:
+        while next_link:
+            try:
+                data = await self._fetch(next_link)
+            except Exception as e:
+                await self._queue.put(e)
+                return
+            await self._queue.put(data)
+            next_link = get_next_link(data)
@@ -0,0 +1,165 @@
+import asyncio
+import datetime
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from .resources import MultiValuedResource
+
+
+# https://learn.microsoft.com/en-us/graph/filter-query-parameter
+
+STARTSWITH_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+_DONE = object()
+
+
+def startswith_partitions(field: str, chars: str = STARTSWITH_CHARS) -> list[str]:
+    return [f"startswith({field},'{char}')" for char in chars]
+
+
+def date_range_partitions(
+    field: str,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    parts: int,
+) -> list[str]:
+    if parts < 1 or end <= start:
+        raise ValueError(f"Invalid date range, '{start}' - '{end}' in {parts} parts")
+
+    step = (end - start) / parts
+    bounds = [_format_datetime(start + step * i) for i in range(parts)]
+    bounds.append(_format_datetime(end))
+
+    # Open-ended first and last partitions keep the scan exhaustive.
+    partitions = [f"{field} lt {bounds[0]}"]
+    for lower, upper in zip(bounds, bounds[1:]):
+        partitions.append(f"{field} ge {lower} and {field} lt {upper}")
+    partitions.append(f"{field} ge {bounds[-1]}")
+    return partitions
+
+
+def iter_partitioned(
+    resource: "MultiValuedResource",
+    partitions: Iterable[str],
+    max_workers: int = 4,
+    key: str = "id",
+    prefetch: int = 0,
+    buffer_size: int = 1000,
+) -> Iterator[Any]:
+    pending = [resource._partition(partition) for partition in partitions]
+    items: queue.Queue[Any] = queue.Queue(maxsize=max(buffer_size, 1))
+    stop_event = threading.Event()
+    lock = threading.Lock()
+
+    def put(item: Any) -> bool:
+        while not stop_event.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def scan() -> None:
+        while not stop_event.is_set():
+            with lock:
+                if not pending:
+                    break
+                partition = pending.pop(0)
+            try:
+                for obj in partition.iter_all_items(
+                    discard_pages=True, prefetch=prefetch
+                ):
+                    if not put(obj):
+                        return
+            except BaseException as e:
+                put(e)
+                return
+        put(_DONE)
+
+    threads = [
+        threading.Thread(target=scan, name="pymsgraph-partition", daemon=True)
+        for _ in range(max(min(max_workers, len(pending)), 1))
+    ]
+    for thread in threads:
+        thread.start()
+
+    seen: set[Any] = set()
+    running = len(threads)
+    try:
+        while running:
+            item = items.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            item_key = item._data.get(key)
+            if item_key is not None:
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+            yield item
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+
+async def aiter_partitioned(
+    resource: "MultiValuedResource",
+    partitions: Iterable[str],
+    max_workers: int = 4,
+    key: str = "id",
+    prefetch: int = 0,
+    buffer_size: int = 1000,
+) -> AsyncIterator[Any]:
+    pending = [resource._partition(partition) for partition in partitions]
+    items: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(buffer_size, 1))
+
+    async def scan() -> None:
+        while pending:
+            partition = pending.pop(0)
+            try:
+                async for obj in partition.iter_all_items(
+                    discard_pages=True, prefetch=prefetch
+                ):
+                    await items.put(obj)
+            except Exception as e:
+                await items.put(e)
+                return
+        await items.put(_DONE)
+
+    tasks = [
+        asyncio.create_task(scan())
+        for _ in range(max(min(max_workers, len(pending)), 1))
+    ]
+
+    seen: set[Any] = set()
+    running = len(tasks)
+    try:
+        while running:
+            item = await items.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            item_key = item._data.get(key)
+            if item_key is not None:
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _format_datetime(value: datetime.datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return f"{value.isoformat(timespec='seconds')}Z"
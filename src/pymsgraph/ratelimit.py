@@ -0,0 +1,172 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# https://learn.microsoft.com/en-us/graph/throttling-limits
+
+GRAPH_VERSIONS = frozenset({"v1.0", "beta"})
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        min_rate: float | None = None,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid token bucket, '{rate}/s, burst {burst}'")
+        self.max_rate = rate
+        self.min_rate = min(rate, min_rate) if min_rate is not None else rate / 16
+        self.burst = burst
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def reserve(self) -> float:
+        # Takes a token now and returns how long the caller has to wait before
+        # using it. Tokens may go negative, so concurrent callers queue up
+        # behind each other instead of all waking at the same time.
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(delay, self._paused_until - now)
+
+    def acquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = min(max(rate, self.min_rate), self.max_rate)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+
+
+class RateLimiter:
+    # Graph throttles each service separately, directory objects share one
+    # budget and OneDrive/SharePoint another.
+    FAMILIES = {
+        "users": "directory",
+        "groups": "directory",
+        "directoryObjects": "directory",
+        "servicePrincipals": "directory",
+        "applications": "directory",
+        "me": "directory",
+        "drives": "drives",
+        "sites": "drives",
+        "shares": "drives",
+        "deviceManagement": "intune",
+    }
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        burst: float = 1,
+        family_rates: dict[str, float] | None = None,
+        min_rate: float | None = None,
+        decrease_factor: float = 0.5,
+        increase_factor: float = 1.1,
+        increase_after: int = 20,
+    ) -> None:
+        if not 0 < decrease_factor < 1 or increase_factor < 1:
+            raise ValueError(
+                f"Invalid rate factors, '{decrease_factor}' and '{increase_factor}'"
+            )
+        self.rate = rate
+        self.burst = burst
+        self.family_rates = family_rates or {}
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_factor = increase_factor
+        self.increase_after = increase_after
+        self.throttled = 0
+        self._buckets: dict[str, TokenBucket] = {}
+        self._successes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_keys(self, url: str) -> list[str]:
+        parts = urlsplit(url)
+        keys = [parts.netloc]
+        segments = [segment for segment in parts.path.split("/") if segment]
+        if segments and segments[0] in GRAPH_VERSIONS:
+            segments = segments[1:]
+        if segments:
+            name = segments[0].split("(", 1)[0]
+            keys.append(f"{parts.netloc}/{self.FAMILIES.get(name, name)}")
+        return keys
+
+    def get_bucket(self, key: str) -> TokenBucket:
+        try:
+            return self._buckets[key]
+        except KeyError:
+            pass
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                _, _, family = key.rpartition("/")
+                rate = self.family_rates.get(family, self.rate)
+                bucket = TokenBucket(rate, burst=self.burst, min_rate=self.min_rate)
+                self._buckets[key] = bucket
+            return bucket
+
+    def reserve(self, url: str) -> float:
+        return max(self.get_bucket(key).reserve() for key in self.get_keys(url))
+
+    def acquire(self, url: str) -> float:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record(self, url: str, response: requests.Response) -> None:
+        # Only the most specific bucket adapts, a throttled drive request
+        # should not slow down directory requests on the same host.
+        key = self.get_keys(url)[-1]
+        bucket = self.get_bucket(key)
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code == 429 or (
+            response.status_code == 503 and retry_after is not None
+        ):
+            with self._lock:
+                self.throttled += 1
+                self._successes[key] = 0
+            bucket.set_rate(bucket.rate * self.decrease_factor)
+            try:
+                bucket.pause(float(retry_after))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                pass
+            return
+
+        with self._lock:
+            successes = self._successes.get(key, 0) + 1
+            if successes >= self.increase_after:
+                successes = 0
+            self._successes[key] = successes
+        if not successes and bucket.rate < bucket.max_rate:
+            bucket.set_rate(bucket.rate * self.increase_factor)
+
+    def get_rates(self) -> dict[str, float]:
+        with self._lock:
+            return {key: bucket.rate for key, bucket in self._buckets.items()}
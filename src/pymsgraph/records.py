@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable
+
+from .fields import Field, get_fields
+
+if TYPE_CHECKING:
+    from .resources import MultiValuedResource, Resource
+
+
+class Record:
+    __slots__ = ("_data", "_parent", "_field_cache")
+
+    MODEL: ClassVar[type["Resource"]]
+    FIELDS: ClassVar[dict[str, Field]] = {}
+    REQUIRED_KEYS: ClassVar[tuple[str, ...]] = ("id", "@removed")
+
+    def __init__(self, data: dict[str, Any], parent: "MultiValuedResource") -> None:
+        self._data = data
+        self._parent = parent
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    def asdict(self) -> dict[str, Any]:
+        return self._data
+
+    def to_resource(self) -> "Resource":
+        parent = self._parent
+        return parent._get_obj(self.MODEL, parent._client, self._data)
+
+    @classmethod
+    def get_keys(cls, fields: str | Iterable[str] | None) -> list[str] | None:
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            fields = fields.split(",")
+
+        keys = dict.fromkeys(cls.REQUIRED_KEYS)
+        for name in fields:
+            name = name.strip()
+            field = cls.FIELDS.get(name)
+            if field is None:
+                keys[name] = None
+            else:
+                keys[field.key] = None
+        return list(keys)
+
+
+_RECORD_CLASSES: dict[type["Resource"], type[Record]] = {}
+
+
+def get_record_class(klass: type["Resource"]) -> type[Record]:
+    try:
+        return _RECORD_CLASSES[klass]
+    except KeyError:
+        pass
+
+    fields = get_fields(klass)
+    record_class = type(
+        f"{klass.__name__}Record",
+        (Record,),
+        {
+            "__slots__": (),
+            "__module__": klass.__module__,
+            "MODEL": klass,
+            "FIELDS": fields,
+            **fields,
+        },
+    )
+    _RECORD_CLASSES[klass] = record_class
+    return record_class
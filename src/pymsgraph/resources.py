@@ -1,11 +1,15 @@
+import os
 from abc import ABC, abstractmethod
 from ast import Mult
-from json import JSONDecodeError
 from typing import (
+    IO,
     TYPE_CHECKING,
     Any,
+    Callable,
     ClassVar,
+    Generator,
     Generic,
+    Iterable,
     Iterator,
     Self,
     TypeVar,
@@ -18,9 +22,22 @@ if TYPE_CHECKING:
 
 import requests
 
+from .columns import Column, ColumnBuffer, get_buffers, import_pyarrow, to_table
+from .export import JsonlWriter
+from .paging import PagePrefetcher, RawPage
+from .partitions import iter_partitioned
+from .records import Record, get_record_class
+
 R = TypeVar("R", bound="Resource")
 MVR = TypeVar("MVR", bound="MultiValuedResource")
 
+# Actions yielded by MultiValuedResource._page_steps.
+GET_PAGE = "get_page"
+GET_NEXT_PAGE = "get_next_page"
+START_PREFETCH = "start_prefetch"
+PREFETCHED_PAGE = "prefetched_page"
+PAGE = "page"
+
 
 # class RequestMethod:
 #     GET = False
@@ -64,6 +81,11 @@ class Resource(ABC):
         super().__init_subclass__()
         cls.MODELS[cls.__name__] = cls
 
+    def __new__(cls, client: "Client", *args, **kwargs) -> Self:
+        if client is None:
+            return super().__new__(cls)
+        return super().__new__(client._resource_class(cls))
+
     def __init__(
         self,
         client: "Client",
@@ -109,77 +131,32 @@ class Resource(ABC):
         return [f"${k}={v}" for k, v in self._query_params.items()]
 
     def get(self: R) -> R:
-        if not self.RequestMethod.GET:
-            raise ValueError(f"Endpoint does not support GET method, '{self.url}'")
+        self._check_request("GET")
         if self._has_changed:
-
-            response = requests.get(
-                self.url_with_query_params, headers=self._client._headers
-            )
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError:
-                # print(response.json())
-                raise
-            try:
-                self._data = response.json()
-            except JSONDecodeError:
-                self._get_response = response
-            self._has_changed = False
+            headers = self._get_headers()
+            self._send("GET", self._get_url(), self._on_get, headers=headers)
         return self
 
     def patch(self: R, data: dict[str, Any]) -> R:
-        if not self.RequestMethod.PATCH:
-            raise ValueError(f"Endpoint does not support PATCH method, '{self.url}'")
-        response = requests.patch(self.url, headers=self._client._headers, json=data)
-        self._patch_response = response
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
+        self._check_request("PATCH")
+        self._send("PATCH", self.url, self._on_patch, json=data)
         return self
 
     def post(self: R, payload: dict[str, Any] | None = None) -> R:
-        if not self.RequestMethod.POST:
-            raise ValueError(f"Endpoint does not support POST method, '{self.url}'")
+        self._check_request("POST")
         if payload is None:
             payload = {}
-        response = requests.post(self.url, headers=self._client._headers, json=payload)
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
+        self._send("POST", self.url, self._on_post, json=payload)
         return self
 
     def delete(self: R) -> R:
-        if not self.RequestMethod.DELETE:
-            raise ValueError(f"Endpoint does not support DELETE method, '{self.url}'")
-        response = requests.delete(self.url, headers=self._client._headers)
-        self._delete_response = response
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.json())
-            raise
-        self._has_changed = True
+        self._check_request("DELETE")
+        self._send("DELETE", self.url, self._on_delete)
         return self
 
     def put(self: R, data: str | bytes | dict[str, Any]) -> R:
-        if not self.RequestMethod.PUT:
-            raise ValueError(f"Endpoint does not support PUT method, '{self.url}'")
-        response = requests.put(self.url, data=data, headers=self._client._headers)
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError:
-            print(response.text)
-            raise
-
-        self._put_response = response
-        self._has_changed = True
+        self._check_request("PUT")
+        self._send("PUT", self.url, self._on_put, data=data)
         return self
 
     def select(self: R, value: str) -> R:
@@ -194,7 +171,70 @@ class Resource(ABC):
         return self._data
 
     def get_from_raw_relative_url(self, relative_url):
-        return requests.get(f"{self.URL}/{relative_url}", headers=self._client._headers)
+        return self._client._request("GET", f"{self.URL}/{relative_url}")
+
+    def _check_request(self, method: str) -> None:
+        if not getattr(self.RequestMethod, method):
+            raise ValueError(f"Endpoint does not support {method} method, '{self.url}'")
+
+    def _get_url(self) -> str:
+        return self.url_with_query_params
+
+    def _then(self, result: Any, get_value: Callable[[], Any]) -> Any:
+        # Helpers built on the verbs return through here, AsyncResource awaits
+        # result before get_value is called.
+        return get_value()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        callback: Callable[[requests.Response], None],
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        client = self._client
+        batch = client._batch
+        if batch is not None:
+            batch.add(method, url, callback, headers=headers, **kwargs)
+        else:
+            callback(client._request(method, url, headers=headers, **kwargs))
+
+    def _get_headers(self) -> dict[str, str]:
+        return self._client._headers
+
+    def _on_get(self, response: requests.Response) -> None:
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            # print(response.json())
+            raise
+        try:
+            self._data = self._client.json_decoder.decode(response.content)
+        except ValueError:
+            self._get_response = response
+        self._has_changed = False
+
+    def _on_patch(self, response: requests.Response) -> None:
+        self._patch_response = response
+        response.raise_for_status()
+        self._has_changed = True
+
+    def _on_post(self, response: requests.Response) -> None:
+        self._post_response = response
+        response.raise_for_status()
+        self._has_changed = True
+
+    def _on_delete(self, response: requests.Response) -> None:
+        self._delete_response = response
+        response.raise_for_status()
+        self._has_changed = True
+
+    def _on_put(self, response: requests.Response) -> None:
+        response.raise_for_status()
+
+        self._put_response = response
+        self._has_changed = True
 
     def _add_query_params(self, key: str, value: str) -> None:
         if not getattr(self.RequestQueryParam, key, False):
@@ -263,24 +303,12 @@ class MultiValuedResource(SingleValuedResource, Generic[R]):
         return bool(self._mdata.get(self._current_page, {}).get("@odata.nextLink"))
 
     def get_next_items(self: MVR) -> MVR:
-        current_page = self._current_page
-        next_page = current_page + 1
-        try:
-            data = self._mdata[next_page]
-        except KeyError:
-            next_link = self._mdata[current_page].get("@odata.nextLink")
-            if next_link:
-                response = requests.get(next_link, headers=self._client._headers)
-
-                try:
-                    response.raise_for_status()
-                except requests.HTTPError:
-                    raise
-
-                data = response.json()
-                self._mdata[next_page] = data
-            else:
-                raise ValueError("No more items")
+        next_page = self._current_page + 1
+        if next_page not in self._mdata:
+            response = self._client._request(
+                "GET", self._get_next_link(), headers=self._get_headers()
+            )
+            self._on_next_items(next_page, response)
 
         self._current_page = next_page
         return self
@@ -297,28 +325,100 @@ class MultiValuedResource(SingleValuedResource, Generic[R]):
                 for obj in _iter_objects:
                     yield obj
 
-    def iter_all_items(self) -> Iterator[R]:
-        while self.has_next_items():
-            self.get_next_items()
-        else:
-            yield from self.iter_fetched_items()
+    def iter_pages(
+        self, discard_pages: bool = False, prefetch: int = 0
+    ) -> Iterator[dict[str, Any]]:
+        mdata = self._mdata
+        for page in self._iter_page_numbers(discard_pages, prefetch):
+            yield mdata[page]
 
-    def get(self: MVR) -> MVR:
-        if not self.RequestMethod.GET:
-            raise ValueError(f"Endpoint does not support GET method, '{self.url}'")
-        if self._has_changed:
-            headers = self._get_headers()
-            response = requests.get(self.url_with_query_params, headers=headers)
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError:
-                print(response.json())
-                raise
-            self._mdata.clear()
-            self._objects.clear()
-            self._has_changed = False
-            self._mdata[0] = response.json()
-        return self
+    def iter_all_items(
+        self, discard_pages: bool = False, prefetch: int = 0
+    ) -> Iterator[R]:
+        for page in self._iter_page_numbers(discard_pages, prefetch):
+            yield from self._get_page_objects(page, discard_pages)
+
+    def export_jsonl(
+        self,
+        file: str | os.PathLike | IO[bytes],
+        fields: str | Iterable[str] | None = None,
+        compression: str | None = None,
+        prefetch: int = 0,
+    ) -> int:
+        keys = self._get_export_keys(fields)
+        mdata = self._mdata
+        with JsonlWriter(file, keys=keys, compression=compression) as writer:
+            for page in self._iter_page_numbers(discard_pages=True, prefetch=prefetch):
+                writer.write_items(mdata[page]["value"])
+        return writer.count
+
+    def iter_raw_pages(self, prefetch: int = 0) -> Iterator[RawPage]:
+        page = self._fetch_raw_page(self.url_with_query_params)
+        prefetcher: PagePrefetcher | None = None
+        if prefetch and page.next_link:
+            prefetcher = PagePrefetcher(self._fetch_raw_page, page.next_link, prefetch)
+        try:
+            while True:
+                yield page
+                if not page.next_link:
+                    break
+                if prefetcher is not None:
+                    page = prefetcher.get()
+                else:
+                    page = self._fetch_raw_page(page.next_link)
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
+
+    def iter_structs(self) -> Iterator[Any]:
+        client = self._client
+        decoder = client.json_decoder
+        klass = self.MODELS[self.ITEM_CLASS]
+        next_link: str | None = self.url_with_query_params
+        while next_link:
+            response = client._request("GET", next_link, headers=self._get_headers())
+            response.raise_for_status()
+            page = decoder.decode_page(response.content, klass)
+            yield from page.value
+            next_link = page.next_link
+
+    def iter_records(
+        self,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> Iterator[Record]:
+        record_class = get_record_class(self.MODELS[self.ITEM_CLASS])
+        keys = record_class.get_keys(fields)
+        for page in self._iter_page_numbers(discard_pages, prefetch):
+            yield from self._iter_records(page, record_class, keys)
+
+    def to_columns(
+        self,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> dict[str, Column]:
+        buffers = self._fill_columns(fields, discard_pages, prefetch)
+        return {buffer.name: buffer.values for buffer in buffers}
+
+    def to_table(
+        self,
+        fields: str | Iterable[str] | None = None,
+        discard_pages: bool = True,
+        prefetch: int = 0,
+    ) -> Any:
+        import_pyarrow()
+        return to_table(self._fill_columns(fields, discard_pages, prefetch))
+
+    def iter_partitioned(
+        self,
+        partitions: Iterable[str],
+        max_workers: int = 4,
+        key: str = "id",
+        prefetch: int = 0,
+    ) -> Iterator[R]:
+        return iter_partitioned(self, partitions, max_workers, key, prefetch)
 
     def filter(self: MVR, value: str) -> MVR:
         self._add_query_params("FILTER", value.strip())
@@ -368,10 +468,143 @@ class MultiValuedResource(SingleValuedResource, Generic[R]):
         self._add_query_params("SEARCH", " ".join(result))
         return self
 
-    def _iter_objects(self, page: int) -> Iterator[R]:
+    def _on_get(self, response: requests.Response) -> None:
+        response.raise_for_status()
+        self._mdata.clear()
+        self._objects.clear()
+        self._current_page = 0
+        self._has_changed = False
+        self._mdata[0] = self._decode_page(response)
+
+    def _get_next_link(self) -> str:
+        next_link = self._mdata[self._current_page].get("@odata.nextLink")
+        if not next_link:
+            raise ValueError("No more items")
+        return next_link
+
+    def _on_next_items(self, page: int, response: requests.Response) -> None:
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            raise
+
+        self._mdata[page] = self._decode_page(response)
+
+    def _decode_page(self, response: requests.Response) -> dict[str, Any]:
+        return self._client.json_decoder.decode(response.content)
+
+    def _fetch_page(self, next_link: str) -> dict[str, Any]:
+        response = self._client._request("GET", next_link, headers=self._get_headers())
+        response.raise_for_status()
+        return self._decode_page(response)
+
+    def _get_export_keys(self, fields: str | Iterable[str] | None) -> list[str] | None:
+        keys = get_record_class(self.MODELS[self.ITEM_CLASS]).get_keys(fields)
+        if keys is not None and self.RequestQueryParam.SELECT:
+            if "select" not in self._query_params:
+                self.select(",".join(key for key in keys if not key.startswith("@")))
+        return keys
+
+    def _partition(self: MVR, value: str) -> MVR:
+        # Each partition walks its own page chain, so it gets a copy of the
+        # query params and empty page state.
+        partition = object.__new__(type(self))
+        partition.__dict__.update(self.__dict__)
+        partition._data = {}
+        partition._mdata = {0: partition._data}
+        partition._objects = {}
+        partition._current_page = 0
+        partition._has_changed = True
+        partition._query_params = query_params = dict(self._query_params)
+        if "filter" in query_params:
+            query_params["filter"] = f"({query_params['filter']})"
+            return partition.filter__and(f"({value})")
+        return partition.filter(value)
+
+    def _fetch_raw_page(self, url: str) -> RawPage:
+        response = self._client._request("GET", url, headers=self._get_headers())
+        response.raise_for_status()
+        return RawPage.from_content(response.content)
+
+    def _iter_page_numbers(
+        self, discard_pages: bool = False, prefetch: int = 0
+    ) -> Iterator[int]:
+        steps = self._page_steps(discard_pages, prefetch)
+        prefetcher: PagePrefetcher | None = None
+        result: Any = None
+        try:
+            while True:
+                try:
+                    action, value = steps.send(result)
+                except StopIteration:
+                    return
+                result = None
+                if action == PAGE:
+                    yield value
+                elif action == GET_PAGE:
+                    self.get()
+                elif action == GET_NEXT_PAGE:
+                    self.get_next_items()
+                elif action == START_PREFETCH:
+                    prefetcher = PagePrefetcher(self._fetch_page, value, prefetch)
+                else:
+                    result = cast(PagePrefetcher, prefetcher).get()
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
+
+    def _page_steps(
+        self, discard_pages: bool, prefetch: int
+    ) -> Generator[tuple[str, Any], Any, None]:
+        # Paging decisions shared with AsyncMultiValuedResource, which only
+        # differs in how it performs the requests.
+        yield GET_PAGE, None
+        mdata = self._mdata
+        is_prefetching = False
+        page = 0
+        while True:
+            next_link = mdata[page].get("@odata.nextLink")
+            if prefetch and not is_prefetching and next_link:
+                if page + 1 not in mdata:
+                    is_prefetching = True
+                    yield START_PREFETCH, next_link
+
+            yield PAGE, page
+            self._current_page = page
+            has_next_items = self.has_next_items()
+            if has_next_items:
+                if is_prefetching and page + 1 not in mdata:
+                    mdata[page + 1] = yield PREFETCHED_PAGE, None
+                yield GET_NEXT_PAGE, None
+            if discard_pages:
+                self._discard_page(page)
+            if not has_next_items:
+                return
+            page += 1
+
+    def _get_page_objects(self, page: int, discard_pages: bool) -> Iterable[R]:
+        if discard_pages:
+            return self._iter_objects(page, cache=False)
+        objects = self._objects.get(page)
+        if objects is None:
+            return self._iter_objects(page)
+        return objects
+
+    def _discard_page(self, page: int) -> None:
+        self._mdata.pop(page, None)
+        self._objects.pop(page, None)
+        if page == 0:
+            self._has_changed = True
+
+    def _iter_objects(self, page: int, cache: bool = True) -> Iterator[R]:
         klass: type[R] = self.MODELS[self.ITEM_CLASS]
         client = self._client
 
+        if not cache:
+            for item in self._mdata[page]["value"]:
+                yield self._get_obj(klass, client, item)
+            return
+
         page_objects = []
         page_objects_apppend = page_objects.append
 
@@ -383,16 +616,84 @@ class MultiValuedResource(SingleValuedResource, Generic[R]):
 
         self._objects[page] = tuple(page_objects)
 
+    def _fill_columns(
+        self,
+        fields: str | Iterable[str] | None,
+        discard_pages: bool,
+        prefetch: int,
+    ) -> list[ColumnBuffer]:
+        buffers = get_buffers(self.MODELS[self.ITEM_CLASS], fields)
+        mdata = self._mdata
+        for page in self._iter_page_numbers(discard_pages, prefetch):
+            items = mdata[page]["value"]
+            for buffer in buffers:
+                buffer.extend(items)
+        return buffers
+
+    def _iter_records(
+        self, page: int, record_class: type[Record], keys: list[str] | None
+    ) -> Iterator[Record]:
+        for item in self._mdata[page]["value"]:
+            if keys is not None:
+                item = {key: item[key] for key in keys if key in item}
+            yield record_class(item, self)
+
     def _get_obj(self, klass: type[R], client: "Client", data: dict[str, Any]) -> R:
         return klass(client, data=data, parent=self)
 
     def _get_headers(self):
         headers = self._client._headers
         if "count" in self._query_params:
-            headers["ConsistencyLevel"] = "eventual"
+            headers = {**headers, "ConsistencyLevel": "eventual"}
         return headers
 
 
+# https://learn.microsoft.com/en-us/graph/delta-query-overview
+class Delta:
+    _client: "Client"
+    _parent: "Resource | None"
+    _delta_link: str | None
+    _resume_link: str | None
+
+    @property
+    def relative_url(self) -> str:
+        return "/delta"
+
+    @property
+    def url_with_query_params(self) -> str:
+        if self._resume_link:
+            return self._resume_link
+        return super().url_with_query_params  # type: ignore[misc]
+
+    @property
+    def delta_link(self) -> str | None:
+        return self._delta_link
+
+    def iter_changes(self, discard_pages: bool = True, prefetch: int = 0) -> Iterator:
+        return self.iter_all_items(  # type: ignore[attr-defined]
+            discard_pages=discard_pages, prefetch=prefetch
+        )
+
+    @staticmethod
+    def is_removed(obj: "Resource") -> bool:
+        data = obj._data
+        return "@removed" in data or "deleted" in data
+
+    def _decode_page(self, response: requests.Response) -> dict[str, Any]:
+        data = super()._decode_page(response)  # type: ignore[misc]
+        delta_link = data.get("@odata.deltaLink")
+        if delta_link:
+            self._delta_link = delta_link
+        return data
+
+    def _get_obj(self, klass: type[R], client: "Client", data: dict[str, Any]) -> R:
+        return klass(client, data=data, parent=self._parent)
+
+    def _set_kwargs(self, kwargs: dict[str, Any]) -> None:
+        self._resume_link = kwargs.get("delta_link")
+        self._delta_link = None
+
+
 class ResourceProperty(Generic[R]):
     def __init__(self, klass: type[R]) -> None:
         self.resource_class = klass
@@ -0,0 +1,127 @@
+import email.utils
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+
+# https://learn.microsoft.com/en-us/graph/throttling
+
+
+class RetryStats:
+    def __init__(self) -> None:
+        self.retries = 0
+        self.sleep_seconds = 0.0
+        self.statuses: Counter[int] = Counter()
+        self.exceptions: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        delay: float,
+        response: requests.Response | None = None,
+        exception: Exception | None = None,
+    ) -> None:
+        with self._lock:
+            self.retries += 1
+            self.sleep_seconds += delay
+            if response is not None:
+                self.statuses[response.status_code] += 1
+            if exception is not None:
+                self.exceptions[type(exception).__name__] += 1
+
+    def asdict(self) -> dict:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "sleep_seconds": self.sleep_seconds,
+                "statuses": dict(self.statuses),
+                "exceptions": dict(self.exceptions),
+            }
+
+
+class RetryPolicy:
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRY_EXCEPTIONS: tuple[type[Exception], ...] = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    )
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        jitter: bool = True,
+        respect_retry_after: bool = True,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.stats = RetryStats()
+
+    def get_delay(
+        self,
+        method: str,
+        attempt: int,
+        response: requests.Response | None = None,
+        exception: Exception | None = None,
+    ) -> float | None:
+        if attempt >= self.max_retries:
+            return None
+
+        is_idempotent = method.upper() in self.IDEMPOTENT_METHODS
+
+        if exception is not None:
+            if is_idempotent and isinstance(exception, self.RETRY_EXCEPTIONS):
+                return self.get_backoff(attempt)
+            return None
+
+        if response is None or response.status_code not in self.RETRY_STATUSES:
+            return None
+
+        retry_after = self.get_retry_after(response)
+        # Throttled requests are rejected before they are processed so they are
+        # safe to send again regardless of the method.
+        is_throttled = response.status_code == 429 or (
+            response.status_code == 503 and retry_after is not None
+        )
+        if not is_idempotent and not is_throttled:
+            return None
+        if retry_after is not None:
+            return retry_after
+        return self.get_backoff(attempt)
+
+    def get_backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def get_retry_after(self, response: requests.Response) -> float | None:
+        if not self.respect_retry_after:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(date.timestamp() - time.time(), 0.0)
+
+    def record(
+        self,
+        delay: float,
+        response: requests.Response | None = None,
+        exception: Exception | None = None,
+    ) -> None:
+        self.stats.record(delay, response=response, exception=exception)
@@ -1,8 +1,10 @@
 from typing import Any
 
+import requests
+
 from .drives import Drive, DriveById, RootDriveItem
 from .fields import CharField, DateTimeField
-from .resources import MultiValuedResource, Resource, SingleValuedResource
+from .resources import Delta, MultiValuedResource, Resource, SingleValuedResource
 
 
 class AllSites(MultiValuedResource["SiteById"]):
@@ -39,14 +41,13 @@ class Sites(MultiValuedResource["Site"]):
     def by_id(self, id: str) -> "SiteById":
         return SiteById(self._client, parent=self, site_id=id)
 
-    def get(self) -> MultiValuedResource["Site"]:
-        if self._query_params.get("search") is None:
+    def _check_request(self, method: str) -> None:
+        super()._check_request(method)
+        if method == "GET" and self._query_params.get("search") is None:
             raise ValueError(
                 f"GET method is unsupported without search in query params"
             )
 
-        return super().get()
-
 
 class BaseLists(MultiValuedResource["BaseList"]):
     ITEM_CLASS = "ListById"
@@ -260,6 +261,20 @@ class ListItems(MultiValuedResource["ListItem"]):
     def by_id(self, item_id: str) -> "ListItem":
         return ListItem(self._client, parent=self, item_id=item_id)
 
+    def delta(self, delta_link: str | None = None) -> "ListItemsDelta":
+        return ListItemsDelta(self._client, parent=self, delta_link=delta_link)
+
+
+# https://learn.microsoft.com/en-us/graph/api/listitem-delta?view=graph-rest-1.0&tabs=http
+class ListItemsDelta(Delta, MultiValuedResource["ListItem"]):
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        FILTER = False
+        ORDERBY = False
+        EXPAND = True
+
+    ITEM_CLASS = "ListItem"
+
 
 class ListItem(SingleValuedResource):
 
@@ -302,12 +317,19 @@ class ListItemFields(Resource):
     def relative_url(self):
         return f"/fields"
 
-    def get(self):
+    def asdict(self) -> dict[str, Any]:
+        return self._then(self.get(), lambda: self._data["fields"])
+
+    def _get_url(self) -> str:
+        # Fields are read from a refresh of the parent item.
         parent = self._parent
-        if parent is not None:
-            parent.get()
-        return self
+        if parent is None:
+            return super()._get_url()
+        return parent._get_url()
 
-    def asdict(self) -> dict[str, Any]:
-        self.get()
-        return self._data["fields"]
+    def _on_get(self, response: requests.Response) -> None:
+        parent = self._parent
+        if parent is None:
+            return super()._on_get(response)
+        parent._on_get(response)
+        self._data = parent._data
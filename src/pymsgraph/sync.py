@@ -0,0 +1,213 @@
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator
+
+from .downloads import compare_hash, download_file
+from .drives import Drive, DriveItem
+from .uploads import upload_file
+
+if TYPE_CHECKING:
+    from .drives import BaseDriveItem, RootDriveItem
+
+
+MANIFEST_NAME = ".pymsgraph-manifest.json"
+
+
+@dataclass
+class SyncResult:
+    transferred: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+
+class Manifest:
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.items: dict[str, dict[str, Any]] = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.items = data.get("items", {})
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        return self.items.get(path)
+
+    def set(self, path: str, local_path: str, item: DriveItem | dict[str, Any]) -> None:
+        if isinstance(item, dict):
+            item_id, tag = item.get("id"), item.get("cTag") or item.get("eTag")
+        else:
+            item_id, tag = item.id, item.c_tag or item.e_tag
+        stat = os.stat(local_path)
+        self.items[path] = {
+            "id": item_id,
+            "tag": tag,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+
+    def is_unchanged(self, path: str, local_path: str, item: DriveItem) -> bool:
+        entry = self.items.get(path)
+        if entry is None:
+            return False
+        stat = os.stat(local_path)
+        return (
+            entry["tag"] == (item.c_tag or item.e_tag)
+            and entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+        )
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "items": self.items}, f)
+        os.replace(tmp_path, self.path)
+
+
+def sync_folder(
+    local_path: str,
+    drive_item: "Drive | RootDriveItem | DriveItem",
+    direction: str = "download",
+    max_workers: int = 4,
+    walk_workers: int = 8,
+    compare_hashes: bool = False,
+    manifest_path: str | None = None,
+) -> SyncResult:
+    if direction not in ("download", "upload"):
+        raise ValueError(f"Argument must be 'download' or 'upload', '{direction}'")
+    drive_item._client._require_sync("sync_folder")
+    if isinstance(drive_item, Drive):
+        drive_item = drive_item.root
+
+    os.makedirs(local_path, exist_ok=True)
+    if manifest_path is None:
+        manifest_path = os.path.join(local_path, MANIFEST_NAME)
+    manifest = Manifest(manifest_path)
+
+    sync = _download if direction == "download" else _upload
+    try:
+        return sync(
+            local_path, drive_item, manifest, max_workers, walk_workers, compare_hashes
+        )
+    finally:
+        manifest.save()
+
+
+def _download(
+    local_path: str,
+    drive_item: "BaseDriveItem",
+    manifest: Manifest,
+    max_workers: int,
+    walk_workers: int,
+    compare_hashes: bool,
+) -> SyncResult:
+    result = SyncResult()
+
+    def download(path: str, item: DriveItem, target: str) -> None:
+        download_file(item, target)
+        modified = item.last_modified_date_time
+        if modified is not None:
+            mtime = modified.timestamp()
+            os.utime(target, (mtime, mtime))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: dict[Future, tuple[str, DriveItem, str]] = {}
+        for path, item in drive_item.walk(max_workers=walk_workers):
+            target = os.path.join(local_path, *path.split("/"))
+            if item.folder is not None:
+                os.makedirs(target, exist_ok=True)
+                continue
+            if os.path.exists(target) and (
+                manifest.is_unchanged(path, target, item)
+                or _is_same_file(target, item, compare_hashes)
+            ):
+                manifest.set(path, target, item)
+                result.skipped.append(path)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            future = executor.submit(download, path, item, target)
+            futures[future] = (path, item, target)
+
+        for future, (path, item, target) in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                result.failed[path] = e
+            else:
+                manifest.set(path, target, item)
+                result.transferred.append(path)
+    return result
+
+
+def _upload(
+    local_path: str,
+    drive_item: "RootDriveItem | DriveItem",
+    manifest: Manifest,
+    max_workers: int,
+    walk_workers: int,
+    compare_hashes: bool,
+) -> SyncResult:
+    result = SyncResult()
+    remote = {
+        path: item
+        for path, item in drive_item.walk(max_workers=walk_workers)
+        if item.folder is None
+    }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: dict[Future, tuple[str, str]] = {}
+        for path, source in _iter_local_files(local_path, manifest.path):
+            item = remote.get(path)
+            if item is not None and (
+                manifest.is_unchanged(path, source, item)
+                or _is_same_file(source, item, compare_hashes)
+            ):
+                manifest.set(path, source, item)
+                result.skipped.append(path)
+                continue
+            future = executor.submit(
+                upload_file, drive_item.by_relative_path(path), source
+            )
+            futures[future] = (path, source)
+
+        for future, (path, source) in futures.items():
+            try:
+                data = future.result()
+            except Exception as e:
+                result.failed[path] = e
+            else:
+                manifest.set(path, source, data)
+                result.transferred.append(path)
+    return result
+
+
+def _is_same_file(local_path: str, item: DriveItem, compare_hashes: bool) -> bool:
+    if os.path.getsize(local_path) != item.size:
+        return False
+    if compare_hashes:
+        matches = compare_hash(item, local_path)
+        if matches is not None:
+            return matches[0]
+    modified = item.last_modified_date_time
+    if modified is None:
+        return False
+    return abs(os.path.getmtime(local_path) - modified.timestamp()) < 2
+
+
+def _iter_local_files(local_path: str, manifest_path: str) -> Iterator[tuple[str, str]]:
+    manifest_path = os.path.abspath(manifest_path)
+    for root, _, files in os.walk(local_path):
+        for name in files:
+            source = os.path.join(root, name)
+            if name.endswith((".part", ".part.json", ".tmp")):
+                continue
+            if os.path.abspath(source) == manifest_path:
+                continue
+            path = os.path.relpath(source, local_path).replace(os.sep, "/")
+            yield path, source
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport(ABC):
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SessionTransport(Transport):
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float | tuple[float, float] | None = (10, 60),
+        session: requests.Session | None = None,
+    ) -> None:
+        if session is None:
+            session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        self.timeout = timeout
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        self._session.close()
@@ -0,0 +1,188 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Iterable
+
+import requests
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .drives import DriveItem, RootDriveItem
+
+
+# https://learn.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0
+
+FRAGMENT_SIZE_MULTIPLE = 320 * 1024
+DEFAULT_FRAGMENT_SIZE = 32 * FRAGMENT_SIZE_MULTIPLE
+MAX_FRAGMENT_SIZE = 60 * 1024 * 1024
+SIMPLE_UPLOAD_MAX_SIZE = 4 * 1024 * 1024
+
+
+class UploadSession:
+    def __init__(
+        self,
+        client: "Client",
+        upload_url: str,
+        expiration_date_time: str | None = None,
+        max_failures: int = 5,
+    ) -> None:
+        self._client = client
+        self.upload_url = upload_url
+        self.expiration_date_time = expiration_date_time
+        self.max_failures = max_failures
+
+    @classmethod
+    def create(
+        cls,
+        item: "DriveItem",
+        conflict_behavior: str = "replace",
+        **kwargs: Any,
+    ) -> "UploadSession":
+        payload = {"item": {"@microsoft.graph.conflictBehavior": conflict_behavior}}
+        data = item.create_upload_session.post(payload)._post_response.json()
+        return cls(
+            item._client,
+            data["uploadUrl"],
+            expiration_date_time=data.get("expirationDateTime"),
+            **kwargs,
+        )
+
+    def get_next_expected_ranges(self) -> list[tuple[int, int | None]]:
+        response = self._client._request("GET", self.upload_url, headers={})
+        response.raise_for_status()
+        ranges = []
+        for value in response.json().get("nextExpectedRanges", []):
+            start, _, end = value.partition("-")
+            ranges.append((int(start), int(end) if end else None))
+        return ranges
+
+    def upload(
+        self,
+        f: IO[bytes],
+        size: int | None = None,
+        fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+        resume: bool = False,
+    ) -> dict[str, Any]:
+        if fragment_size % FRAGMENT_SIZE_MULTIPLE or fragment_size > MAX_FRAGMENT_SIZE:
+            raise ValueError(
+                f"fragment_size must be a multiple of {FRAGMENT_SIZE_MULTIPLE} bytes "
+                f"and at most {MAX_FRAGMENT_SIZE} bytes, '{fragment_size}'"
+            )
+        if size is None:
+            size = _get_size(f)
+
+        offset = 0
+        if resume:
+            offset = self._get_next_offset(offset)
+
+        failures = 0
+        while True:
+            f.seek(offset)
+            chunk = f.read(min(fragment_size, size - offset))
+            end = offset + len(chunk) - 1
+            headers = {
+                "Content-Length": str(len(chunk)),
+                "Content-Range": f"bytes {offset}-{end}/{size}",
+            }
+            try:
+                response = self._client._request(
+                    "PUT", self.upload_url, headers=headers, data=chunk
+                )
+                response.raise_for_status()
+            except (
+                requests.exceptions.HTTPError,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                response = getattr(e, "response", None)
+                failures += 1
+                if failures > self.max_failures or (
+                    response is not None and response.status_code == 404
+                ):
+                    raise
+                offset = self._get_next_offset(offset)
+                continue
+
+            if response.status_code in (200, 201):
+                return response.json()
+
+            failures = 0
+            offset = self._get_offset_from_ranges(
+                response.json().get("nextExpectedRanges"), end + 1
+            )
+
+    def cancel(self) -> None:
+        response = self._client._request("DELETE", self.upload_url, headers={})
+        response.raise_for_status()
+
+    def _get_next_offset(self, default: int) -> int:
+        ranges = self.get_next_expected_ranges()
+        if not ranges:
+            return default
+        return ranges[0][0]
+
+    def _get_offset_from_ranges(self, ranges: list[str] | None, default: int) -> int:
+        if not ranges:
+            return default
+        return int(ranges[0].partition("-")[0])
+
+
+def upload_file(
+    item: "DriveItem",
+    file: str | IO[bytes],
+    fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+    conflict_behavior: str = "replace",
+) -> dict[str, Any]:
+    item._client._require_sync("upload_file")
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            return upload_file(
+                item,
+                f,
+                fragment_size=fragment_size,
+                conflict_behavior=conflict_behavior,
+            )
+
+    size = _get_size(file)
+    if size <= SIMPLE_UPLOAD_MAX_SIZE:
+        file.seek(0)
+        # https://learn.microsoft.com/en-us/graph/api/driveitem-put-content?view=graph-rest-1.0
+        url = item.content.url
+        if conflict_behavior != "replace":
+            url = f"{url}?@microsoft.graph.conflictBehavior={conflict_behavior}"
+        response = item._client._request("PUT", url, data=file.read())
+        response.raise_for_status()
+        return response.json()
+
+    session = UploadSession.create(item, conflict_behavior=conflict_behavior)
+    return session.upload(file, size=size, fragment_size=fragment_size)
+
+
+def upload_files(
+    folder: "RootDriveItem | DriveItem",
+    paths: Iterable[str],
+    max_workers: int = 4,
+    fragment_size: int = DEFAULT_FRAGMENT_SIZE,
+    conflict_behavior: str = "replace",
+) -> list[dict[str, Any]]:
+    folder._client._require_sync("upload_files")
+
+    def upload(path: str) -> dict[str, Any]:
+        _, filename = os.path.split(path)
+        return upload_file(
+            folder.by_relative_path(filename),
+            path,
+            fragment_size=fragment_size,
+            conflict_behavior=conflict_behavior,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(upload, paths))
+
+
+def _get_size(f: IO[bytes]) -> int:
+    position = f.tell()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(position)
+    return size
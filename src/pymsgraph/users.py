@@ -1,7 +1,7 @@
 from typing import Any, TYPE_CHECKING
 
 from .fields import BooleanField, CharField, DateTimeField
-from .resources import MultiValuedResource, Resource, SingleValuedResource
+from .resources import Delta, MultiValuedResource, Resource, SingleValuedResource
 from .drives import Drive, RootDriveItem
 
 if TYPE_CHECKING:
@@ -25,6 +25,9 @@ class Users(MultiValuedResource["User"]):
     def by_id(self, user_id: str) -> "User":
         return User(self._client, parent=self, user_id=user_id)
 
+    def delta(self, delta_link: str | None = None) -> "UsersDelta":
+        return UsersDelta(self._client, parent=self, delta_link=delta_link)
+
     @classmethod
     def create(
         cls,
@@ -38,6 +41,15 @@ class Users(MultiValuedResource["User"]):
         return
 
 
+# https://learn.microsoft.com/en-us/graph/api/user-delta?view=graph-rest-1.0&tabs=http
+class UsersDelta(Delta, MultiValuedResource["User"]):
+
+    class RequestQueryParam(MultiValuedResource.RequestQueryParam):
+        ORDERBY = False
+
+    ITEM_CLASS = "User"
+
+
 class DefaultDrive(Drive):
     @property
     def relative_url(self) -> str:
@@ -89,12 +101,10 @@ class User(SingleValuedResource):
                 "password": password,
             }
         }
-        self.patch(data)
-        return self
+        return self.patch(data)
 
     def sign_out_to_all_sessions(self) -> "User":
-        self.revoke_sign_in_sessions.post()
-        return self
+        return self._then(self.revoke_sign_in_sessions.post(), lambda: self)
 
     def block_sign_in(self):
         pass
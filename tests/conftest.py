@@ -1,11 +1,66 @@
+import json
+from typing import Any, Callable
+
 import pytest
+import requests
 
 import pymsgraph
+from pymsgraph.transport import Transport
+
+
+def make_response(
+    status_code: int = 200,
+    json_data: Any = None,
+    content: bytes = b"",
+    headers: dict[str, str] | None = None,
+    url: str = "",
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    if headers:
+        response.headers.update(headers)
+    if json_data is not None:
+        content = json.dumps(json_data).encode()
+        response.headers.setdefault("Content-Type", "application/json")
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class FakeTransport(Transport):
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, dict[str, Any]]] = []
+        self.responses: list[requests.Response] = []
+        self.handler: Callable[..., requests.Response] | None = None
+        self.closed = False
+
+    def add(self, *args, **kwargs) -> None:
+        self.responses.append(make_response(*args, **kwargs))
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        self.requests.append((method, url, kwargs))
+        if self.handler is not None:
+            response = self.handler(method, url, **kwargs)
+        elif self.responses:
+            response = self.responses.pop(0)
+        else:
+            response = make_response(json_data={})
+        response.url = response.url or url
+        return response
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
 
 
 @pytest.fixture
-def client():
-    return pymsgraph.Client("test", "test", "str", _test=True)
+def client(transport):
+    return pymsgraph.Client("test", "test", "str", transport=transport, _test=True)
 
 
 @pytest.fixture
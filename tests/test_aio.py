@@ -0,0 +1,423 @@
+import asyncio
+import contextlib
+from typing import Any
+
+import pytest
+import requests
+
+from pymsgraph.aio import AsyncClient, AsyncTransport
+from pymsgraph.batch import BatchError
+from pymsgraph.cache import ResponseCache
+from pymsgraph.membership import MembershipGraph
+from pymsgraph.ratelimit import RateLimiter
+from pymsgraph.retry import RetryPolicy
+from pymsgraph.sync import sync_folder
+from pymsgraph.users import User, Users
+
+from .conftest import make_response
+
+
+def batch_response(payload: dict[str, Any], statuses: dict[str, int]):
+    responses = []
+    for request in payload["requests"]:
+        status = statuses.get(request["url"], 200)
+        body: Any = {"id": request["url"].rsplit("/", 1)[-1]}
+        if status >= 400:
+            body = {"error": {"code": "NotFound"}}
+        responses.append({"id": request["id"], "status": status, "body": body})
+    return make_response(json_data={"responses": responses[::-1]})
+
+
+class FakeAsyncTransport(AsyncTransport):
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, dict[str, Any]]] = []
+        self.responses: list[requests.Response] = []
+        self.active = 0
+        self.max_active = 0
+
+    def add(self, *args, **kwargs) -> None:
+        self.responses.append(make_response(*args, **kwargs))
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        self.requests.append((method, url, kwargs))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        if self.responses:
+            return self.responses.pop(0)
+        return make_response(json_data={"id": url.rsplit("/", 1)[-1]})
+
+
+@pytest.fixture
+def transport() -> FakeAsyncTransport:
+    return FakeAsyncTransport()
+
+
+@pytest.fixture
+def client(transport: FakeAsyncTransport) -> AsyncClient:
+    return AsyncClient("test", "test", "str", transport=transport, _test=True)
+
+
+def test_async_resources_mirror_sync_tree(client: AsyncClient, url: str):
+    users = client.users
+    user = users.by_id("12345")
+
+    assert isinstance(users, Users)
+    assert isinstance(user, User)
+    assert user.url == f"{url}/users/12345"
+    assert user.member_of.url == f"{url}/users/12345/memberOf"
+    assert type(user.member_of) is type(users.by_id("1").member_of)
+
+
+def test_async_get_and_patch(client: AsyncClient, transport: FakeAsyncTransport):
+    async def main():
+        user = await client.users.by_id("12345").get()
+        await user.patch({"displayName": "Test"})
+        return user
+
+    user = asyncio.run(main())
+    assert user.id == "12345"
+    assert [(m, u.rsplit("/", 1)[-1]) for m, u, _ in transport.requests] == [
+        ("GET", "12345"),
+        ("PATCH", "12345"),
+    ]
+
+
+def test_async_pagination(client: AsyncClient, transport: FakeAsyncTransport):
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "next"})
+    transport.add(json_data={"value": [{"id": "2"}, {"id": "3"}]})
+
+    async def main():
+        return [user.id async for user in client.users.select("id")]
+
+    assert asyncio.run(main()) == ["1", "2", "3"]
+    assert transport.requests[1][1] == "next"
+
+
+def test_async_concurrency_limit(transport: FakeAsyncTransport):
+    client = AsyncClient(
+        "test", "test", "str", transport=transport, max_concurrency=3, _test=True
+    )
+
+    async def main():
+        await asyncio.gather(*(client.users.by_id(str(i)).get() for i in range(10)))
+
+    asyncio.run(main())
+    assert len(transport.requests) == 10
+    assert transport.max_active <= 3
+
+
+def test_async_pagination_prefetch(client: AsyncClient, transport: FakeAsyncTransport):
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "p2"})
+    transport.add(json_data={"value": [{"id": "2"}], "@odata.nextLink": "p3"})
+    transport.add(json_data={"value": [{"id": "3"}]})
+
+    async def main():
+        users = client.users
+        ids = [u.id async for u in users.iter_all_items(discard_pages=True, prefetch=2)]
+        return ids, users._mdata
+
+    ids, mdata = asyncio.run(main())
+    assert ids == ["1", "2", "3"]
+    assert mdata == {}
+    assert [u for _, u, _ in transport.requests[1:]] == ["p2", "p3"]
+
+
+def test_async_iter_records(client: AsyncClient, transport: FakeAsyncTransport):
+    transport.add(
+        json_data={"value": [{"id": "1", "mail": "a@x"}], "@odata.nextLink": "p2"}
+    )
+    transport.add(json_data={"value": [{"id": "2", "mail": "b@x"}]})
+
+    async def main():
+        return [record async for record in client.users.iter_records(fields=["mail"])]
+
+    records = asyncio.run(main())
+    assert [(record.id, record.mail) for record in records] == [
+        ("1", "a@x"),
+        ("2", "b@x"),
+    ]
+
+
+def test_async_iter_raw_pages(client: AsyncClient, transport: FakeAsyncTransport):
+    transport.add(content=b'{"@odata.nextLink":"p2","value":[{"id":"1"}]}')
+    transport.add(content=b'{"value":[{"id":"2"}]}')
+
+    async def main():
+        return [page async for page in client.users.iter_raw_pages(prefetch=1)]
+
+    pages = asyncio.run(main())
+    assert [page.next_link for page in pages] == ["p2", None]
+    assert pages[1].content == b'{"value":[{"id":"2"}]}'
+
+
+def test_async_iter_partitioned(client: AsyncClient, transport: FakeAsyncTransport):
+    transport.add(json_data={"value": [{"id": "1"}, {"id": "2"}]})
+    transport.add(json_data={"value": [{"id": "2"}, {"id": "3"}]})
+
+    async def main():
+        items = client.users.iter_partitioned(
+            ["startswith(displayName,'a')", "startswith(displayName,'b')"]
+        )
+        return [user.id async for user in items]
+
+    ids = asyncio.run(main())
+    assert sorted(ids) == ["1", "2", "3"]
+    assert sorted(u.split("$filter=")[1] for _, u, _ in transport.requests) == [
+        "startswith(displayName,'a')",
+        "startswith(displayName,'b')",
+    ]
+
+
+def test_async_rate_limiter(transport: FakeAsyncTransport):
+    limiter = RateLimiter(rate=1000)
+    client = AsyncClient(
+        "test", "test", "str", transport=transport, rate_limiter=limiter, _test=True
+    )
+    transport.add(429, json_data={}, headers={"Retry-After": "0"})
+    transport.add(json_data={"id": "1"})
+
+    user = asyncio.run(client.users.by_id("1").get())
+    assert user.id == "1"
+    assert limiter.throttled == 1
+    assert limiter.get_rates()["graph.microsoft.com/directory"] == 500
+
+
+def test_async_shares_cache_and_retry_logic(transport: FakeAsyncTransport):
+    class FlakyTransport(FakeAsyncTransport):
+        async def request(self, method: str, url: str, **kwargs: Any):
+            if not self.requests:
+                self.requests.append((method, url, kwargs))
+                raise requests.exceptions.ConnectionError("reset")
+            return await super().request(method, url, **kwargs)
+
+    transport = FlakyTransport()
+    client = AsyncClient(
+        "test",
+        "test",
+        "str",
+        transport=transport,
+        cache=ResponseCache(ttl=60),
+        retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+        _test=True,
+    )
+    transport.add(json_data={"id": "1", "displayName": "A"})
+
+    async def main():
+        first = await client.users.by_id("1").get()
+        second = await client.users.by_id("1").get()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first.asdict() == second.asdict() == {"id": "1", "displayName": "A"}
+    assert len(transport.requests) == 2
+    assert client.retry_policy.stats.exceptions == {"ConnectionError": 1}
+    assert client.cache.stats.hits == 1
+
+
+class BatchTransport(FakeAsyncTransport):
+    def __init__(self, statuses: dict[str, int] | None = None) -> None:
+        super().__init__()
+        self.statuses = statuses or {}
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if not url.endswith("/$batch"):
+            return await super().request(method, url, **kwargs)
+        self.requests.append((method, url, kwargs))
+        await asyncio.sleep(0)
+        return batch_response(kwargs["json"], self.statuses)
+
+
+def test_async_batch(url: str):
+    transport = BatchTransport()
+    client = AsyncClient("test", "test", "str", transport=transport, _test=True)
+
+    async def main():
+        async with client.batch():
+            users = await asyncio.gather(
+                *(client.users.by_id(str(i)).get() for i in range(25))
+            )
+        return users
+
+    users = asyncio.run(main())
+    assert [user.id for user in users] == [str(i) for i in range(25)]
+    assert [(m, u) for m, u, _ in transport.requests] == [("POST", f"{url}/$batch")] * 2
+    assert [len(kw["json"]["requests"]) for _, _, kw in transport.requests] == [20, 5]
+
+
+def test_async_batch_errors():
+    transport = BatchTransport(statuses={"/users/2": 404})
+    client = AsyncClient("test", "test", "str", transport=transport, _test=True)
+
+    async def main():
+        async with client.batch():
+            await client.users.by_id("1").get()
+            await client.users.by_id("2").get()
+
+    with pytest.raises(BatchError) as exc_info:
+        asyncio.run(main())
+    assert len(exc_info.value.errors) == 1
+    assert exc_info.value.errors[0][0].url == "/users/2"
+    assert len(transport.requests) == 1
+
+    with pytest.raises(TypeError):
+        with client.batch():
+            pass
+
+
+def test_async_batch_is_per_task():
+    transport = BatchTransport()
+    client = AsyncClient("test", "test", "str", transport=transport, _test=True)
+
+    async def batched(started: asyncio.Event):
+        async with client.batch():
+            await client.users.by_id("1").get()
+            started.set()
+            await asyncio.sleep(0.01)
+
+    async def unbatched(started: asyncio.Event):
+        await started.wait()
+        return await client.users.by_id("2").get()
+
+    async def main():
+        started = asyncio.Event()
+        _, user = await asyncio.gather(batched(started), unbatched(started))
+        return user
+
+    user = asyncio.run(main())
+    assert user.id == "2"
+    assert [u.rsplit("/", 1)[-1] for _, u, _ in transport.requests] == [
+        "2",
+        "$batch",
+    ]
+
+
+def test_async_rejects_sync_only_helpers(
+    client: AsyncClient, transport: FakeAsyncTransport, tmp_path
+):
+    members = client.groups.by_id("g1").members
+    drive = client.drives.by_id("d1")
+    item = drive.items.by_id("i1")
+    calls = [
+        lambda: members.add(["a"]),
+        lambda: members.remove(["a"]),
+        lambda: members.set(["a"]),
+        lambda: members.get_member_ids(),
+        lambda: MembershipGraph(client),
+        lambda: drive.walk(),
+        lambda: drive.root.walk(),
+        lambda: item.download(str(tmp_path)),
+        lambda: drive.root.upload(str(tmp_path / "a.txt")),
+        lambda: drive.root.upload_files([str(tmp_path / "a.txt")]),
+        lambda: item.by_relative_path("a").upload(str(tmp_path / "a.txt")),
+        lambda: sync_folder(str(tmp_path), drive),
+    ]
+    for call in calls:
+        with pytest.raises(TypeError, match="AsyncClient"):
+            call()
+    assert transport.requests == []
+
+
+def test_async_fan_out(transport: FakeAsyncTransport):
+    client = AsyncClient(
+        "test", "test", "str", transport=transport, max_concurrency=8, _test=True
+    )
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "next"})
+    transport.add(json_data={"value": [{"id": "2"}]})
+
+    async def main():
+        results = {}
+        async for result in client.fan_out(
+            {"users": client.users, "u1": client.users.by_id("u1")}, max_workers=1
+        ):
+            results[result.key] = result
+        return results
+
+    results = asyncio.run(main())
+    assert set(results) == {"users", "u1"}
+    users = results["users"].result()
+    assert [user.id for user in users.iter_fetched_items()] == ["1", "2"]
+    assert results["u1"].resource.id == "u1"
+    assert transport.max_active == 1
+
+
+def test_async_fan_out_early_break(url: str):
+    class PagingTransport(FakeAsyncTransport):
+        async def request(self, method: str, url: str, **kwargs: Any):
+            if "/users/" in url:
+                await asyncio.sleep(0.01)
+                return await super().request(method, url, **kwargs)
+            self.requests.append((method, url, kwargs))
+            page = len(self.requests)
+            await asyncio.sleep(0.001)
+            data: dict[str, Any] = {"value": [{"id": f"u{page}"}]}
+            # Long enough to notice an exit that waits for every page.
+            if page < 500:
+                data["@odata.nextLink"] = f"{url.partition('?')[0]}?page={page}"
+            return make_response(json_data=data)
+
+    transport = PagingTransport()
+    client = AsyncClient("test", "test", "str", transport=transport, _test=True)
+
+    async def main():
+        results = client.fan_out([client.users, client.users.by_id("u1")])
+        async with contextlib.aclosing(results):
+            async for result in results:
+                break
+        count = len(transport.requests)
+        await asyncio.sleep(0.05)
+        assert len(transport.requests) == count
+        return result
+
+    result = asyncio.run(main())
+    assert result.key.endswith("/users/u1")
+    assert 1 < len(transport.requests) < 100
+
+
+def test_async_helpers_await_their_requests(
+    client: AsyncClient, transport: FakeAsyncTransport
+):
+    transport.add(json_data={"id": "i1", "fields": {"Title": "A"}})
+
+    async def main():
+        fields = client.sites.by_id("s1").lists.by_id("l1").items.by_id("i1").fields
+        assert await fields.asdict() == {"Title": "A"}
+        user = client.users.by_id("u1")
+        assert await user.reset_password("secret") is user
+        assert await user.sign_out_to_all_sessions() is user
+        item = client.drives.by_id("d1").items.by_id("i1")
+        await item.move("p1", "b.txt")
+
+    asyncio.run(main())
+    assert [(m, u.split("/v1.0", 1)[1]) for m, u, _ in transport.requests] == [
+        ("GET", "/sites/s1/lists/l1/items/i1"),
+        ("PATCH", "/users/u1"),
+        ("POST", "/users/u1/revokeSignInSessions"),
+        ("PATCH", "/drives/d1/items/i1"),
+    ]
+
+
+def test_async_resources_keep_request_guards(client: AsyncClient):
+    class Overriding(Users):
+        def get(self):
+            return self
+
+    with pytest.raises(ValueError, match="search"):
+        asyncio.run(client.sites.get())
+    with pytest.raises(TypeError, match="Overriding.get"):
+        Overriding(client)
+
+
+def test_async_client_requires_async_close(client: AsyncClient):
+    with pytest.raises(TypeError, match="async with"):
+        with client:
+            pass
+    with pytest.raises(TypeError, match="aclose"):
+        client.close()
+
+    async def main():
+        async with client:
+            pass
+
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+import requests
+
+from pymsgraph.auth import TokenManager
+
+
+class FakeApp:
+    def __init__(self, expires_in: int = 3600, result: dict | None = None) -> None:
+        self.calls = 0
+        self.expires_in = expires_in
+        self.result = result
+
+    def acquire_token_for_client(self, scopes: list[str]) -> dict:
+        self.calls += 1
+        if self.result is not None:
+            return self.result
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+
+def test_token_manager_caches_token():
+    app = FakeApp()
+    manager = TokenManager(app, ["scope"])  # type: ignore[arg-type]
+
+    headers = manager.headers
+    assert headers == {"Authorization": "Bearer token-1"}
+    assert manager.access_token == "token-1"
+    assert manager.headers is headers
+    assert app.calls == 1
+
+
+def test_token_manager_refreshes_before_expiry():
+    app = FakeApp(expires_in=100)
+    manager = TokenManager(app, ["scope"], refresh_margin=300)  # type: ignore[arg-type]
+
+    assert manager.access_token == "token-1"
+    assert manager.access_token == "token-2"
+    assert app.calls == 2
+
+
+def test_token_manager_background_refresh():
+    app = FakeApp()
+    manager = TokenManager(app, ["scope"], background_refresh=True)  # type: ignore[arg-type]
+    try:
+        deadline = time.monotonic() + 5
+        while app.calls == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.headers == {"Authorization": "Bearer token-1"}
+        assert app.calls == 1
+    finally:
+        manager.stop()
+
+
+def test_token_manager_failure():
+    app = FakeApp(result={"error": "invalid_client"})
+    manager = TokenManager(app, ["scope"])  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        manager.headers
+
+
+def test_token_manager_without_app():
+    manager = TokenManager(None, ["scope"])
+    assert manager.access_token is None
+    assert manager.headers == {}
+
+
+def test_token_manager_background_refresh_retries_network_errors():
+    class FlakyApp(FakeApp):
+        def acquire_token_for_client(self, scopes: list[str]) -> dict:
+            if self.calls < 2:
+                self.calls += 1
+                raise requests.ConnectionError("connection reset")
+            return super().acquire_token_for_client(scopes)
+
+    app = FlakyApp()
+    manager = TokenManager(app, ["scope"])  # type: ignore[arg-type]
+    manager.RETRY_BACKOFF = 0.01
+    manager.start()
+    try:
+        deadline = time.monotonic() + 5
+        while app.calls < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert app.calls == 3
+        assert manager._thread is not None and manager._thread.is_alive()
+        assert manager._access_token == "token-3"
+    finally:
+        manager.stop()
@@ -0,0 +1,113 @@
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+from pymsgraph.batch import BatchError
+
+from .conftest import make_response
+
+
+def batch_handler(statuses: dict[str, int] | None = None):
+    payloads: list[dict[str, Any]] = []
+
+    def handler(method: str, url: str, **kwargs: Any):
+        payload = kwargs["json"]
+        payloads.append(payload)
+        responses = []
+        for request in payload["requests"]:
+            status = (statuses or {}).get(request["url"], 200)
+            body: Any = {"id": request["url"].rsplit("/", 1)[-1]}
+            if request["url"].endswith("/members"):
+                body = {"value": [{"id": "a"}, {"id": "b"}]}
+            if status >= 400:
+                body = {"error": {"code": "NotFound"}}
+            responses.append({"id": request["id"], "status": status, "body": body})
+        return make_response(json_data={"responses": responses[::-1]})
+
+    return handler, payloads
+
+
+def test_batch_fans_out_responses(
+    client: "Client", transport: "FakeTransport", url: str
+):
+    handler, payloads = batch_handler()
+    transport.handler = handler
+
+    with client.batch():
+        users = [client.users.by_id(str(i)).get() for i in range(3)]
+        members = client.groups.by_id("g1").members.get()
+        client.groups.by_id("g1").members.ref.post({"@odata.id": "x"})
+        assert transport.requests == []
+
+    assert [user.id for user in users] == ["0", "1", "2"]
+    assert [obj.id for obj in members.iter_fetched_items()] == ["a", "b"]
+    assert len(transport.requests) == 1
+    method, batch_url, _ = transport.requests[0]
+    assert (method, batch_url) == ("POST", f"{url}/$batch")
+    assert payloads[0]["requests"][0] == {"id": "1", "method": "GET", "url": "/users/0"}
+    assert payloads[0]["requests"][4] == {
+        "id": "5",
+        "method": "POST",
+        "url": "/groups/g1/members/$ref",
+        "body": {"@odata.id": "x"},
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+def test_batch_chunks_requests(client: "Client", transport: "FakeTransport"):
+    handler, payloads = batch_handler()
+    transport.handler = handler
+
+    with client.batch():
+        users = [client.users.by_id(str(i)).get() for i in range(45)]
+
+    assert [len(p["requests"]) for p in payloads] == [20, 20, 5]
+    assert [user.id for user in users] == [str(i) for i in range(45)]
+
+
+def test_batch_sequential(client: "Client", transport: "FakeTransport"):
+    handler, payloads = batch_handler()
+    transport.handler = handler
+
+    with client.batch(sequential=True):
+        client.users.by_id("1").get()
+        client.users.by_id("2").get()
+
+    assert "dependsOn" not in payloads[0]["requests"][0]
+    assert payloads[0]["requests"][1]["dependsOn"] == ["1"]
+
+
+def test_batch_errors(client: "Client", transport: "FakeTransport"):
+    handler, _ = batch_handler(statuses={"/users/2": 404})
+    transport.handler = handler
+
+    with pytest.raises(BatchError) as exc_info:
+        with client.batch():
+            ok = client.users.by_id("1").get()
+            client.users.by_id("2").get()
+
+    assert ok.id == "1"
+    assert len(exc_info.value.errors) == 1
+    assert exc_info.value.errors[0][0].url == "/users/2"
+
+
+def test_batch_rejects_nesting(client: "Client"):
+    with client.batch():
+        with pytest.raises(ValueError):
+            with client.batch():
+                pass
+    assert client._batch is None
+
+
+def test_batch_gateway_error(client: "Client", transport: "FakeTransport"):
+    transport.add(502, content=b"<html>Bad Gateway</html>")
+
+    with pytest.raises(requests.HTTPError):
+        with client.batch():
+            client.users.by_id("1").get()
@@ -0,0 +1,173 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+import pymsgraph
+from pymsgraph.cache import ResponseCache, SQLiteBackend
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
+
+@pytest.fixture
+def cache() -> ResponseCache:
+    return ResponseCache(ttl=60)
+
+
+@pytest.fixture
+def client(transport: "FakeTransport", cache: ResponseCache):
+    return pymsgraph.Client(
+        "test", "test", "str", transport=transport, cache=cache, _test=True
+    )
+
+
+def test_cache_hit(client: pymsgraph.Client, transport: "FakeTransport", url: str):
+    transport.add(json_data={"id": "1", "displayName": "Adele"})
+
+    assert client.users.by_id("1").get().asdict()["displayName"] == "Adele"
+    assert client.users.by_id("1").get().asdict()["displayName"] == "Adele"
+    assert len(transport.requests) == 1
+    assert client.cache.stats.hits == 1
+
+    client.users.by_id("1").select("id").get()
+    assert transport.requests[-1][1] == f"{url}/users/1?$select=id"
+    assert len(transport.requests) == 2
+
+
+def test_cache_revalidation(
+    client: pymsgraph.Client, transport: "FakeTransport", cache: ResponseCache
+):
+    transport.add(json_data={"@odata.etag": 'W/"1"', "id": "1", "displayName": "A"})
+    transport.add(304)
+
+    client.users.by_id("1").get()
+    cache.backend._entries[next(iter(cache.backend._entries))].expires_at = 0
+
+    user = client.users.by_id("1").get()
+    assert user.asdict()["displayName"] == "A"
+    assert transport.requests[1][2]["headers"]["If-None-Match"] == 'W/"1"'
+    assert cache.stats.revalidations == 1
+
+    client.users.by_id("1").get()
+    assert len(transport.requests) == 2
+
+
+def test_cache_invalidation(
+    client: pymsgraph.Client, transport: "FakeTransport", cache: ResponseCache
+):
+    transport.add(json_data={"value": [{"id": "1"}]})
+    transport.add(json_data={"id": "1", "displayName": "A"})
+    transport.add(204)
+    transport.add(json_data={"id": "1", "displayName": "B"})
+
+    client.users.get()
+    client.users.by_id("1").get()
+    assert len(cache) == 2
+
+    client.users.by_id("1").patch({"displayName": "B"})
+    assert len(cache) == 0
+    assert client.users.by_id("1").get().asdict()["displayName"] == "B"
+    assert len(transport.requests) == 4
+
+
+def test_cache_skips_uncacheable(
+    client: pymsgraph.Client, cache: ResponseCache, url: str
+):
+    assert not cache.is_cacheable("GET", f"{url}/users/delta", {})
+    assert not cache.is_cacheable("GET", f"{url}/users", {"stream": True})
+    assert not cache.is_cacheable("GET", "https://download.example.com/file", {})
+    assert cache.is_cacheable("GET", f"{url}/users", {})
+
+    client.users.by_id("1").get()
+    assert len(cache) == 1
+    cache.store(("x", None), make_response(404))
+    assert len(cache) == 1
+
+
+def test_cache_eviction(url: str):
+    cache = ResponseCache(max_entries=2, max_size=10)
+    for i in range(3):
+        cache.store((f"{url}/{i}", None), make_response(content=b"12345"))
+    assert [key[0] for key in cache.backend._entries] == [f"{url}/1", f"{url}/2"]
+
+    cache.get((f"{url}/1", None))
+    cache.store((f"{url}/3", None), make_response(content=b"123"))
+    assert [key[0] for key in cache.backend._entries] == [f"{url}/1", f"{url}/3"]
+    assert cache.size == 8
+    assert cache.stats.evictions == 2
+
+    cache.store((f"{url}/4", None), make_response(content=b"12345678901"))
+    assert len(cache) == 2
+
+
+def test_sqlite_backend(transport: "FakeTransport", url: str, tmp_path):
+    path = str(tmp_path / "cache.db")
+    transport.add(json_data={"id": "1", "displayName": "A"})
+
+    with pymsgraph.Client(
+        "test",
+        "test",
+        "str",
+        transport=transport,
+        cache=ResponseCache.sqlite(path),
+        _test=True,
+    ) as client:
+        client.users.by_id("1").get()
+
+    cache = ResponseCache.sqlite(path)
+    client = pymsgraph.Client(
+        "test", "test", "str", transport=transport, cache=cache, _test=True
+    )
+    assert client.users.by_id("1").get().asdict()["displayName"] == "A"
+    assert len(transport.requests) == 1
+    assert cache.stats.hits == 1
+
+    other = ResponseCache.sqlite(path)
+    key = (f"{url}/users/1", None)
+    assert other.get(key).content == cache.get(key).content
+
+    cache.store((f"{url}/users/1/memberOf", None), make_response(json_data={}))
+    cache.store((f"{url}/users/2", None), make_response(json_data={}))
+    cache.invalidate(f"{url}/users/1")
+    assert len(other) == 1
+    assert other.get((f"{url}/users/2", None)) is not None
+    cache.close()
+    other.close()
+
+
+def test_sqlite_backend_eviction(url: str, tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), max_entries=2, max_size=10)
+    cache = ResponseCache(backend=backend)
+    for i in range(3):
+        cache.store((f"{url}/{i}", None), make_response(content=b"12345"))
+    assert len(cache) == 2
+    assert cache.get((f"{url}/0", None)) is None
+
+    cache.store((f"{url}/3", None), make_response(content=b"123"))
+    assert cache.size == 8
+    assert cache.stats.evictions == 2
+
+    cache.store((f"{url}/4", None), make_response(content=b"12345678901"))
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_cache_etag_search(cache: ResponseCache):
+    entity = make_response(json_data={"@odata.etag": 'W/"a\\"b"', "id": "1"})
+    assert cache._get_etag(entity) == 'W/"a\\"b"'
+
+    page = make_response(
+        json_data={
+            "@odata.context": "https://graph.microsoft.com/v1.0/$metadata#users",
+            "value": [{"@odata.etag": 'W/"1"', "eTag": "x", "id": "1"}],
+        }
+    )
+    assert cache._get_etag(page) is None
+
+    item = make_response(
+        json_data={"name": "eTag", "parentReference": {"eTag": "x"}, "eTag": '"{1},2"'}
+    )
+    assert cache._get_etag(item) == '"{1},2"'
+    assert cache._get_etag(make_response(headers={"ETag": '"h"'})) == '"h"'
@@ -0,0 +1,81 @@
+import datetime
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+import pymsgraph
+from pymsgraph.decoders import JSONDecoder, get_decoder
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
+
+def test_get_decoder(monkeypatch):
+    assert type(get_decoder("json")) is JSONDecoder
+    decoder = JSONDecoder()
+    assert get_decoder(decoder) is decoder
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    assert type(get_decoder()) is JSONDecoder
+    with pytest.raises(ImportError):
+        get_decoder("orjson")
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_decoder_pages(name: str, transport: "FakeTransport"):
+    pytest.importorskip(name)
+    client = pymsgraph.Client(
+        "test", "test", "str", transport=transport, json_decoder=name, _test=True
+    )
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "p2"})
+    transport.add(json_data={"value": [{"id": "2", "displayName": "é"}]})
+    transport.add(content=b"not json")
+
+    users = [user.display_name for user in client.users.iter_all_items()]
+    assert users == [None, "é"]
+    assert client.json_decoder.NAME == name
+
+    user = client.users.by_id("1").get()
+    assert user._get_response.content == b"not json"
+
+
+def test_msgspec_structs(transport: "FakeTransport"):
+    pytest.importorskip("msgspec")
+    client = pymsgraph.Client(
+        "test", "test", "str", transport=transport, json_decoder="msgspec", _test=True
+    )
+    transport.add(
+        json_data={
+            "value": [
+                {
+                    "id": "1",
+                    "name": "a.txt",
+                    "size": 10,
+                    "lastModifiedDateTime": "2024-01-01T00:00:00Z",
+                }
+            ],
+            "@odata.nextLink": "p2",
+        }
+    )
+    transport.add(json_data={"value": [{"id": "2", "size": 20}]})
+
+    items = list(client.drives.by_id("d1").root.children.iter_structs())
+    assert [(item.id, item.size) for item in items] == [("1", 10), ("2", 20)]
+    assert items[0].last_modified_date_time == datetime.datetime(
+        2024, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    assert type(items[0]).__name__ == "DriveItemStruct"
+    assert transport.requests[1][1] == "p2"
+
+
+def test_structs_require_msgspec(transport: "FakeTransport"):
+    client = pymsgraph.Client(
+        "test", "test", "str", transport=transport, json_decoder="json", _test=True
+    )
+    transport.add(json_data={"value": []})
+    with pytest.raises(ValueError):
+        list(client.users.iter_structs())
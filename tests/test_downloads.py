@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from pymsgraph.downloads import QuickXorHash
+from pymsgraph.drives import DriveItem
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+DOWNLOAD_URL = "https://download.example.com/file"
+
+
+class FakeDownloadServer:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.ranges: list[str | None] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, url: str, **kwargs: Any):
+        assert (method, url) == ("GET", DOWNLOAD_URL)
+        assert kwargs["stream"] is True
+        assert "Authorization" not in kwargs["headers"]
+        value = kwargs["headers"].get("Range")
+        with self._lock:
+            self.ranges.append(value)
+        if value is None:
+            return make_response(content=self.data)
+        start, _, end = value.removeprefix("bytes=").partition("-")
+        stop = int(end) + 1 if end else len(self.data)
+        return make_response(206, content=self.data[int(start) : stop])
+
+
+@pytest.fixture
+def data() -> bytes:
+    return os.urandom(10_000)
+
+
+@pytest.fixture
+def server(transport: "FakeTransport", data: bytes) -> FakeDownloadServer:
+    server = FakeDownloadServer(data)
+    transport.handler = server
+    return server
+
+
+def get_item(client: "Client", data: bytes, hashes: dict[str, str]) -> DriveItem:
+    return DriveItem(
+        client,
+        data={
+            "id": "1",
+            "name": "file.bin",
+            "size": len(data),
+            "cTag": "c1",
+            "eTag": "e1",
+            "file": {"hashes": hashes},
+            "@microsoft.graph.downloadUrl": DOWNLOAD_URL,
+        },
+        parent=client.drives.by_id("d1").items,
+    )
+
+
+def write_state(tmp_path, **state: Any) -> None:
+    (tmp_path / "file.bin.part.json").write_text(json.dumps(state))
+
+
+def test_quick_xor_hash():
+    assert QuickXorHash().b64digest() == "AAAAAAAAAAAAAAAAAAAAAAAAAAA="
+
+    data = os.urandom(1000)
+    h = QuickXorHash()
+    for i in range(0, len(data), 37):
+        h.update(data[i : i + 37])
+    assert h.digest() == QuickXorHash(data).digest()
+
+
+def test_download_streams_and_verifies(
+    client: "Client", server: FakeDownloadServer, data: bytes, tmp_path
+):
+    item = get_item(client, data, {"quickXorHash": QuickXorHash(data).b64digest()})
+    item.download(str(tmp_path), chunk_size=1024)
+
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert not (tmp_path / "file.bin.part").exists()
+    assert server.ranges == [None]
+
+
+def test_download_resumes_partial_file(
+    client: "Client", server: FakeDownloadServer, data: bytes, tmp_path
+):
+    (tmp_path / "file.bin.part").write_bytes(data[:4000])
+    write_state(tmp_path, size=len(data), cTag="c1", eTag="e1", segment_size=None)
+    item = get_item(client, data, {"sha256Hash": hashlib.sha256(data).hexdigest()})
+    item.download(str(tmp_path))
+
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert server.ranges == ["bytes=4000-"]
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        None,
+        {"size": 10_000, "cTag": "c0", "eTag": "e1", "segment_size": None},
+        {"size": 10_000, "cTag": "c1", "eTag": "e1", "segment_size": 3000},
+    ],
+)
+def test_download_discards_partial_file_from_other_version(
+    client: "Client",
+    server: FakeDownloadServer,
+    data: bytes,
+    tmp_path,
+    state: dict[str, Any] | None,
+):
+    (tmp_path / "file.bin.part").write_bytes(os.urandom(4000))
+    if state is not None:
+        write_state(tmp_path, **state)
+    item = get_item(client, data, {})
+    item.download(str(tmp_path))
+
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert server.ranges == [None]
+
+
+def test_download_parallel_ranges_resume(
+    client: "Client", server: FakeDownloadServer, data: bytes, tmp_path
+):
+    (tmp_path / "file.bin.part").write_bytes(data[:3000] + bytes(7000))
+    write_state(
+        tmp_path, size=len(data), cTag="c1", eTag="e1", segment_size=3000, done=[0]
+    )
+    item = get_item(client, data, {})
+    item.download(str(tmp_path), max_workers=2, segment_size=3000)
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert "bytes=0-2999" not in server.ranges
+
+    item._data["cTag"] = "c2"
+    (tmp_path / "file.bin.part").write_bytes(bytes(10_000))
+    write_state(
+        tmp_path, size=len(data), cTag="c1", eTag="e1", segment_size=3000, done=[0]
+    )
+    server.ranges.clear()
+    item.download(str(tmp_path), max_workers=2, segment_size=3000)
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert "bytes=0-2999" in server.ranges
+
+
+def test_download_parallel_ranges(
+    client: "Client", server: FakeDownloadServer, data: bytes, tmp_path
+):
+    item = get_item(client, data, {"sha1Hash": hashlib.sha1(data).hexdigest()})
+    item.download(str(tmp_path), max_workers=3, segment_size=3000)
+
+    assert (tmp_path / "file.bin").read_bytes() == data
+    assert sorted(server.ranges) == [  # type: ignore[type-var]
+        "bytes=0-2999",
+        "bytes=3000-5999",
+        "bytes=6000-8999",
+        "bytes=9000-9999",
+    ]
+    assert not (tmp_path / "file.bin.part.json").exists()
+
+
+def test_download_hash_mismatch(
+    client: "Client", server: FakeDownloadServer, data: bytes, tmp_path
+):
+    item = get_item(client, data, {"quickXorHash": QuickXorHash(b"other").b64digest()})
+    with pytest.raises(ValueError):
+        item.download(str(tmp_path))
+    assert not (tmp_path / "file.bin").exists()
+    assert not (tmp_path / "file.bin.part").exists()
@@ -1,11 +1,16 @@
 import json
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 import pytest
 
 from pymsgraph import Client
 from pymsgraph.drives import Drive, Drives
 
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
 
 @pytest.fixture
 def drive_data():
@@ -148,3 +153,92 @@ def test_drive_item_by_relative_path_children(
     check_request_attributes(
         obj, _type="query_param", SELECT=True, ORDERBY=True, TOP=True
     )
+
+
+def test_drive_root_delta(
+    drive: Drive,
+    url: str,
+    check_request_attributes: Callable,
+    client: Client,
+    transport: "FakeTransport",
+):
+    obj = drive.root.delta()
+    assert (
+        obj.url
+        == f"{url}/drives/b!-RIj2DuyvEyV1T4NlOaMHk8XkS_I8MdFlUCq1BlcjgmhRfAj3-Z8RY2VpuvV_tpd/root/delta"
+    )
+    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="query_param", SELECT=True)
+
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "1", "name": "a.txt", "parentReference": {"driveId": "d1"}},
+                {"id": "2", "deleted": {}, "parentReference": {"driveId": "d1"}},
+                {"id": "3", "deleted": {}},
+            ],
+            "@odata.deltaLink": f"{url}/drives/d1/root/delta?token=abc",
+        }
+    )
+    items = list(obj.iter_changes())
+    assert [item.url for item in items] == [
+        f"{url}/drives/d1/items/1",
+        f"{url}/drives/d1/items/2",
+        f"{drive.url}/items/3",
+    ]
+    assert [obj.is_removed(item) for item in items] == [False, True, True]
+
+
+@pytest.fixture
+def drive_tree(transport: "FakeTransport", url: str):
+    def item(item_id: str, name: str, is_folder: bool = False):
+        data: dict[str, Any] = {
+            "id": item_id,
+            "name": name,
+            "parentReference": {"driveId": "d1"},
+        }
+        if is_folder:
+            data["folder"] = {"childCount": 1}
+        return data
+
+    children = {
+        f"{url}/drives/d1/root/children": [item("a", "A", True), item("x", "x.txt")],
+        f"{url}/drives/d1/items/a/children": [item("b", "B", True), item("y", "y.txt")],
+        f"{url}/drives/d1/items/b/children": [item("z", "z.txt")],
+    }
+
+    def handler(method: str, request_url: str, **kwargs):
+        base, _, query = request_url.partition("?")
+        return make_response(json_data={"value": children[base], "query": query})
+
+    transport.handler = handler
+
+
+def test_drive_walk(client: Client, drive_tree, transport: "FakeTransport"):
+    result = sorted(
+        (path, item.id) for path, item in client.drives.by_id("d1").walk(max_workers=2)
+    )
+    assert result == [
+        ("A", "a"),
+        ("A/B", "b"),
+        ("A/B/z.txt", "z"),
+        ("A/y.txt", "y"),
+        ("x.txt", "x"),
+    ]
+    assert len(transport.requests) == 3
+
+
+def test_drive_walk_options(client: Client, drive_tree, transport: "FakeTransport"):
+    result = sorted(
+        path
+        for path, _ in client.drives.by_id("d1").walk(
+            select="size", folder_filter=lambda path, item: path != "A/B"
+        )
+    )
+    assert result == ["A", "A/B", "A/y.txt", "x.txt"]
+    assert transport.requests[0][1].endswith(
+        "/root/children?$select=size,id,name,folder,parentReference"
+    )
+
+    result = sorted(path for path, _ in client.drives.by_id("d1").walk(max_depth=1))
+    assert result == ["A", "x.txt"]
@@ -0,0 +1,73 @@
+import gzip
+import io
+import json
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+@pytest.fixture
+def pages(transport: "FakeTransport"):
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "1", "displayName": "Ádele", "mail": "a@x"},
+                {"id": "2", "displayName": "Bob", "mail": "b@x"},
+            ],
+            "@odata.nextLink": "p2",
+        }
+    )
+    transport.add(json_data={"value": [{"id": "3", "displayName": "Cy"}]})
+
+
+def read_lines(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def test_export_jsonl(client: "Client", transport: "FakeTransport", pages, tmp_path):
+    path = tmp_path / "users.jsonl"
+    users = client.users
+    assert users.export_jsonl(str(path)) == 3
+    assert users._mdata == {}
+
+    lines = read_lines(path.read_bytes())
+    assert [line["id"] for line in lines] == ["1", "2", "3"]
+    assert lines[0]["displayName"] == "Ádele"
+
+
+def test_export_jsonl_fields(client: "Client", transport: "FakeTransport", pages, url):
+    f = io.BytesIO()
+    assert client.users.export_jsonl(f, fields="display_name") == 3
+    assert transport.requests[0][1] == f"{url}/users?$select=id,displayName"
+    assert read_lines(f.getvalue())[0] == {"id": "1", "displayName": "Ádele"}
+
+
+def test_export_jsonl_gzip(client: "Client", pages, tmp_path):
+    path = tmp_path / "users.jsonl.gz"
+    client.users.export_jsonl(path)
+    lines = read_lines(gzip.decompress(path.read_bytes()))
+    assert len(lines) == 3
+
+
+def test_export_jsonl_zstd(client: "Client", pages):
+    zstandard = pytest.importorskip("zstandard")
+    f = io.BytesIO()
+    client.users.export_jsonl(f, compression="zstd")
+    data = zstandard.ZstdDecompressor().decompressobj().decompress(f.getvalue())
+    assert len(read_lines(data)) == 3
+    assert not f.closed
+
+
+def test_export_jsonl_errors(client: "Client", monkeypatch, tmp_path):
+    with pytest.raises(ValueError):
+        client.users.export_jsonl(io.BytesIO(), compression="bz2")
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ImportError):
+        client.users.export_jsonl(tmp_path / "users.jsonl.zst")
+    assert not (tmp_path / "users.jsonl.zst").exists()
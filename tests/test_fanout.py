@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+from pymsgraph.fanout import FanOut
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+class FakeServer:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, request_url: str, **kwargs: Any):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+
+        path = request_url.removeprefix(self.url)
+        if path == "/users":
+            return make_response(
+                json_data={
+                    "value": [{"id": "u1"}],
+                    "@odata.nextLink": f"{self.url}/users?page=2",
+                }
+            )
+        if path == "/users?page=2":
+            return make_response(json_data={"value": [{"id": "u2"}]})
+        if path == "/groups":
+            return make_response(json_data={"value": [{"id": "g1"}]})
+        if path == "/groups/g1/members":
+            return make_response(json_data={"value": [{"id": "u1"}]})
+        if path == "/deviceManagement/managedDevices":
+            return make_response(403, json_data={"error": {"code": "Forbidden"}})
+        return make_response(json_data={"id": path.rsplit("/", 1)[-1]})
+
+
+@pytest.fixture
+def server(transport: "FakeTransport", url: str) -> FakeServer:
+    server = FakeServer(url)
+    transport.handler = server
+    return server
+
+
+def test_fan_out(client: "Client", server: FakeServer):
+    results = {
+        result.key: result
+        for result in client.fan_out(
+            {
+                "users": client.users,
+                "groups": client.groups,
+                "devices": client.device_management.managed_devices,
+                "user": client.users.by_id("u9"),
+            },
+            max_workers=2,
+        )
+    }
+
+    assert set(results) == {"users", "groups", "devices", "user"}
+    users = results["users"].result()
+    assert [user.id for user in users.iter_fetched_items()] == ["u1", "u2"]
+    assert results["user"].resource.id == "u9"
+    assert not results["devices"].ok
+    assert isinstance(results["devices"].error, requests.exceptions.HTTPError)
+    assert server.max_active <= 2
+
+
+def test_fan_out_submit_while_iterating(client: "Client", url: str, server: FakeServer):
+    keys = []
+    with FanOut(max_workers=4) as fanout:
+        fanout.submit(client.groups, key="groups")
+        for result in fanout.as_completed():
+            keys.append(result.key)
+            if result.key == "groups":
+                for group in result.resource.iter_fetched_items():
+                    fanout.submit(group.members, key=group.id)
+    assert keys == ["groups", "g1"]
+    assert fanout.pending == 0
+
+
+def test_fan_out_early_break(client: "Client", transport: "FakeTransport", url: str):
+    pages = []
+
+    def handler(method: str, request_url: str, **kwargs: Any):
+        if request_url.partition("?")[0] == f"{url}/users":
+            page = len(pages)
+            pages.append(page)
+            time.sleep(0.01)
+            data: dict[str, Any] = {"value": [{"id": f"u{page}"}]}
+            # Long enough to notice a close() that waits for every page.
+            if page < 500:
+                data["@odata.nextLink"] = f"{url}/users?page={page + 1}"
+            return make_response(json_data=data)
+        time.sleep(0.05)
+        return make_response(json_data={"id": request_url.rsplit("/", 1)[-1]})
+
+    transport.handler = handler
+    started = time.monotonic()
+    for result in client.fan_out(
+        [client.users, client.users.by_id("u1")], max_workers=2
+    ):
+        assert result.key.endswith("/users/u1")
+        break
+
+    assert time.monotonic() - started < 2
+    count = len(pages)
+    assert count > 1
+    time.sleep(0.05)
+    assert len(pages) == count
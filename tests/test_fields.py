@@ -0,0 +1,27 @@
+import datetime
+from typing import TYPE_CHECKING
+
+from pymsgraph.drives import DriveItem
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+def test_field_memoization(client: "Client", transport: "FakeTransport"):
+    item = DriveItem(
+        client,
+        data={"id": "1", "size": "10", "lastModifiedDateTime": "2024-01-01T00:00:00Z"},
+    )
+    modified = item.last_modified_date_time
+    assert modified == datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    assert item.last_modified_date_time is modified
+    assert item.size == 10
+    assert item._field_cache[1] == {"lastModifiedDateTime": modified}
+
+    transport.add(json_data={"id": "1", "size": 20})
+    item.get()
+    assert item.size == 20
+    assert item.last_modified_date_time is None
+    assert item.id == "1"
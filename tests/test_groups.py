@@ -1,12 +1,17 @@
-from typing import TYPE_CHECKING, Callable
+import threading
+from typing import TYPE_CHECKING, Any, Callable
 
 import pytest
 
 if TYPE_CHECKING:
     from pymsgraph import Client
 
+    from .conftest import FakeTransport
+
 from pymsgraph.groups import Groups
 
+from .conftest import make_response
+
 
 @pytest.fixture
 def groups(client: "Client") -> Groups:
@@ -37,7 +42,7 @@ def test_groups(groups: Groups, url: str, check_request_attributes: Callable):
 def test_group(groups: Groups, url: str, check_request_attributes: Callable):
     obj = groups.by_id("12345")
     assert obj.url == f"{url}/groups/12345"
-    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="method", GET=True, PATCH=True)
     check_request_attributes(obj, _type="query_param", SELECT=True)
 
 
@@ -99,3 +104,150 @@ def test_group_members_graph_user(
         obj.url_with_query_params
         == f'{url}/groups/12345/members/microsoft.graph.user?$orderby=displayName&$search="displayName:Pr"&$select=displayName,id'
     )
+
+
+def test_groups_delta(groups: Groups, url: str, check_request_attributes: Callable):
+    obj = groups.delta().select("displayName,members")
+    assert (
+        obj.url_with_query_params == f"{url}/groups/delta?$select=displayName,members"
+    )
+    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="query_param", SELECT=True, FILTER=True)
+
+
+class FakeMembersServer:
+    def __init__(self, url: str, members: set[str], invalid: set[str]) -> None:
+        self.url = url
+        self.members = members
+        self.invalid = invalid
+        self.patches: list[list[str]] = []
+        self.batches: list[int] = []
+        self._lock = threading.Lock()
+
+    def error(self, status_code: int, message: str):
+        return make_response(
+            status_code,
+            json_data={"error": {"code": "Request_BadRequest", "message": message}},
+        )
+
+    def __call__(self, method: str, request_url: str, **kwargs: Any):
+        if request_url == f"{self.url}/$batch":
+            return self.batch(kwargs["json"]["requests"])
+        group_url = f"{self.url}/groups/1"
+        prefix = f"{self.url}/directoryObjects/"
+        with self._lock:
+            if method == "GET":
+                assert request_url == f"{group_url}/members?$select=id"
+                return make_response(
+                    json_data={"value": [{"id": i} for i in sorted(self.members)]}
+                )
+            if method == "PATCH":
+                assert request_url == group_url
+                ids = [
+                    i.removeprefix(prefix) for i in kwargs["json"]["members@odata.bind"]
+                ]
+                assert len(ids) <= 20
+                self.patches.append(ids)
+                if self.invalid.intersection(ids):
+                    return self.error(400, "Resource does not exist.")
+                self.members.update(ids)
+                return make_response(204)
+            if method == "POST":
+                assert request_url == f"{group_url}/members/$ref"
+                dir_obj_id = kwargs["json"]["@odata.id"].removeprefix(prefix)
+                if dir_obj_id in self.invalid:
+                    return self.error(404, "Resource does not exist.")
+                if dir_obj_id in self.members:
+                    return self.error(
+                        400, "One or more added object references already exist."
+                    )
+                self.members.add(dir_obj_id)
+                return make_response(204)
+            if method == "DELETE":
+                dir_obj_id = request_url.removeprefix(f"{group_url}/members/")[:-5]
+                if dir_obj_id not in self.members:
+                    return self.error(404, "Resource does not exist.")
+                self.members.remove(dir_obj_id)
+                return make_response(204)
+        raise AssertionError(f"Unexpected request {method} {request_url}")
+
+    def batch(self, requests_data: list[dict[str, Any]]):
+        assert len(requests_data) <= 20
+        self.batches.append(len(requests_data))
+        responses = []
+        for request in requests_data:
+            response = self(
+                request["method"],
+                f"{self.url}{request['url']}",
+                json=request.get("body"),
+            )
+            body = response.json() if response.content else None
+            responses.append(
+                {"id": request["id"], "status": response.status_code, "body": body}
+            )
+        return make_response(json_data={"responses": responses})
+
+
+@pytest.fixture
+def members_server(transport: "FakeTransport", url: str) -> FakeMembersServer:
+    server = FakeMembersServer(url, {"u0", "u1"}, {"bad"})
+    transport.handler = server
+    return server
+
+
+def test_group_members_add(groups: Groups, members_server: FakeMembersServer):
+    ids = [f"u{i}" for i in range(45)]
+    result = groups.by_id("1").members.add(ids + ["u2"], max_workers=2)
+
+    assert result.skipped == ["u0", "u1"]
+    assert sorted(result.added) == sorted(ids[2:])
+    assert not result.failed
+    assert [len(i) for i in members_server.patches] == [20, 20, 3]
+    assert members_server.members == set(ids)
+
+
+def test_group_members_add_failures(groups: Groups, members_server: FakeMembersServer):
+    result = groups.by_id("1").members.add(
+        ["u2", "bad", "u1", "u3"], skip_existing=False
+    )
+
+    assert result.added == ["u2", "u3"]
+    assert result.skipped == ["u1"]
+    assert list(result.failed) == ["bad"]
+    assert result.failed["bad"].response.status_code == 404
+    assert members_server.members == {"u0", "u1", "u2", "u3"}
+    assert members_server.batches == [4]
+
+
+def test_group_members_remove_and_set(
+    groups: Groups, members_server: FakeMembersServer
+):
+    members = groups.by_id("1").members
+    result = members.remove(["u1", "u9"])
+    assert result.removed == ["u1"]
+    assert result.skipped == ["u9"]
+    assert members_server.members == {"u0"}
+
+    result = members.set(["u0", "u2", "u3"])
+    assert result.skipped == ["u0"]
+    assert result.added == ["u2", "u3"]
+    assert members_server.members == {"u0", "u2", "u3"}
+
+    result = members.set(["u3"])
+    assert sorted(result.removed) == ["u0", "u2"]
+    assert members_server.members == {"u3"}
+
+
+def test_group_members_remove_batches(
+    groups: Groups, members_server: FakeMembersServer
+):
+    ids = [f"u{i}" for i in range(45)]
+    members_server.members.update(ids)
+    members_server.members.add("x")
+
+    result = groups.by_id("1").members.remove(ids, max_workers=2)
+
+    assert sorted(result.removed) == sorted(ids)
+    assert not result.failed
+    assert sorted(members_server.batches) == [5, 20, 20]
+    assert members_server.members == {"x"}
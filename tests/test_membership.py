@@ -0,0 +1,120 @@
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+from pymsgraph.membership import MembershipGraph
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+def user(user_id: str, removed: bool = False):
+    data = {"@odata.type": "#microsoft.graph.user", "id": user_id}
+    if removed:
+        data["@removed"] = {"reason": "deleted"}
+    return data
+
+
+def group(group_id: str):
+    return {"@odata.type": "#microsoft.graph.group", "id": group_id}
+
+
+@pytest.fixture
+def graph(client: "Client", transport: "FakeTransport", url: str) -> MembershipGraph:
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "g1", "members@delta": [user("u1"), group("g2")]},
+                {"id": "g2", "members@delta": [user("u2"), group("g3")]},
+            ],
+            "@odata.nextLink": f"{url}/groups/delta?$skiptoken=1",
+        }
+    )
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "g3", "members@delta": [user("u3")]},
+                {"id": "g2", "members@delta": [user("u4")]},
+            ],
+            "@odata.deltaLink": f"{url}/groups/delta?$deltatoken=1",
+        }
+    )
+    return MembershipGraph(client).load()
+
+
+def test_membership_graph_load(
+    graph: MembershipGraph, transport: "FakeTransport", url: str
+):
+    assert transport.requests[0][1] == f"{url}/groups/delta?$select=id,members"
+    assert graph.delta_link == f"{url}/groups/delta?$deltatoken=1"
+    assert graph.group_ids == {"g1", "g2", "g3"}
+
+    assert graph.is_member("u3", "g1")
+    assert not graph.is_member("u3", "g1", transitive=False)
+    assert not graph.is_member("u1", "g2")
+    assert graph.get_groups("u3") == {"g1", "g2", "g3"}
+    assert graph.get_groups("g3") == {"g1", "g2"}
+    assert graph.get_members("g2", transitive=False) == {"u2", "u4", "g3"}
+    assert graph.get_members("g1") == {"u1", "u2", "u3", "u4", "g2", "g3"}
+
+
+def test_membership_graph_refresh(
+    graph: MembershipGraph, transport: "FakeTransport", url: str
+):
+    assert graph.is_member("u3", "g1")
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "g3", "members@delta": [user("u3", removed=True), user("u5")]},
+                {"id": "g2", "@removed": {"reason": "deleted"}},
+            ],
+            "@odata.deltaLink": f"{url}/groups/delta?$deltatoken=2",
+        }
+    )
+    graph.refresh()
+
+    assert transport.requests[-1][1] == f"{url}/groups/delta?$deltatoken=1"
+    assert graph.delta_link == f"{url}/groups/delta?$deltatoken=2"
+    assert not graph.is_member("u3", "g1")
+    assert not graph.is_member("u5", "g1")
+    assert graph.get_groups("u5") == {"g3"}
+    assert graph.get_members("g1") == {"u1"}
+
+
+def test_membership_graph_resync(
+    graph: MembershipGraph, transport: "FakeTransport", url: str
+):
+    transport.add(410, json_data={"error": {"code": "syncStateNotFound"}})
+    transport.add(
+        json_data={
+            "value": [{"id": "g9", "members@delta": [user("u9")]}],
+            "@odata.deltaLink": f"{url}/groups/delta?$deltatoken=3",
+        }
+    )
+    graph.refresh()
+
+    assert graph.group_ids == {"g9"}
+    assert graph.get_groups("u3") == set()
+    assert graph.delta_link == f"{url}/groups/delta?$deltatoken=3"
+
+
+def test_membership_graph_refresh_error(
+    graph: MembershipGraph, transport: "FakeTransport", url: str
+):
+    assert graph.get_groups("u1") == {"g1"}
+    transport.add(
+        json_data={
+            "value": [{"id": "g3", "members@delta": [user("u1")]}],
+            "@odata.nextLink": f"{url}/groups/delta?$skiptoken=2",
+        }
+    )
+    transport.add(404, json_data={})
+
+    with pytest.raises(requests.HTTPError):
+        graph.refresh()
+
+    assert graph.delta_link == f"{url}/groups/delta?$deltatoken=1"
+    assert graph.get_groups("u1") == {"g1", "g2", "g3"}
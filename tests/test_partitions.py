@@ -0,0 +1,91 @@
+import datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+from pymsgraph.partitions import date_range_partitions, startswith_partitions
+from pymsgraph.retry import RetryPolicy
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+def test_startswith_partitions():
+    assert startswith_partitions("displayName", "ab") == [
+        "startswith(displayName,'a')",
+        "startswith(displayName,'b')",
+    ]
+
+
+def test_date_range_partitions():
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime(2024, 1, 3, tzinfo=datetime.timezone.utc)
+    assert date_range_partitions("createdDateTime", start, end, 2) == [
+        "createdDateTime lt 2024-01-01T00:00:00Z",
+        "createdDateTime ge 2024-01-01T00:00:00Z and createdDateTime lt 2024-01-02T00:00:00Z",
+        "createdDateTime ge 2024-01-02T00:00:00Z and createdDateTime lt 2024-01-03T00:00:00Z",
+        "createdDateTime ge 2024-01-03T00:00:00Z",
+    ]
+    with pytest.raises(ValueError):
+        date_range_partitions("createdDateTime", end, start, 2)
+
+
+def partition_handler(pages: dict[str, list[dict[str, Any]]]):
+    def handler(method: str, url: str, **kwargs):
+        for name, values in pages.items():
+            if url.endswith(f"/{name}"):
+                return make_response(json_data=values[1])
+            if f"'{name}'" in url:
+                data: dict[str, Any] = dict(values[0])
+                if len(values) > 1:
+                    data["@odata.nextLink"] = f"https://graph.microsoft.com/v1.0/{name}"
+                return make_response(json_data=data)
+        return make_response(json_data={"value": []})
+
+    return handler
+
+
+def test_iter_partitioned(client: "Client", transport: "FakeTransport"):
+    transport.handler = partition_handler(
+        {
+            "a": [
+                {"value": [{"id": "1"}, {"id": "2"}]},
+                {"value": [{"id": "3"}]},
+            ],
+            "b": [{"value": [{"id": "2"}, {"id": "4"}]}],
+        }
+    )
+
+    users = client.users.filter("accountEnabled eq true")
+    items = users.iter_partitioned(
+        startswith_partitions("displayName", "abc"), max_workers=2
+    )
+    ids = [user.id for user in items]
+
+    assert sorted(ids) == ["1", "2", "3", "4"]
+    assert users._query_params["filter"] == "accountEnabled eq true"
+    assert users._mdata == {0: {}}
+    urls = [url for _, url, _ in transport.requests if "$filter=" in url]
+    filters = sorted(url.split("$filter=")[1] for url in urls)
+    assert filters == [
+        f"(accountEnabled eq true) and (startswith(displayName,'{char}'))"
+        for char in "abc"
+    ]
+
+
+def test_iter_partitioned_error(client: "Client", transport: "FakeTransport"):
+    def handler(method: str, url: str, **kwargs):
+        if "'b'" in url:
+            return make_response(status_code=500, json_data={})
+        return make_response(json_data={"value": [{"id": "1"}]})
+
+    client.retry_policy = RetryPolicy(max_retries=0)
+    transport.handler = handler
+    items = client.users.iter_partitioned(startswith_partitions("displayName", "ab"))
+    with pytest.raises(requests.HTTPError):
+        list(items)
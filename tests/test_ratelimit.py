@@ -0,0 +1,117 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+import pymsgraph
+from pymsgraph import ratelimit
+from pymsgraph.ratelimit import RateLimiter, TokenBucket
+from pymsgraph.retry import RetryPolicy
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_paces_requests(clock: FakeClock):
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+    clock.now += 0.5
+    assert bucket.reserve() == 0
+
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+    bucket.set_rate(100)
+    assert bucket.rate == 10
+    bucket.set_rate(0)
+    assert bucket.rate == bucket.min_rate
+
+
+def test_rate_limiter_keys():
+    limiter = RateLimiter()
+    assert limiter.get_keys("https://graph.microsoft.com/v1.0/users/1/memberOf") == [
+        "graph.microsoft.com",
+        "graph.microsoft.com/directory",
+    ]
+    assert limiter.get_keys("https://graph.microsoft.com/beta/sites/root") == [
+        "graph.microsoft.com",
+        "graph.microsoft.com/drives",
+    ]
+    assert limiter.get_keys("https://tenant.sharepoint.com:443/upload") == [
+        "tenant.sharepoint.com:443",
+        "tenant.sharepoint.com:443/upload",
+    ]
+
+
+def test_rate_limiter_adapts(clock: FakeClock):
+    limiter = RateLimiter(rate=10, family_rates={"drives": 4}, increase_after=2)
+    drives_url = "https://graph.microsoft.com/v1.0/drives/1/root"
+    users_url = "https://graph.microsoft.com/v1.0/users"
+
+    limiter.record(drives_url, make_response(200))
+    limiter.record(users_url, make_response(200))
+    limiter.record(drives_url, make_response(429, headers={"Retry-After": "2"}))
+    assert limiter.throttled == 1
+    assert limiter.get_rates() == {
+        "graph.microsoft.com/drives": 2,
+        "graph.microsoft.com/directory": 10,
+    }
+    assert limiter.acquire(drives_url) == pytest.approx(2)
+    assert limiter.acquire(users_url) == 0
+
+    limiter.record(drives_url, make_response(200))
+    assert limiter.get_rates()["graph.microsoft.com/drives"] == 2
+    limiter.record(drives_url, make_response(200))
+    assert limiter.get_rates()["graph.microsoft.com/drives"] == pytest.approx(2.2)
+
+    limiter.record(drives_url, make_response(503))
+    assert limiter.throttled == 1
+
+
+def test_client_acquires_from_rate_limiter(
+    transport: "FakeTransport", clock: FakeClock
+):
+    limiter = RateLimiter(rate=5)
+    client = pymsgraph.Client(
+        "test",
+        "test",
+        "str",
+        transport=transport,
+        retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+        rate_limiter=limiter,
+        _test=True,
+    )
+    transport.add(429, json_data={}, headers={"Retry-After": "0"})
+    transport.add(json_data={"id": "1"})
+    transport.add(json_data={"id": "2"})
+
+    assert client.users.by_id("1").get().id == "1"
+    assert client.users.by_id("2").get().id == "2"
+
+    assert len(transport.requests) == 3
+    assert limiter.throttled == 1
+    assert limiter.get_rates()["graph.microsoft.com/directory"] == 2.5
+    assert sum(clock.sleeps) > 0
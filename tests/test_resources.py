@@ -0,0 +1,206 @@
+import math
+import time
+from array import array
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+@pytest.fixture
+def pages(transport: "FakeTransport"):
+    transport.add(
+        json_data={"value": [{"id": "1"}, {"id": "2"}], "@odata.nextLink": "p2"}
+    )
+    transport.add(json_data={"value": [{"id": "3"}], "@odata.nextLink": "p3"})
+    transport.add(json_data={"value": [{"id": "4"}]})
+
+
+def test_iter_all_items_streams_pages(
+    client: "Client", transport: "FakeTransport", pages
+):
+    items = client.users.iter_all_items()
+
+    assert next(items).id == "1"
+    assert len(transport.requests) == 1
+    assert next(items).id == "2"
+    assert next(items).id == "3"
+    assert len(transport.requests) == 2
+    assert [obj.id for obj in items] == ["4"]
+    assert len(transport.requests) == 3
+
+
+def test_iter_all_items_keeps_fetched_pages(
+    client: "Client", transport: "FakeTransport", pages
+):
+    users = client.users
+    assert [obj.id for obj in users.iter_all_items()] == ["1", "2", "3", "4"]
+    assert users.count_fetched_items() == 4
+    assert users.current_page == 3
+    assert [obj.id for obj in users.iter_all_items()] == ["1", "2", "3", "4"]
+    assert len(transport.requests) == 3
+
+
+def test_iter_all_items_discard_pages(
+    client: "Client", transport: "FakeTransport", pages
+):
+    users = client.users
+    fetched = []
+    for obj in users.iter_all_items(discard_pages=True):
+        fetched.append(obj.id)
+        assert len(users._mdata) <= 2
+    assert fetched == ["1", "2", "3", "4"]
+    assert users._mdata == {}
+    assert users._objects == {}
+
+
+def test_iter_pages(client: "Client", pages):
+    pages = [page["value"] for page in client.users.iter_pages(discard_pages=True)]
+    assert pages == [[{"id": "1"}, {"id": "2"}], [{"id": "3"}], [{"id": "4"}]]
+
+
+def test_iter_all_items_prefetch(client: "Client", transport: "FakeTransport", pages):
+    users = client.users
+    items = users.iter_all_items(prefetch=2)
+
+    assert next(items).id == "1"
+    for _ in range(100):
+        if len(transport.requests) == 3:
+            break
+        time.sleep(0.01)
+    assert [method_url[1] for method_url in transport.requests[1:]] == ["p2", "p3"]
+    assert [obj.id for obj in items] == ["2", "3", "4"]
+    assert users.count_fetched_items() == 4
+
+
+def test_iter_all_items_prefetch_error(client: "Client", transport: "FakeTransport"):
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "p2"})
+    transport.add(404, json_data={"error": {}})
+
+    items = client.users.iter_all_items(prefetch=1)
+    assert next(items).id == "1"
+    with pytest.raises(requests.exceptions.HTTPError):
+        next(items)
+
+
+def test_iter_records(client: "Client", transport: "FakeTransport", url: str):
+    transport.add(
+        json_data={
+            "value": [
+                {"id": "1", "displayName": "A", "mail": "a@x", "accountEnabled": True},
+                {"id": "2", "displayName": "B", "mail": "b@x"},
+            ],
+            "@odata.nextLink": "p2",
+        }
+    )
+    transport.add(json_data={"value": [{"id": "3", "displayName": "C"}]})
+
+    users = client.users
+    records = list(users.iter_records(fields="display_name,account_enabled"))
+    assert users._mdata == {}
+    assert [record.display_name for record in records] == ["A", "B", "C"]
+    assert records[0].account_enabled is True
+    assert records[1].mail is None
+    assert records[0].asdict() == {
+        "id": "1",
+        "displayName": "A",
+        "accountEnabled": True,
+    }
+    assert not hasattr(records[0], "__dict__")
+    assert type(records[0]).__name__ == "UserRecord"
+
+    user = records[2].to_resource()
+    assert user.url == f"{url}/users/3"
+    assert user.display_name == "C"
+
+
+@pytest.fixture
+def item_pages(transport: "FakeTransport"):
+    transport.add(
+        json_data={
+            "value": [
+                {
+                    "id": "1",
+                    "name": "a.txt",
+                    "size": 10,
+                    "lastModifiedDateTime": "2024-01-01T00:00:00Z",
+                },
+                {"id": "2", "name": "b.txt", "size": 20},
+            ],
+            "@odata.nextLink": "p2",
+        }
+    )
+    transport.add(json_data={"value": [{"id": "3", "size": 30}]})
+
+
+def test_to_columns(client: "Client", transport: "FakeTransport", item_pages):
+    children = client.drives.by_id("d1").root.children
+    columns = children.to_columns(fields="id,name,size,last_modified_date_time")
+    assert children._mdata == {}
+    assert columns["id"] == ["1", "2", "3"]
+    assert columns["name"] == ["a.txt", "b.txt", None]
+    assert columns["size"] == array("q", [10, 20, 30])
+    timestamps = columns["last_modified_date_time"]
+    assert isinstance(timestamps, array)
+    assert timestamps[0] == 1704067200.0
+    assert math.isnan(timestamps[1]) and math.isnan(timestamps[2])
+
+    transport.add(json_data={"value": []})
+    assert list(client.users.to_columns()) == [
+        "id",
+        "display_name",
+        "user_principal_name",
+        "mail",
+        "account_enabled",
+    ]
+
+
+def test_to_table(client: "Client", item_pages):
+    pa = pytest.importorskip("pyarrow")
+    table = client.drives.by_id("d1").root.children.to_table(
+        fields=["name", "size", "last_modified_date_time"]
+    )
+    assert table.schema.field("size").type == pa.int64()
+    assert table.schema.field("last_modified_date_time").type == pa.timestamp(
+        "us", tz="UTC"
+    )
+    assert table.column("name").to_pylist() == ["a.txt", "b.txt", None]
+
+
+def test_iter_raw_pages(client: "Client", transport: "FakeTransport", url: str):
+    first = (
+        b'{"@odata.context":"ctx","@odata.nextLink":"https://graph.microsoft.com/'
+        b'v1.0/users?$skiptoken=a\\u0026b","value":[{"id":"1","note":"\\"@odata.nextLink\\""}]}'
+    )
+    last = b'{"value":[{"id":"2"}],"@odata.deltaLink":"https://d/delta?$deltatoken=x"}'
+    transport.add(content=first)
+    transport.add(content=last)
+
+    users = client.users
+    pages = list(users.iter_raw_pages())
+    assert [page.content for page in pages] == [first, last]
+    assert pages[0].next_link == f"{url}/users?$skiptoken=a&b"
+    assert pages[0].delta_link is None
+    assert pages[1].next_link is None
+    assert pages[1].delta_link == "https://d/delta?$deltatoken=x"
+    assert transport.requests[1][1] == f"{url}/users?$skiptoken=a&b"
+    assert users._mdata == {0: {}}
+
+
+def test_iter_raw_pages_prefetch(client: "Client", transport: "FakeTransport"):
+    for i in range(3):
+        next_link = f',"@odata.nextLink":"p{i + 1}"' if i < 2 else ""
+        transport.add(content=f'{{"value":[{{"id":"{i}"}}]{next_link}}}'.encode())
+
+    pages = list(client.users.iter_raw_pages(prefetch=2))
+    assert [page.next_link for page in pages] == ["p1", "p2", None]
+    assert [request[1].rsplit("/", 1)[-1] for request in transport.requests] == [
+        "users",
+        "p1",
+        "p2",
+    ]
@@ -0,0 +1,122 @@
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+import pymsgraph
+from pymsgraph.retry import RetryPolicy
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
+
+@pytest.fixture
+def retry_policy() -> RetryPolicy:
+    return RetryPolicy(max_retries=3, backoff_factor=0, jitter=False)
+
+
+@pytest.fixture
+def client(transport: "FakeTransport", retry_policy: RetryPolicy):
+    return pymsgraph.Client(
+        "test",
+        "test",
+        "str",
+        transport=transport,
+        retry_policy=retry_policy,
+        _test=True,
+    )
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(max_retries=2, backoff_factor=1, jitter=False)
+
+    throttled = make_response(429, headers={"Retry-After": "7"})
+    assert policy.get_delay("GET", 0, response=throttled) == 7
+    assert policy.get_delay("POST", 0, response=throttled) == 7
+    assert policy.get_delay("GET", 2, response=throttled) is None
+
+    assert policy.get_delay("GET", 1, response=make_response(502)) == 2
+    assert policy.get_delay("POST", 0, response=make_response(502)) is None
+    assert policy.get_delay("POST", 0, response=make_response(503)) is None
+    assert (
+        policy.get_delay(
+            "POST", 0, response=make_response(503, headers={"Retry-After": "1"})
+        )
+        == 1
+    )
+    assert policy.get_delay("GET", 0, response=make_response(404)) is None
+
+    error = requests.exceptions.ConnectionError()
+    assert policy.get_delay("DELETE", 0, exception=error) == 1
+    assert policy.get_delay("PATCH", 0, exception=error) is None
+
+
+def test_client_retries_throttled_requests(
+    client: pymsgraph.Client, transport: "FakeTransport", retry_policy: RetryPolicy
+):
+    transport.add(429, json_data={}, headers={"Retry-After": "0"})
+    transport.add(503, json_data={})
+    transport.add(json_data={"id": "12345"})
+
+    user = client.users.by_id("12345").get()
+
+    assert user.id == "12345"
+    assert len(transport.requests) == 3
+    assert retry_policy.stats.asdict() == {
+        "retries": 2,
+        "sleep_seconds": 0,
+        "statuses": {429: 1, 503: 1},
+        "exceptions": {},
+    }
+
+
+def test_client_does_not_retry_post_errors(
+    client: pymsgraph.Client, transport: "FakeTransport"
+):
+    transport.add(500, json_data={})
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.users.by_id("12345").revoke_sign_in_sessions.post()
+    assert len(transport.requests) == 1
+
+
+def test_client_retries_connection_errors(
+    client: pymsgraph.Client, transport: "FakeTransport", retry_policy: RetryPolicy
+):
+    calls = []
+
+    def handler(method: str, url: str, **kwargs: Any):
+        calls.append(method)
+        raise requests.exceptions.ConnectionError("reset")
+
+    transport.handler = handler
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.users.by_id("12345").get()
+    assert len(calls) == 4
+    assert retry_policy.stats.exceptions["ConnectionError"] == 3
+
+
+def test_batch_retries_throttled_sub_requests(
+    client: pymsgraph.Client, transport: "FakeTransport"
+):
+    payloads = []
+
+    def handler(method: str, url: str, **kwargs: Any):
+        payload = kwargs["json"]
+        payloads.append(payload)
+        responses = []
+        for request in payload["requests"]:
+            if request["url"] == "/users/2" and len(payloads) == 1:
+                item = {"status": 429, "headers": {"Retry-After": "0"}, "body": {}}
+            else:
+                item = {"status": 200, "body": {"id": request["url"][7:]}}
+            responses.append({"id": request["id"], **item})
+        return make_response(json_data={"responses": responses})
+
+    transport.handler = handler
+    with client.batch():
+        users = [client.users.by_id(str(i)).get() for i in range(1, 4)]
+
+    assert [user.id for user in users] == ["1", "2", "3"]
+    assert [len(p["requests"]) for p in payloads] == [3, 1]
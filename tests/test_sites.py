@@ -4,6 +4,8 @@ import pytest
 if TYPE_CHECKING:
     from pymsgraph import Client
 
+    from .conftest import FakeTransport
+
 from pymsgraph import sites as s
 
 
@@ -288,6 +290,34 @@ def test_list_items_01(
     )
 
 
+def test_list_item_fields_refresh_parent(
+    sites: s.Sites, url: str, transport: "FakeTransport"
+):
+    transport.add(json_data={"id": "1", "fields": {"Title": "A"}})
+    item = sites.by_id("12345").lists.by_id("12345").items.by_id("1")
+
+    assert item.fields.asdict() == {"Title": "A"}
+    assert transport.requests[0][:2] == (
+        "GET",
+        f"{url}/sites/12345/lists/12345/items/1",
+    )
+    assert item.asdict()["fields"] == {"Title": "A"}
+    with pytest.raises(ValueError):
+        sites.get()
+
+
+def test_list_items_delta(
+    sites: s.Sites,
+    url: str,
+    check_request_attributes: Callable,
+):
+    obj = sites.by_id("12345").lists.by_id("12345").items.delta()
+    assert obj.url == f"{url}/sites/12345/lists/12345/items/delta"
+
+    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="query_param", SELECT=True, EXPAND=True)
+
+
 def test_list_by_name(
     sites: s.Sites,
     url: str,
@@ -0,0 +1,150 @@
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from pymsgraph.downloads import QuickXorHash
+from pymsgraph.sync import MANIFEST_NAME, sync_folder
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+
+class FakeDriveServer:
+    def __init__(self, url: str, files: dict[str, bytes]) -> None:
+        self.url = url
+        self.files = files
+        self.tags = {path: 1 for path in files}
+        self.downloads: list[str] = []
+        self.uploads: list[str] = []
+
+    def item(self, path: str) -> dict[str, Any]:
+        name = path.rpartition("/")[2]
+        data: dict[str, Any] = {
+            "id": path,
+            "name": name,
+            "parentReference": {"driveId": "d1"},
+        }
+        if path in self.files:
+            content = self.files[path]
+            data.update(
+                {
+                    "size": len(content),
+                    "cTag": f"{path}:{self.tags[path]}",
+                    "lastModifiedDateTime": "2024-01-01T00:00:00+00:00",
+                    "file": {
+                        "hashes": {"quickXorHash": QuickXorHash(content).b64digest()}
+                    },
+                    "@microsoft.graph.downloadUrl": f"https://download.example.com/{path}",
+                }
+            )
+        else:
+            data["folder"] = {"childCount": 1}
+        return data
+
+    def children(self, folder: str) -> list[dict[str, Any]]:
+        prefix = f"{folder}/" if folder else ""
+        names = set()
+        for path in self.files:
+            if path.startswith(prefix):
+                names.add(prefix + path[len(prefix) :].split("/")[0])
+        return [self.item(path) for path in sorted(names)]
+
+    def __call__(self, method: str, url: str, **kwargs: Any):
+        base = url.partition("?")[0]
+        if url.startswith("https://download.example.com/"):
+            path = url.removeprefix("https://download.example.com/")
+            self.downloads.append(path)
+            return make_response(content=self.files[path])
+        if base == f"{self.url}/drives/d1/root/children":
+            return make_response(json_data={"value": self.children("")})
+        if base.endswith("/children"):
+            folder = base.removeprefix(f"{self.url}/drives/d1/items/")
+            return make_response(json_data={"value": self.children(folder[:-9])})
+        if method == "PUT" and base.endswith(":/content"):
+            path = base.removeprefix(f"{self.url}/drives/d1/root:/")[:-9]
+            self.uploads.append(path)
+            self.files[path] = kwargs["data"]
+            self.tags[path] = self.tags.get(path, 0) + 1
+            return make_response(201, json_data=self.item(path))
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+
+@pytest.fixture
+def server(transport: "FakeTransport", url: str) -> FakeDriveServer:
+    server = FakeDriveServer(
+        url, {"a.txt": b"hello", "docs/b.txt": b"world", "docs/sub/c.txt": b"!"}
+    )
+    transport.handler = server
+    return server
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_sync_folder_download(client: "Client", server: FakeDriveServer, tmp_path):
+    drive = client.drives.by_id("d1")
+    result = sync_folder(str(tmp_path), drive, max_workers=2)
+
+    assert sorted(result.transferred) == ["a.txt", "docs/b.txt", "docs/sub/c.txt"]
+    assert read(tmp_path / "docs" / "sub" / "c.txt") == b"!"
+    with open(tmp_path / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    assert manifest["items"]["a.txt"]["tag"] == "a.txt:1"
+
+    server.downloads.clear()
+    result = sync_folder(str(tmp_path), drive)
+    assert result.transferred == []
+    assert sorted(result.skipped) == ["a.txt", "docs/b.txt", "docs/sub/c.txt"]
+    assert server.downloads == []
+
+    server.files["docs/b.txt"] = b"changed"
+    server.tags["docs/b.txt"] += 1
+    result = sync_folder(str(tmp_path), drive)
+    assert result.transferred == ["docs/b.txt"]
+    assert server.downloads == ["docs/b.txt"]
+    assert read(tmp_path / "docs" / "b.txt") == b"changed"
+
+
+def test_sync_folder_download_without_manifest(
+    client: "Client", server: FakeDriveServer, tmp_path
+):
+    (tmp_path / "a.txt").write_bytes(b"hello")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "b.txt").write_bytes(b"WORLD")
+
+    result = sync_folder(str(tmp_path), client.drives.by_id("d1"), compare_hashes=True)
+    assert result.skipped == ["a.txt"]
+    assert sorted(server.downloads) == ["docs/b.txt", "docs/sub/c.txt"]
+    assert read(tmp_path / "docs" / "b.txt") == b"world"
+
+
+def test_sync_folder_upload(client: "Client", server: FakeDriveServer, tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"hello")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "b.txt").write_bytes(b"new")
+    (tmp_path / "docs" / "d.txt").write_bytes(b"added")
+
+    drive = client.drives.by_id("d1")
+    result = sync_folder(str(tmp_path), drive, direction="upload", compare_hashes=True)
+    assert result.skipped == ["a.txt"]
+    assert sorted(result.transferred) == ["docs/b.txt", "docs/d.txt"]
+    assert server.files["docs/d.txt"] == b"added"
+    assert not result.failed
+
+    server.uploads.clear()
+    result = sync_folder(str(tmp_path), drive, direction="upload")
+    assert result.transferred == []
+    assert server.uploads == []
+
+
+def test_sync_folder_direction(client: "Client", tmp_path):
+    with pytest.raises(ValueError):
+        sync_folder(str(tmp_path), client.drives.by_id("d1"), direction="both")
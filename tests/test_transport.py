@@ -0,0 +1,66 @@
+from typing import TYPE_CHECKING
+
+import pytest
+import requests
+
+if TYPE_CHECKING:
+    from pymsgraph import Client
+
+    from .conftest import FakeTransport
+
+import pymsgraph
+from pymsgraph.transport import SessionTransport
+
+
+def test_session_transport_pool():
+    transport = SessionTransport(pool_connections=4, pool_maxsize=32, timeout=5)
+    adapter = transport.session.get_adapter("https://graph.microsoft.com/v1.0")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert transport.timeout == 5
+    assert transport.session.headers.get("Connection") != "close"
+
+
+def test_session_transport_keep_alive_disabled():
+    transport = SessionTransport(keep_alive=False)
+    assert transport.session.headers["Connection"] == "close"
+
+
+def test_client_default_transport():
+    client = pymsgraph.Client("test", "test", "str", _test=True)
+    assert isinstance(client._transport, SessionTransport)
+
+
+def test_resources_share_client_transport(
+    client: "Client", transport: "FakeTransport", url: str
+):
+    transport.add(json_data={"id": "12345"})
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "next"})
+    transport.add(json_data={"value": [{"id": "2"}]})
+    transport.add()
+
+    user = client.users.by_id("12345").get()
+    users = client.users.select("id").get()
+    users.get_next_items()
+    user.patch({"displayName": "Test"})
+
+    assert user.id == "12345"
+    assert [obj.id for obj in users.iter_fetched_items()] == ["1", "2"]
+    assert [(method, u) for method, u, _ in transport.requests] == [
+        ("GET", f"{url}/users/12345"),
+        ("GET", f"{url}/users?$select=id"),
+        ("GET", "next"),
+        ("PATCH", f"{url}/users/12345"),
+    ]
+
+
+def test_resource_raises_http_error(client: "Client", transport: "FakeTransport"):
+    transport.add(status_code=404, json_data={"error": {"code": "NotFound"}})
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.users.by_id("12345").get()
+
+
+def test_client_close(client: "Client", transport: "FakeTransport"):
+    with client:
+        pass
+    assert transport.closed
@@ -0,0 +1,140 @@
+import io
+import os
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests
+
+import pymsgraph
+from pymsgraph.retry import RetryPolicy
+from pymsgraph.uploads import FRAGMENT_SIZE_MULTIPLE, UploadSession
+
+from .conftest import make_response
+
+if TYPE_CHECKING:
+    from .conftest import FakeTransport
+
+
+UPLOAD_URL = "https://upload.example.com/session"
+
+
+@pytest.fixture
+def client(transport: "FakeTransport"):
+    return pymsgraph.Client(
+        "test",
+        "test",
+        "str",
+        transport=transport,
+        retry_policy=RetryPolicy(max_retries=0),
+        _test=True,
+    )
+
+
+class FakeUploadServer:
+    def __init__(self, size: int, fail_at: set[int] | None = None) -> None:
+        self.size = size
+        self.received = bytearray()
+        self.fail_at = fail_at or set()
+        self.puts = 0
+
+    def __call__(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if url.endswith("createUploadSession"):
+            return make_response(json_data={"uploadUrl": UPLOAD_URL})
+        if method == "GET" and url == UPLOAD_URL:
+            return make_response(
+                json_data={"nextExpectedRanges": [f"{len(self.received)}-"]}
+            )
+        if method == "PUT" and url == UPLOAD_URL:
+            assert "Authorization" not in kwargs["headers"]
+            self.puts += 1
+            if self.puts in self.fail_at:
+                raise requests.exceptions.ConnectionError("reset")
+            content_range = kwargs["headers"]["Content-Range"]
+            start = int(content_range.split()[1].split("-")[0])
+            assert start == len(self.received)
+            self.received.extend(kwargs["data"])
+            if len(self.received) == self.size:
+                return make_response(201, json_data={"id": "item", "size": self.size})
+            return make_response(
+                202, json_data={"nextExpectedRanges": [f"{len(self.received)}-"]}
+            )
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+
+def test_upload_session_resumes_after_failure(
+    client: pymsgraph.Client, transport: "FakeTransport"
+):
+    data = os.urandom(FRAGMENT_SIZE_MULTIPLE * 5 + 123)
+    server = FakeUploadServer(len(data), fail_at={3})
+    transport.handler = server
+
+    item = client.drives.by_id("d1").root.by_relative_path("big.bin")
+    session = UploadSession.create(item)
+    result = session.upload(io.BytesIO(data), fragment_size=FRAGMENT_SIZE_MULTIPLE)
+
+    assert result == {"id": "item", "size": len(data)}
+    assert bytes(server.received) == data
+    assert server.puts == 7
+    assert transport.requests[0][1].endswith(
+        "/drives/d1/root:/big.bin:/createUploadSession"
+    )
+
+
+def test_upload_session_fragment_size(client: pymsgraph.Client):
+    session = UploadSession(client, UPLOAD_URL)
+    with pytest.raises(ValueError):
+        session.upload(io.BytesIO(b"data"), fragment_size=1000)
+
+
+def test_upload_large_file_uses_session(
+    client: pymsgraph.Client, transport: "FakeTransport", tmp_path
+):
+    data = os.urandom(5 * 1024 * 1024)
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+    server = FakeUploadServer(len(data))
+    transport.handler = server
+
+    client.drives.by_id("d1").root.upload(str(path))
+
+    assert bytes(server.received) == data
+
+
+def test_upload_small_file_uses_simple_put(
+    client: pymsgraph.Client, transport: "FakeTransport", tmp_path, url: str
+):
+    paths = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+
+    client.drives.by_id("d1").root.upload_files(paths, max_workers=2)
+
+    assert sorted((m, u, kw["data"]) for m, u, kw in transport.requests) == [
+        ("PUT", f"{url}/drives/d1/root:/a.txt:/content", b"a.txt"),
+        ("PUT", f"{url}/drives/d1/root:/b.txt:/content", b"b.txt"),
+    ]
+
+
+@pytest.mark.parametrize("conflict_behavior", ["fail", "rename"])
+def test_upload_small_file_conflict_behavior(
+    client: pymsgraph.Client,
+    transport: "FakeTransport",
+    tmp_path,
+    url: str,
+    conflict_behavior: str,
+):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"abc")
+
+    client.drives.by_id("d1").root.upload(
+        str(path), conflict_behavior=conflict_behavior
+    )
+
+    [(method, put_url, kwargs)] = transport.requests
+    assert (method, kwargs["data"]) == ("PUT", b"abc")
+    assert put_url == (
+        f"{url}/drives/d1/root:/a.txt:/content"
+        f"?@microsoft.graph.conflictBehavior={conflict_behavior}"
+    )
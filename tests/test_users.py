@@ -4,6 +4,8 @@ import pytest
 if TYPE_CHECKING:
     from pymsgraph import Client
 
+    from .conftest import FakeTransport
+
 from pymsgraph.users import Users
 
 
@@ -69,3 +71,40 @@ def test_user_default_drive_root_drive_item(
     assert obj.url == f"{url}/users/12345/drive/root"
     check_request_attributes(obj, _type="method", GET=True, PATCH=True)
     check_request_attributes(obj, _type="query_param", SELECT=True, SEARCH=True)
+
+
+def test_users_delta(
+    users: Users,
+    url: str,
+    check_request_attributes: Callable,
+    transport: "FakeTransport",
+):
+    obj = users.delta().select("displayName")
+    assert obj.url_with_query_params == f"{url}/users/delta?$select=displayName"
+    check_request_attributes(obj, _type="method", GET=True)
+    check_request_attributes(obj, _type="query_param", SELECT=True, FILTER=True)
+
+    delta_link = f"{url}/users/delta?$deltatoken=abc"
+    transport.add(json_data={"value": [{"id": "1"}], "@odata.nextLink": "p2"})
+    transport.add(
+        json_data={
+            "value": [{"id": "2", "@removed": {"reason": "changed"}}],
+            "@odata.deltaLink": delta_link,
+        }
+    )
+    changes = list(obj.iter_changes())
+    assert [user.url for user in changes] == [f"{url}/users/1", f"{url}/users/2"]
+    assert [obj.is_removed(user) for user in changes] == [False, True]
+    assert obj.delta_link == delta_link
+
+    transport.add(json_data={"value": [], "@odata.deltaLink": f"{delta_link}2"})
+    resumed = users.delta(delta_link=obj.delta_link)
+    assert list(resumed.iter_changes()) == []
+    assert transport.requests[-1][1] == delta_link
+    assert resumed.delta_link == f"{delta_link}2"
+
+
+def test_users_class_access():
+    from pymsgraph import Client
+
+    assert isinstance(Client.users, Users)